@@ -1,197 +1,418 @@
-import os
-import json
-import math
-import random
-import datetime
-from decimal import Decimal
-
-from dateutil.tz import gettz
-from dateutil.relativedelta import relativedelta
-import logging
-
-import send_message
-from common import (utils, line)
-from validation.members_card_param_check import MembersCardParamCheck
-from members_card.members_card_user_info import MembersCardUserInfo
-from members_card.members_card_product_info import MembersCardProductInfo
-from common.channel_access_token import ChannelAccessToken
-
-# 環境変数の宣言
-OA_CHANNEL_ID = os.getenv('OA_CHANNEL_ID')
-LOGGER_LEVEL = os.getenv('LOGGER_LEVEL')
-LIFF_CHANNEL_ID = os.getenv('LIFF_CHANNEL_ID', None)
-
-# ログ出力の設定
-logger = logging.getLogger()
-if LOGGER_LEVEL == 'DEBUG':
-    logger.setLevel(logging.DEBUG)
-else:
-    logger.setLevel(logging.INFO)
-
-# テーブル操作クラスの初期化
-user_info_table_controller = MembersCardUserInfo()
-product_info_table_controller = MembersCardProductInfo()
-access_token_table_controller = ChannelAccessToken()
-
-
-def lambda_handler(event, context):
-    logger.info(event)
-
-    req_param = json.loads(event['body'])
-
-    # パラメータのバリデーションチェック
-    param_checker = MembersCardParamCheck(req_param)
-    if error_msg := param_checker.check_api_members_card():
-        error_msg_disp = ('\n').join(error_msg)
-        logger.error(error_msg_disp)
-        return utils.create_error_response(error_msg_disp, status=400)  # noqa: E501
-
-    # idTokenよりユーザーIDを取得
-    try:
-        user_profile = line.get_profile(
-            req_param['idToken'], LIFF_CHANNEL_ID)
-        if 'error' in user_profile and 'expired' in user_profile['error_description']:  # noqa 501
-            return utils.create_error_response('Forbidden', 403)
-        else:
-            req_param['userId'] = user_profile['sub']
-    except Exception:
-        logger.exception('不正なIDトークンが使用されています')
-        return utils.create_error_response('Error')
-
-    user_id = user_profile['sub']
-
-    mode = req_param['mode']
-    # modeによって振り分ける
-    try:
-        if mode == 'init':
-            result = init(user_id)
-        elif mode == 'buy':
-            result = buy(
-                user_id, req_param['language'])
-
-    except Exception as e:
-        logger.error(e)
-        return utils.create_error_response('ERROR')
-    success_response = json.dumps(result,
-                                  default=utils.decimal_to_int,
-                                  ensure_ascii=False)
-    return utils.create_success_response(success_response)
-
-
-def init(user_id):
-    """
-    初期表示時、新規ユーザーの場合会員データを作成する。
-
-    Parameters
-    ----------
-    user_id : str
-        LINEのユーザーID
-
-    Returns
-    -------
-    dict
-        更新後のユーザー情報
-    """
-    user_info = user_info_table_controller.get_item(user_id)
-    # ログインユーザーのデータが無い場合、ユーザーデータを作成する
-    if not user_info:
-        return create_new_user(user_id)
-
-    return user_info
-
-
-def buy(user_id, language):
-    """
-    商品を購入し、ポイント付与のDB更新と電子レシートの送信を行う。
-    Parameters
-    ----------
-    user_id : str
-
-    Returns
-    -------
-    dict
-        更新後のユーザー情報
-
-    """
-    # 購入商品のランダム取得
-    table_size = product_info_table_controller.get_table_size()
-    # NOTE:サンプル商品を増やさないと決まった場合、tableSize部分に直接数値を入れた方が良い(パフォーマンス向上)
-    product_id = random.randint(1, table_size)
-    product_info = product_info_table_controller.get_item(product_id)
-
-    # 付与ポイントの取得
-    user_info = user_info_table_controller.get_item(user_id)
-    before_awarded_point = user_info['point']
-    add_point = math.floor(product_info['unitPrice'] * Decimal(0.05))
-    after_awarded_point = before_awarded_point + add_point
-
-    # 更新期限日の取得
-    today = datetime.datetime.now(gettz('Asia/Tokyo'))
-    expiration_date = (today + relativedelta(years=1)
-                       ).strftime('%Y/%m/%d')
-
-    # DB更新
-    user_info_table_controller.update_point_expiration_date(
-        user_id, after_awarded_point, expiration_date)
-
-    user_info['pointExpirationDate'] = expiration_date
-    user_info['point'] = after_awarded_point
-
-    # メッセージ送信
-    oa_channel_access_token = access_token_table_controller.get_item(
-        OA_CHANNEL_ID)['channelAccessToken']
-    send_message.send_push_message(
-        oa_channel_access_token, user_id, product_info, language)
-
-    return user_info
-
-
-def create_new_user(user_id):
-    """
-    新規ユーザーの作成
-
-    Parameters
-    ----------
-    user_id : str
-        LINEユーザーID
-
-    Returns
-    -------
-    dict
-        ユーザー情報
-    """
-    barcode_num = create_barcode_num()
-    # バーコードが重複した場合、１回までリトライしバーコード生成を行う。
-    if not barcode_num:
-        barcode_num = create_barcode_num()
-
-    expiration_date = ''
-    point = 0
-    item = {
-        'userId': user_id,
-        'barcodeNum': barcode_num,
-        'pointExpirationDate': expiration_date,
-        'point': point,
-    }
-    user_info_table_controller.put_item(
-        user_id, barcode_num, expiration_date, point)
-
-    return item
-
-
-def create_barcode_num():
-    """
-    バーコードを生成する。
-
-    Returns
-    -------
-    str
-        生成したバーコード
-        重複する場合空文字を返す
-    """
-    barcode_num = random.randrange(10**12, 10**13)
-    items = user_info_table_controller.query_index_barcode_num(barcode_num)
-    if items:
-        return ''
-
-    return barcode_num
+import os
+import json
+
+from dateutil.relativedelta import relativedelta
+import logging
+
+from aws.sqs.queue import SQSQueue
+from common import (clock, utils, line, metrics)
+from common.idempotency import (
+    IdempotencyStore, IdempotencyInProgressError, IdempotencyKeyMismatchError,
+    make_request_hash)
+from validation.members_card_param_check import MembersCardParamCheck
+from members_card.members_card_user_info import MembersCardUserInfo
+from members_card.members_card_product_info import MembersCardProductInfo
+from members_card.members_card_product_catalog import MembersCardProductCatalog  # noqa: E501
+from members_card.members_card_counter import MembersCardCounter
+from members_card.members_card_barcode import MembersCardBarcodeAllocator
+from members_card import members_card_pricing
+
+# 環境変数の宣言
+LOGGER_LEVEL = os.getenv('LOGGER_LEVEL')
+LIFF_CHANNEL_ID = os.getenv('LIFF_CHANNEL_ID', None)
+PRODUCT_CATALOG_TTL = float(os.getenv('PRODUCT_CATALOG_TTL', 600))
+BARCODE_PERMUTATION_KEY = os.getenv(
+    'BARCODE_PERMUTATION_KEY', 'LINE-UseCase-MembersCard')
+BARCODE_BLOCK_SIZE = int(os.getenv('BARCODE_BLOCK_SIZE', 100))
+# 旧方式（乱数）で発行済みのバーコード番号との重複を確認するか
+BARCODE_LEGACY_CHECK = os.getenv(
+    'BARCODE_LEGACY_CHECK', 'true').lower() == 'true'
+# 旧方式の番号と重複した場合に採番し直す回数の上限
+BARCODE_MAX_ATTEMPTS = 3
+RECEIPT_QUEUE_URL = os.getenv('RECEIPT_QUEUE_URL', None)
+
+# 冪等キー（idempotencyKey）を指定できるmode（ポイントを加算するmode）
+IDEMPOTENT_MODES = ('buy', 'cart')
+# 処理するmode（これ以外のmodeは計測結果をotherにまとめ、メトリクスの種類を固定する）
+MODES = ('init', 'buy', 'cart')
+OTHER_MODE = 'other'
+
+# フロントに返却するユーザー情報の項目
+USER_INFO_RESPONSE_FIELDS = (
+    'userId', 'barcodeNum', 'pointExpirationDate', 'point')
+
+# ログ出力の設定
+logger = logging.getLogger()
+if LOGGER_LEVEL == 'DEBUG':
+    logger.setLevel(logging.DEBUG)
+else:
+    logger.setLevel(logging.INFO)
+
+
+class ProductNotFoundError(Exception):
+    """カートに存在しない商品が指定された場合の例外（クライアントの入力エラー）"""
+
+
+# テーブル操作クラスの初期化
+user_info_table_controller = MembersCardUserInfo()
+product_info_table_controller = MembersCardProductInfo()
+# 商品マスタのスナップショット（コンテナごとに初回参照時に読み込む）
+product_catalog = MembersCardProductCatalog(
+    product_info_table_controller, PRODUCT_CATALOG_TTL)
+# バーコード番号の採番（連番ブロックをコンテナごとに予約する）
+barcode_allocator = MembersCardBarcodeAllocator(
+    MembersCardCounter(), BARCODE_PERMUTATION_KEY, BARCODE_BLOCK_SIZE)
+# 電子レシート送信キュー（未設定の場合はリクエスト内で送信する）
+receipt_queue = SQSQueue(RECEIPT_QUEUE_URL) if RECEIPT_QUEUE_URL else None
+# 冪等キーの処理状況・レスポンスの保存先
+idempotency_store = IdempotencyStore()
+
+
+@metrics.record_invocation
+@clock.request_scoped
+def lambda_handler(event, context):
+    logger.info(event)
+
+    req_param = json.loads(event['body'])
+
+    # パラメータのバリデーションチェック
+    with metrics.span('param_check'):
+        param_checker = MembersCardParamCheck(req_param)
+        error_msg = param_checker.check_api_members_card()
+    if error_msg:
+        error_msg_disp = ('\n').join(error_msg)
+        logger.error(error_msg_disp)
+        return utils.create_error_response(error_msg_disp, status=400)  # noqa: E501
+    metrics.set_dimension('Mode', get_metrics_mode(req_param['mode']))
+
+    # idTokenよりユーザーIDを取得
+    try:
+        with metrics.span('get_profile'):
+            user_profile = line.get_profile(
+                req_param['idToken'], LIFF_CHANNEL_ID)
+        if 'error' in user_profile and 'expired' in user_profile['error_description']:  # noqa 501
+            return utils.create_error_response('Forbidden', 403)
+        else:
+            req_param['userId'] = user_profile['sub']
+    except Exception:
+        logger.exception('不正なIDトークンが使用されています')
+        return utils.create_error_response('Error')
+
+    user_id = user_profile['sub']
+
+    # 冪等キーが指定された場合、同じ冪等キーの再送には処理済みのレスポンスを返す
+    idempotency_key = req_param.get('idempotencyKey')
+    if idempotency_key and req_param['mode'] in IDEMPOTENT_MODES:
+        return process_idempotent(user_id, idempotency_key, req_param)
+
+    return process(user_id, req_param)
+
+
+def get_metrics_mode(mode):
+    """
+    計測結果に使用するmodeの名称を取得する
+
+    Parameters
+    ----------
+    mode : str
+        リクエストのmode
+
+    Returns
+    -------
+    str
+        処理するmodeの場合はそのmode、それ以外の場合はother
+    """
+    return mode if mode in MODES else OTHER_MODE
+
+
+def process(user_id, req_param):
+    """
+    modeに応じた処理を行い、レスポンスを作成する。
+
+    Parameters
+    ----------
+    user_id : str
+        LINEのユーザーID
+    req_param : dict
+        リクエストパラメータ
+
+    Returns
+    -------
+    dict
+        レスポンス
+    """
+    mode = req_param['mode']
+    # modeによって振り分ける
+    try:
+        with metrics.span(get_metrics_mode(mode)):
+            if mode == 'init':
+                result = init(user_id)
+            elif mode == 'buy':
+                result = buy(
+                    user_id, req_param['language'])
+            elif mode == 'cart':
+                result = buy_cart(
+                    user_id, req_param['language'], req_param['items'])
+
+    except ProductNotFoundError as e:
+        logger.warning(e)
+        return utils.create_error_response(str(e), status=400)
+    except Exception as e:
+        logger.error(e)
+        return utils.create_error_response('ERROR')
+    return utils.create_success_response(
+        result, fields=USER_INFO_RESPONSE_FIELDS)
+
+
+def process_idempotent(user_id, idempotency_key, req_param):
+    """
+    冪等キーごとに1度だけ処理を行う。
+    処理済みの冪等キーの場合、会員データの更新・メッセージ送信を行わずに保存済みのレスポンスを返す。
+
+    Parameters
+    ----------
+    user_id : str
+        LINEのユーザーID
+    idempotency_key : str
+        フロントで購入操作ごとに生成した冪等キー
+    req_param : dict
+        リクエストパラメータ
+
+    Returns
+    -------
+    dict
+        レスポンス
+    """
+    # 冪等キーはユーザーごとに管理する
+    key = '%s#%s' % (user_id, idempotency_key)
+    request_hash = make_request_hash({
+        'mode': req_param['mode'],
+        'language': req_param.get('language'),
+        'items': req_param.get('items'),
+    })
+    try:
+        with metrics.span('idempotency'):
+            cached_response = idempotency_store.begin(key, request_hash)
+    except IdempotencyInProgressError:
+        logger.warning('同じ冪等キーのリクエストを処理中です: %s', key)
+        return utils.create_error_response('Conflict', 409)
+    except IdempotencyKeyMismatchError:
+        logger.error('冪等キーが異なるリクエストで使用されています: %s', key)
+        return utils.create_error_response('Unprocessable Entity', 422)
+    except Exception as e:
+        logger.error(e)
+        return utils.create_error_response('ERROR')
+    if cached_response is not None:
+        logger.info('処理済みのレスポンスを返却します: %s', key)
+        return cached_response
+
+    response = process(user_id, req_param)
+    try:
+        if response['statusCode'] == 200:
+            idempotency_store.complete(key, response)
+        else:
+            # 失敗した場合は同じ冪等キーで再実行できるようにする
+            idempotency_store.release(key)
+    except Exception:
+        # 処理は完了しているため、保存に失敗した場合もレスポンスは返却する
+        logger.exception('冪等キーの更新に失敗しました: %s', key)
+    return response
+
+
+def init(user_id):
+    """
+    初期表示時、新規ユーザーの場合会員データを作成する。
+
+    Parameters
+    ----------
+    user_id : str
+        LINEのユーザーID
+
+    Returns
+    -------
+    dict
+        更新後のユーザー情報
+    """
+    user_info = user_info_table_controller.get_item(user_id)
+    # ログインユーザーのデータが無い場合、ユーザーデータを作成する
+    if not user_info:
+        return create_new_user(user_id)
+
+    return user_info
+
+
+def buy(user_id, language):
+    """
+    商品を購入し、ポイント付与のDB更新と電子レシートの送信を行う。
+    Parameters
+    ----------
+    user_id : str
+
+    Returns
+    -------
+    dict
+        更新後のユーザー情報
+
+    """
+    # 電子レシートの処理は購入時のみ使用するため、使用時に読み込む
+    import send_message
+
+    # 購入商品のランダム取得（商品マスタのスナップショットから取得）
+    product_info = product_catalog.choice()
+
+    # 購入金額・付与ポイントの計算（DB更新と電子レシートで同じ結果を使用する）
+    price = members_card_pricing.calculate(product_info)
+
+    # 更新期限日の取得
+    today = clock.now()
+    expiration_date = (today + relativedelta(years=1)
+                       ).strftime(clock.DATE_FORMAT)
+
+    # DB更新（ポイントはDB側で加算し、更新後のユーザー情報を取得する）
+    user_info = user_info_table_controller.add_points(
+        user_id, price.point, expiration_date)
+
+    # メッセージ送信（送信ジョブをキューに登録し、送信完了を待たずに返却する）
+    enqueue_receipt(
+        send_message.create_receipt_job(
+            user_id, product_info, language, price))
+
+    return user_info
+
+
+def buy_cart(user_id, language, items):
+    """
+    カート内の複数商品を購入し、ポイント付与のDB更新と電子レシートの送信を1回で行う。
+
+    Parameters
+    ----------
+    user_id : str
+        LINEのユーザーID
+    language : str
+        多言語化対応用のパラメータ
+    items : list
+        productIdとquantityを持つ明細のリスト
+
+    Returns
+    -------
+    dict
+        更新後のユーザー情報
+
+    Raises
+    ------
+    ProductNotFoundError
+        存在しない商品が指定された場合（会員データの更新前に判定する）
+
+    """
+    # 電子レシートの処理は購入時のみ使用するため、使用時に読み込む
+    import send_message
+
+    # 同じ商品の明細は数量を合算する
+    quantities = {}
+    for item in items:
+        product_id = int(item['productId'])
+        quantities[product_id] = \
+            quantities.get(product_id, 0) + int(item['quantity'])
+
+    # 購入商品の一括取得
+    products = product_catalog.get_items(list(quantities))
+    if missing_ids := [product_id for product_id in quantities
+                       if product_id not in products]:
+        raise ProductNotFoundError('Product not found: %s' % missing_ids)
+
+    # カート全体の購入金額・付与ポイントの計算
+    cart_items = [(products[product_id], quantity)
+                  for product_id, quantity in quantities.items()]
+    lines, price = members_card_pricing.calculate_cart(cart_items)
+
+    # 更新期限日の取得
+    today = clock.now()
+    expiration_date = (today + relativedelta(years=1)
+                       ).strftime(clock.DATE_FORMAT)
+
+    # DB更新（全明細の合計ポイントを1回で加算する）
+    user_info = user_info_table_controller.add_points(
+        user_id, price.point, expiration_date)
+
+    # メッセージ送信（全明細を1通の電子レシートにまとめる）
+    enqueue_receipt(
+        send_message.create_cart_receipt_job(
+            user_id, products, lines, language, price))
+
+    return user_info
+
+
+def enqueue_receipt(receipt_job):
+    """
+    電子レシート送信ジョブをキューに登録する。
+    ポイントは更新済みのため、登録・送信に失敗した場合もエラーとしない。
+
+    Parameters
+    ----------
+    receipt_job : dict
+        電子レシート送信ジョブ
+    """
+    try:
+        with metrics.span('enqueue_receipt'):
+            if receipt_queue is None:
+                import receipt_worker
+                receipt_worker.deliver(receipt_job)
+            else:
+                receipt_queue.send_message(receipt_job)
+    except Exception:
+        logger.exception('電子レシートの送信に失敗しました: %s', receipt_job)
+
+
+def create_new_user(user_id):
+    """
+    新規ユーザーの作成
+
+    Parameters
+    ----------
+    user_id : str
+        LINEユーザーID
+
+    Returns
+    -------
+    dict
+        ユーザー情報
+    """
+    barcode_num = create_barcode_num()
+
+    expiration_date = ''
+    point = 0
+    item = {
+        'userId': user_id,
+        'barcodeNum': barcode_num,
+        'pointExpirationDate': expiration_date,
+        'point': point,
+    }
+    user_info_table_controller.put_item(
+        user_id, barcode_num, expiration_date, point)
+
+    return item
+
+
+def create_barcode_num():
+    """
+    バーコードを生成する。
+    採番した連番を置換して生成するため、新方式の番号同士は重複しない。
+    旧方式（10^12以上10^13未満の乱数）で発行済みの番号とは範囲が重なるため、
+    BARCODE_LEGACY_CHECKが有効な場合はbarcodeNum-indexで重複を確認し、
+    重複した番号は使用せずに次の連番で採番し直す。
+    （旧方式の番号は増えないため、採番ごとに1回の確認で重複を防げる）
+
+    Returns
+    -------
+    int
+        生成したEAN-13形式のバーコード
+    """
+    for _ in range(BARCODE_MAX_ATTEMPTS):
+        barcode_num = barcode_allocator.allocate()
+        if not BARCODE_LEGACY_CHECK or \
+                not user_info_table_controller.query_index_barcode_num(
+                    barcode_num):
+            return barcode_num
+        logger.warning('Barcode %d is already used by a legacy member',
+                       barcode_num)
+    raise Exception('Failed to allocate a barcode number')
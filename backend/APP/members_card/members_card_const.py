@@ -1,35 +1,35 @@
-from common import const
-
-const.MESSAGE_ALT_TEXT = {
-    'ja': 'お買い上げありがとうございます。電子レシートを発行します。',
-}
-const.MESSAGE_NOTES = {
-    'ja': '※LINE API Use Caseサイトのデモアプリケーションであるため、実際の課金は行われません',
-}
-const.MESSAGE_POSTAGE = {
-    'ja': '送料（税抜）',
-}
-const.MESSAGE_FEE = {
-    'ja': '決算手数料（税抜）',
-}
-const.MESSAGE_DISCOUNT = {
-    'ja': '値引き',
-}
-const.MESSAGE_SUBTOTAL = {
-    'ja': '小計（税抜）',
-}
-const.MESSAGE_TAX = {
-    'ja': '消費税',
-}
-const.MESSAGE_TOTAL = {
-    'ja': 'お会計金額',
-}
-const.MESSAGE_AWARD_POINTS = {
-    'ja': '付与ポイント',
-}
-const.MESSAGE_THANKS = {
-    'ja': '商品のご購入ありがとうございます。\n本メッセージは、Use Case STOREおよびUse Case GROUPの店舗で商品をご購入されたお客様にお届けしています。',  # noqa: E501
-}
-const.MESSAGE_VIEW = {
-    'ja': '会員証を表示',
-}
+from common import const
+
+const.MESSAGE_ALT_TEXT = {
+    'ja': 'お買い上げありがとうございます。電子レシートを発行します。',
+}
+const.MESSAGE_NOTES = {
+    'ja': '※LINE API Use Caseサイトのデモアプリケーションであるため、実際の課金は行われません',
+}
+const.MESSAGE_POSTAGE = {
+    'ja': '送料（税抜）',
+}
+const.MESSAGE_FEE = {
+    'ja': '決算手数料（税抜）',
+}
+const.MESSAGE_DISCOUNT = {
+    'ja': '値引き',
+}
+const.MESSAGE_SUBTOTAL = {
+    'ja': '小計（税抜）',
+}
+const.MESSAGE_TAX = {
+    'ja': '消費税',
+}
+const.MESSAGE_TOTAL = {
+    'ja': 'お会計金額',
+}
+const.MESSAGE_AWARD_POINTS = {
+    'ja': '付与ポイント',
+}
+const.MESSAGE_THANKS = {
+    'ja': '商品のご購入ありがとうございます。\n本メッセージは、Use Case STOREおよびUse Case GROUPの店舗で商品をご購入されたお客様にお届けしています。',  # noqa: E501
+}
+const.MESSAGE_VIEW = {
+    'ja': '会員証を表示',
+}
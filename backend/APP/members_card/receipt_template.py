@@ -0,0 +1,85 @@
+"""
+電子レシートのプッシュメッセージ本文テンプレート用モジュール
+※言語ごとにmake_flex_receptの結果を一度だけJSON文字列に変換し、
+　送信時は可変部分（日付、商品名、金額、ポイント、画像）のみを埋め込みます
+
+"""
+import json
+from json.encoder import encode_basestring
+
+# 可変部分の項目名（make_flex_receptの引数名）
+RECEIPT_SLOTS = ('date', 'product_name', 'product_price', 'postage', 'fee',
+                 'discount', 'subtotal', 'tax', 'total', 'point', 'img_url')
+# プッシュメッセージの送信先
+TO_SLOT = 'to'
+
+# 可変部分を示す文字列（JSONエスケープの対象文字を含まないこと）
+_PLACEHOLDER = '{{%s}}'
+
+
+class ReceiptTemplate:
+    """
+    プッシュメッセージ本文のJSON文字列を固定部分と可変部分に分割して保持するクラス
+    """
+    __slots__ = ['_parts']
+
+    def __init__(self, builder, language):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        builder : function
+            RECEIPT_SLOTSの各項目とlanguageを受け取り、メッセージのdictを返す関数
+        language : str
+            言語設定
+        """
+        placeholders = {slot: _PLACEHOLDER % slot for slot in RECEIPT_SLOTS}
+        body = json.dumps({
+            'to': _PLACEHOLDER % TO_SLOT,
+            'messages': [builder(**placeholders, language=language)],
+        }, ensure_ascii=False, separators=(',', ':'))
+
+        # 同じ項目が複数箇所にある場合は置換漏れになるため生成時に検知する
+        for slot in RECEIPT_SLOTS + (TO_SLOT,):
+            if body.count(_PLACEHOLDER % slot) != 1:
+                raise ValueError('receipt slot must appear once: %s' % slot)
+
+        # 固定部分と可変部分を交互に並べたリストにする
+        slot_positions = sorted(
+            (body.index(_PLACEHOLDER % slot), slot)
+            for slot in RECEIPT_SLOTS + (TO_SLOT,))
+        parts = []
+        start = 0
+        for position, slot in slot_positions:
+            parts.append(body[start:position])
+            parts.append(slot)
+            start = position + len(_PLACEHOLDER % slot)
+        parts.append(body[start:])
+        self._parts = tuple(parts)
+
+    def render(self, user_id, **values):
+        """
+        プッシュメッセージの本文を生成する
+
+        Parameters
+        ----------
+        user_id : str
+            送信対象のユーザーID
+        **values
+            RECEIPT_SLOTSの各項目の値（modify_product_objの戻り値）
+
+        Returns
+        -------
+        body : str
+            プッシュメッセージAPIのリクエスト本文（JSON文字列）
+        """
+        values[TO_SLOT] = user_id
+        parts = self._parts
+        # 偶数番目が固定部分、奇数番目が可変部分の項目名
+        rendered = [parts[0]]
+        for i in range(1, len(parts), 2):
+            # JSON文字列としてエスケープし、前後の引用符を除いて埋め込む
+            rendered.append(encode_basestring(str(values[parts[i]]))[1:-1])
+            rendered.append(parts[i + 1])
+        return ''.join(rendered)
@@ -0,0 +1,155 @@
+import os
+import json
+import logging
+
+import send_message
+from aws.sqs.queue import SQSQueue
+from common import (clock, line, metrics)
+from common.channel_access_token import (
+    ChannelAccessToken, ChannelAccessTokenProvider)
+
+# 環境変数の宣言
+OA_CHANNEL_ID = os.getenv('OA_CHANNEL_ID')
+LOGGER_LEVEL = os.getenv('LOGGER_LEVEL')
+RECEIPT_QUEUE_URL = os.getenv('RECEIPT_QUEUE_URL', None)
+# キューから取り出す際の1回の受信件数
+RECEIPT_BATCH_SIZE = int(os.getenv('RECEIPT_BATCH_SIZE', 10))
+
+# ログ出力の設定
+logger = logging.getLogger()
+if LOGGER_LEVEL == 'DEBUG':
+    logger.setLevel(logging.DEBUG)
+else:
+    logger.setLevel(logging.INFO)
+
+# テーブル操作クラスの初期化
+access_token_table_controller = ChannelAccessToken()
+# OAのチャネルアクセストークン（期限日の直前までメモリ上に保持する）
+oa_channel_access_token = ChannelAccessTokenProvider(
+    access_token_table_controller, OA_CHANNEL_ID)
+# 電子レシート送信キュー
+receipt_queue = SQSQueue(RECEIPT_QUEUE_URL) if RECEIPT_QUEUE_URL else None
+
+
+@metrics.record_invocation
+@clock.request_scoped
+def lambda_handler(event, context):
+    """
+    電子レシート送信キューのメッセージを処理する
+    ※SQSトリガーの場合、送信に失敗したメッセージのみを再試行対象として返却します
+    　（受信回数の上限を超えたメッセージはデッドレターキューへ移動します）
+    ※SQSトリガー以外で起動した場合はキューが空になるまで受信・送信を繰り返します
+
+    Returns
+    -------
+    dict
+        SQSトリガーの場合、batchItemFailures
+        それ以外の場合、送信件数と失敗件数
+    """
+    records = event.get('Records')
+    if records is None:
+        if receipt_queue is None:
+            logger.warning('RECEIPT_QUEUE_URLが設定されていません')
+            return {'delivered': 0, 'failed': 0}
+        return drain(receipt_queue)
+
+    messages = []
+    failed_ids = []
+    for record in records:
+        # 不正なメッセージはそのメッセージのみを失敗とし、他のメッセージは送信する
+        try:
+            messages.append({
+                'messageId': record['messageId'],
+                'body': json.loads(record['body']),
+            })
+        except Exception:
+            logger.exception('メッセージの読み込みに失敗しました: %s',
+                             record.get('messageId'))
+            failed_ids.append(record.get('messageId'))
+    failed_ids.extend(process_messages(messages))
+    return {
+        'batchItemFailures': [
+            {'itemIdentifier': message_id} for message_id in failed_ids
+        ]
+    }
+
+
+def deliver(receipt_job):
+    """
+    電子レシートを送信する
+
+    Parameters
+    ----------
+    receipt_job : dict
+        電子レシート送信ジョブ
+    """
+    try:
+        with metrics.span('channel_access_token'):
+            channel_access_token = oa_channel_access_token.get()
+        send_message.send_receipt(channel_access_token, receipt_job)
+    except line.UnauthorizedError:
+        # トークンが無効になっている場合は再取得して1度だけ再送する
+        logger.warning('チャネルアクセストークンを再取得します')
+        send_message.send_receipt(
+            oa_channel_access_token.reload(), receipt_job)
+
+
+def process_messages(messages):
+    """
+    受信したメッセージの電子レシートを送信する
+    ※1件の送信失敗で他のメッセージの送信を中断しないようにする
+
+    Parameters
+    ----------
+    messages : list
+        messageIdとbodyを持つメッセージのリスト
+
+    Returns
+    -------
+    failed_ids : list
+        送信に失敗したメッセージのID
+    """
+    failed_ids = []
+    for message in messages:
+        try:
+            deliver(message['body'])
+        except Exception:
+            logger.exception('電子レシートの送信に失敗しました: %s',
+                             message['messageId'])
+            failed_ids.append(message['messageId'])
+    return failed_ids
+
+
+def drain(queue, max_batches=None):
+    """
+    キューが空になるまでメッセージを受信し、電子レシートを送信する
+    ※送信に失敗したメッセージは削除せず、可視性タイムアウト後に再受信させます
+
+    Parameters
+    ----------
+    queue : SQSQueue or InMemoryQueue
+        電子レシート送信キュー
+    max_batches : int, optional
+        受信する最大回数, by default None（上限なし）
+
+    Returns
+    -------
+    dict
+        送信件数と失敗件数
+    """
+    delivered = 0
+    failed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        messages = queue.receive_messages(RECEIPT_BATCH_SIZE)
+        if not messages:
+            break
+        batches += 1
+        failed_ids = set(process_messages(messages))
+        queue.delete_messages([
+            message['receiptHandle'] for message in messages
+            if message['messageId'] not in failed_ids
+        ])
+        delivered += len(messages) - len(failed_ids)
+        failed += len(failed_ids)
+    return {'delivered': delivered, 'failed': failed}
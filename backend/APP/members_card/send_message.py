@@ -1,446 +1,576 @@
-import os
-import logging
-import datetime
-from dateutil.tz import gettz
-import math
-from decimal import Decimal
-
-
-from common import (line, utils)
-import members_card_const
-
-
-# 環境変数の宣言
-LIFF_ID = os.getenv('LIFF_ID')
-LOGGER_LEVEL = os.getenv("LOGGER_LEVEL")
-
-# ログ出力の設定
-logger = logging.getLogger()
-if LOGGER_LEVEL == 'DEBUG':
-    logger.setLevel(logging.DEBUG)
-else:
-    logger.setLevel(logging.INFO)
-
-
-def send_push_message(channel_access_token, user_id, product_obj, language):
-    """
-    プッシュメッセージを送信する
-
-    Parameters
-    ----------
-    channel_access_token : str
-        OAのチャネルアクセストークン
-    user_id : str
-        送信対象のユーザーID
-    product_obj : dict
-        データベースより取得した商品データ
-    language : str
-        多言語化対応用のパラメータ
-    """
-    logger.info('productObj: %s', product_obj)
-    modified_product_obj = modify_product_obj(product_obj, language)
-
-    flex_dict = make_flex_recept(**modified_product_obj, language=language)
-
-    line.send_push_message(
-        channel_access_token, flex_dict, user_id)
-
-
-def send_service_message(channel_access_token, notification_token, product_obj, language):  # noqa: E501
-    """
-    サービスメッセージを送信
-
-    Parameters
-    ----------
-    channel_access_token : str
-        MINIアプリのチャネルアクセストークン
-    notification_token : str
-        MINIアプリの通知用トークン
-    product_obj : dict
-        データベースより取得した商品データ
-    language : str
-        多言語化対応用のパラメータ
-
-    """
-    # サービスメッセ―ジで代引き手数料と支払手数料を表示させないため以下を0にする
-    product_obj['fee'] = 0
-    product_obj['postage'] = 0
-    modified_product_obj = modify_product_obj(product_obj)
-    params = {
-        "sum": modified_product_obj['total'] + '円',
-        "tax": modified_product_obj['tax'] + '円',
-        "date": modified_product_obj['date'],
-        "price": modified_product_obj['product_price'] + '円',
-        "btn1_url": "https://line.me",
-        "discount": modified_product_obj['discount'] + '円',
-        "quantity": "1点",
-        "shop_name": "Use Case STORE",
-        # "payment_fee": modifiedProductObj['fee'] + '円',
-        "product_name": modified_product_obj['product_name'],
-        # "delivery_cash": modifiedProductObj['postage'] + '円'
-    }
-
-    line.send_service_message(
-        channel_access_token, 'ec_comp_d_s_ja', params, notification_token)
-
-
-def modify_product_obj(product_obj, language, discount=0):
-    """
-    データベースより取得した商品データをメッセージ送信に適した状態のdict型に加工する
-
-    Parameters
-    ----------
-    product_obj : dict
-        データベースより取得した商品データ
-    language : str
-        多言語化対応用のパラメータ
-    discount : int, optional
-        値引き率。
-        指定が無い場合0とする。
-
-    Returns
-    -------
-    dict
-        加工後の商品データ
-    """
-    now = datetime.datetime.now(
-        gettz('Asia/Tokyo')).strftime('%Y/%m/%d %H:%M:%S')
-    subtotal = product_obj['unitPrice'] + \
-        product_obj['postage'] + product_obj['fee'] - discount
-    tax = math.floor(subtotal * Decimal(0.10))
-    total = subtotal + tax
-    point = math.floor(product_obj['unitPrice'] * Decimal(0.05))
-    logger.info('point: %s', point)
-    modified_product_obj = {
-        'date': now,
-        'product_name': product_obj['productName'][language],
-        'product_price': utils.separate_comma(product_obj['unitPrice']),
-        'postage': utils.separate_comma(product_obj['postage']),
-        'fee': utils.separate_comma(product_obj['fee']),
-        'discount': utils.separate_comma(discount),
-        'subtotal': utils.separate_comma(subtotal),
-        'tax': utils.separate_comma(tax),
-        'total': utils.separate_comma(total),
-        'point': utils.separate_comma(point),
-        'img_url': product_obj['imgUrl'],
-    }
-
-    return modified_product_obj
-
-
-def make_flex_recept(date, product_name, product_price, postage,
-                     fee, discount, subtotal, tax, total,
-                     point, img_url, language):
-    """
-    電子レシートのフレックスメッセージのdict型データを作成する
-
-    Parameters
-    ----------
-    date: str
-        yyyy/MM/dd hh:mm:ss形式の日付時刻
-    product_name: str
-        商品名
-    product_price: str
-        商品代金
-    postage: str
-        送料
-    commission: str
-        手数料
-    discount: str
-        値下げ料
-    subtotal: str
-        小計
-    tax: str
-        消費税
-    total: str
-        合計
-    point: str
-        付与ポイント
-    img_url: str
-        商品画像のURL
-    language: str
-        言語設定
-
-    Returns
-    -------
-    result : dict
-        Flexmessageの元になる辞書型データ
-    """
-    return {
-        "type": "flex",
-        "altText": members_card_const.const.MESSAGE_ALT_TEXT[language],
-        "contents": {
-            "type": "bubble",
-            "header": {
-                "type": "box",
-                "layout": "vertical",
-                "contents": [
-                    {
-                        "type": "text",
-                        "text": "Use Case STORE",
-                        "size": "xxl",
-                        "weight": "bold"
-                    },
-                    {
-                        "type": "text",
-                        "text": date,
-                        "color": "#767676"
-                    },
-                    {
-                        "type": "text",
-                        "wrap": True,
-                        "text": members_card_const.const.MESSAGE_NOTES[language],  # noqa: E501
-                        "color": "#ff6347"
-                    }
-                ]
-            },
-            "body": {
-                "type": "box",
-                "layout": "vertical",
-                "contents": [
-                    {
-                        "type": "box",
-                        "layout": "vertical",
-                        "margin": "lg",
-                        "spacing": "sm",
-                        "contents": [
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": product_name,
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": product_price,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_POSTAGE[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": postage,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_FEE[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": fee,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_DISCOUNT[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": discount,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_SUBTOTAL[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": subtotal,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_TAX[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": tax,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_TOTAL[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": total,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                            {
-                                "type": "box",
-                                "layout": "baseline",
-                                "spacing": "sm",
-                                "contents": [
-                                    {
-                                        "type": "text",
-                                        "text": members_card_const.const.MESSAGE_AWARD_POINTS[language],  # noqa: E501
-                                        "color": "#5B5B5B",
-                                        "size": "sm",
-                                        "flex": 5
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": point,
-                                        "wrap": True,
-                                        "color": "#666666",
-                                        "size": "sm",
-                                        "flex": 2,
-                                        "align": "end"
-                                    }
-                                ]
-                            },
-                        ],
-                        "paddingBottom": "xxl"
-                    },
-                    {
-                        "type": "box",
-                        "layout": "vertical",
-                        "contents": [
-                            {
-                                "type": "text",
-                                "text": members_card_const.const.MESSAGE_THANKS[language],  # noqa: E501
-                                "wrap": True,
-                                "size": "sm",
-                                "color": "#767676"
-                            }
-                        ]
-                    },
-                    {
-                        "type": "box",
-                        "layout": "vertical",
-                        "contents": [
-                            {
-                                "type": "image",
-                                "url": img_url,
-                                "size": "lg"
-                            }
-                        ],
-                        "margin": "xxl"
-                    }
-                ],
-                "paddingTop": "0%"
-            },
-            "footer": {
-                "type": "box",
-                "layout": "vertical",
-                "spacing": "sm",
-                "contents": [
-                    {
-                        "type": "button",
-                        "style": "link",
-                        "height": "sm",
-                        "action": {
-                            "type": "uri",
-                            "label": members_card_const.const.MESSAGE_VIEW[language],  # noqa: E501
-                            "uri": "https://liff.line.me/{liff_id}?lang={language}".format(liff_id=LIFF_ID, language=language)  # noqa: E501
-                        },
-                        "color": "#0033cc"
-                    },
-                    {
-                        "type": "spacer",
-                        "size": "md"
-                    }
-                ],
-                "flex": 0
-            }
-        }
-    }
+import os
+import json
+import logging
+import threading
+import uuid
+
+
+from common import (clock, line, utils)
+from members_card import members_card_pricing
+import members_card_const
+from receipt_template import ReceiptTemplate
+
+
+# 環境変数の宣言
+LIFF_ID = os.getenv('LIFF_ID')
+LOGGER_LEVEL = os.getenv("LOGGER_LEVEL")
+
+# ログ出力の設定
+logger = logging.getLogger()
+if LOGGER_LEVEL == 'DEBUG':
+    logger.setLevel(logging.DEBUG)
+else:
+    logger.setLevel(logging.INFO)
+
+# 言語ごとの電子レシートのテンプレート（初回使用時に生成する）
+_receipt_templates = {}
+_receipt_templates_lock = threading.Lock()
+
+
+def send_push_message(channel_access_token, user_id, product_obj, language):
+    """
+    プッシュメッセージを送信する
+
+    Parameters
+    ----------
+    channel_access_token : str
+        OAのチャネルアクセストークン
+    user_id : str
+        送信対象のユーザーID
+    product_obj : dict
+        データベースより取得した商品データ
+    language : str
+        多言語化対応用のパラメータ
+    """
+    logger.info('productObj: %s', product_obj)
+    modified_product_obj = modify_product_obj(product_obj, language)
+
+    flex_dict = make_flex_recept(**modified_product_obj, language=language)
+
+    line.send_push_message(
+        channel_access_token, flex_dict, user_id)
+
+
+def create_receipt_job(user_id, product_obj, language, price=None):
+    """
+    電子レシート送信ジョブを作成する
+    ※キューに登録するため、JSONに変換できる型で商品データを保持します
+
+    Parameters
+    ----------
+    user_id : str
+        送信対象のユーザーID
+    product_obj : dict
+        データベースより取得した商品データ
+    language : str
+        多言語化対応用のパラメータ
+    price : Price, optional
+        購入時に計算した金額, by default None（商品データから計算する）
+
+    Returns
+    -------
+    dict
+        電子レシート送信ジョブ
+    """
+    if price is None:
+        price = members_card_pricing.calculate(product_obj)
+    return {
+        'userId': user_id,
+        'language': language,
+        # レシートには送信時刻ではなく購入時刻を表示する
+        'purchasedAt': clock.format_now(),
+        'product': {
+            'productId': int(product_obj['productId']),
+            'productName': product_obj['productName'],
+            'unitPrice': int(product_obj['unitPrice']),
+            'postage': int(product_obj['postage']),
+            'fee': int(product_obj['fee']),
+            'imgUrl': product_obj['imgUrl'],
+        },
+        # ポイント付与と同じ計算結果をレシートに表示する
+        'price': price._asdict(),
+        # 再配信・再送時に重複送信されないよう、ジョブごとに固定のリトライキーを使用する
+        'retryKey': str(uuid.uuid4()),
+    }
+
+
+def create_cart_receipt_job(user_id, products, lines, language, price):
+    """
+    カート購入時の電子レシート送信ジョブを作成する
+
+    Parameters
+    ----------
+    user_id : str
+        送信対象のユーザーID
+    products : dict
+        商品IDをキーとした、データベースより取得した商品データ
+    lines : list
+        明細ごとの計算結果（LineItem）のリスト
+    language : str
+        多言語化対応用のパラメータ
+    price : Price
+        カート全体の計算結果
+
+    Returns
+    -------
+    dict
+        電子レシート送信ジョブ
+    """
+    return {
+        'userId': user_id,
+        'language': language,
+        'purchasedAt': clock.format_now(),
+        'items': [{
+            'productId': line_item.productId,
+            'productName': products[line_item.productId]['productName'],
+            'quantity': line_item.quantity,
+            'amount': line_item.amount,
+        } for line_item in lines],
+        'price': price._asdict(),
+        'retryKey': str(uuid.uuid4()),
+    }
+
+
+def send_receipt(channel_access_token, receipt_job):
+    """
+    電子レシート送信ジョブのプッシュメッセージを送信する
+
+    Parameters
+    ----------
+    channel_access_token : str
+        OAのチャネルアクセストークン
+    receipt_job : dict
+        create_receipt_jobまたはcreate_cart_receipt_jobで作成した電子レシート送信ジョブ
+    """
+    language = receipt_job['language']
+    if 'items' in receipt_job:
+        send_cart_receipt(channel_access_token, receipt_job)
+        return
+
+    modified_product_obj = modify_product_obj(
+        receipt_job['product'], language, date=receipt_job['purchasedAt'],
+        price=receipt_job.get('price'))
+
+    # 生成済みのテンプレートに値を埋め込み、JSON文字列のまま送信する
+    body = get_receipt_template(language).render(
+        receipt_job['userId'], **modified_product_obj)
+
+    line.send_push_message_body(
+        channel_access_token, body, receipt_job.get('retryKey'))
+
+
+def send_cart_receipt(channel_access_token, receipt_job):
+    """
+    カート購入時の電子レシートのプッシュメッセージを送信する
+    ※明細数が購入ごとに異なるため、テンプレートを使用せずに本文を作成します
+
+    Parameters
+    ----------
+    channel_access_token : str
+        OAのチャネルアクセストークン
+    receipt_job : dict
+        create_cart_receipt_jobで作成した電子レシート送信ジョブ
+    """
+    language = receipt_job['language']
+    price = members_card_pricing.Price(**receipt_job['price'])
+    lines = [(
+        item['productName'][language],
+        item['quantity'],
+        utils.separate_comma(item['amount']),
+    ) for item in receipt_job['items']]
+    flex_dict = make_flex_cart_recept(
+        receipt_job['purchasedAt'], lines,
+        utils.separate_comma(price.postage),
+        utils.separate_comma(price.fee),
+        utils.separate_comma(price.discount),
+        utils.separate_comma(price.subtotal),
+        utils.separate_comma(price.tax),
+        utils.separate_comma(price.total),
+        utils.separate_comma(price.point),
+        language)
+    body = json.dumps({
+        'to': receipt_job['userId'],
+        'messages': [flex_dict],
+    }, ensure_ascii=False, separators=(',', ':'))
+
+    line.send_push_message_body(
+        channel_access_token, body, receipt_job.get('retryKey'))
+
+
+def get_receipt_template(language):
+    """
+    言語に対応する電子レシートのテンプレートを取得する
+    ※初回呼び出し時にmake_flex_receptから生成し、以降はウォームコンテナ内で再利用します
+
+    Parameters
+    ----------
+    language : str
+        言語設定
+
+    Returns
+    -------
+    ReceiptTemplate
+        電子レシートのテンプレート
+    """
+    template = _receipt_templates.get(language)
+    if template is None:
+        with _receipt_templates_lock:
+            template = _receipt_templates.get(language)
+            if template is None:
+                template = ReceiptTemplate(make_flex_recept, language)
+                _receipt_templates[language] = template
+    return template
+
+
+def send_service_message(channel_access_token, notification_token, product_obj, language):  # noqa: E501
+    """
+    サービスメッセージを送信
+
+    Parameters
+    ----------
+    channel_access_token : str
+        MINIアプリのチャネルアクセストークン
+    notification_token : str
+        MINIアプリの通知用トークン
+    product_obj : dict
+        データベースより取得した商品データ
+    language : str
+        多言語化対応用のパラメータ
+
+    """
+    # サービスメッセ―ジで代引き手数料と支払手数料を表示させないため以下を0にする
+    product_obj['fee'] = 0
+    product_obj['postage'] = 0
+    modified_product_obj = modify_product_obj(product_obj)
+    params = {
+        "sum": modified_product_obj['total'] + '円',
+        "tax": modified_product_obj['tax'] + '円',
+        "date": modified_product_obj['date'],
+        "price": modified_product_obj['product_price'] + '円',
+        "btn1_url": "https://line.me",
+        "discount": modified_product_obj['discount'] + '円',
+        "quantity": "1点",
+        "shop_name": "Use Case STORE",
+        # "payment_fee": modifiedProductObj['fee'] + '円',
+        "product_name": modified_product_obj['product_name'],
+        # "delivery_cash": modifiedProductObj['postage'] + '円'
+    }
+
+    line.send_service_message(
+        channel_access_token, 'ec_comp_d_s_ja', params, notification_token)
+
+
+def modify_product_obj(product_obj, language, discount=0, date=None,
+                       price=None):
+    """
+    データベースより取得した商品データをメッセージ送信に適した状態のdict型に加工する
+
+    Parameters
+    ----------
+    product_obj : dict
+        データベースより取得した商品データ
+    language : str
+        多言語化対応用のパラメータ
+    discount : int, optional
+        値引き率。
+        指定が無い場合0とする。
+    date : str, optional
+        yyyy/MM/dd hh:mm:ss形式の購入日時。
+        指定が無い場合現在日時とする。
+    price : dict or Price, optional
+        購入時に計算した金額。
+        指定が無い場合商品データから計算する。
+
+    Returns
+    -------
+    dict
+        加工後の商品データ
+    """
+    now = date or clock.format_now()
+    if price is None:
+        price = members_card_pricing.calculate(product_obj, discount)
+    elif isinstance(price, dict):
+        price = members_card_pricing.Price(**price)
+    logger.info('point: %s', price.point)
+    modified_product_obj = {
+        'date': now,
+        'product_name': product_obj['productName'][language],
+        'product_price': utils.separate_comma(price.unitPrice),
+        'postage': utils.separate_comma(price.postage),
+        'fee': utils.separate_comma(price.fee),
+        'discount': utils.separate_comma(price.discount),
+        'subtotal': utils.separate_comma(price.subtotal),
+        'tax': utils.separate_comma(price.tax),
+        'total': utils.separate_comma(price.total),
+        'point': utils.separate_comma(price.point),
+        'img_url': product_obj['imgUrl'],
+    }
+
+    return modified_product_obj
+
+
+def make_flex_recept(date, product_name, product_price, postage,
+                     fee, discount, subtotal, tax, total,
+                     point, img_url, language):
+    """
+    電子レシートのフレックスメッセージのdict型データを作成する
+
+    Parameters
+    ----------
+    date: str
+        yyyy/MM/dd hh:mm:ss形式の日付時刻
+    product_name: str
+        商品名
+    product_price: str
+        商品代金
+    postage: str
+        送料
+    commission: str
+        手数料
+    discount: str
+        値下げ料
+    subtotal: str
+        小計
+    tax: str
+        消費税
+    total: str
+        合計
+    point: str
+        付与ポイント
+    img_url: str
+        商品画像のURL
+    language: str
+        言語設定
+
+    Returns
+    -------
+    result : dict
+        Flexmessageの元になる辞書型データ
+    """
+    rows = [_make_receipt_row(product_name, product_price)]
+    rows.extend(_make_summary_rows(
+        postage, fee, discount, subtotal, tax, total, point, language))
+    return _make_flex_bubble(date, rows, img_url, language)
+
+
+def make_flex_cart_recept(date, lines, postage, fee, discount, subtotal,
+                          tax, total, point, language):
+    """
+    カート購入時の電子レシートのフレックスメッセージのdict型データを作成する
+
+    Parameters
+    ----------
+    date: str
+        yyyy/MM/dd hh:mm:ss形式の日付時刻
+    lines: list
+        明細ごとの(商品名, 数量, 金額)のリスト（金額はカンマ区切りの文字列）
+    postage: str
+        送料
+    fee: str
+        手数料
+    discount: str
+        値下げ料
+    subtotal: str
+        小計
+    tax: str
+        消費税
+    total: str
+        合計
+    point: str
+        付与ポイント
+    language: str
+        言語設定
+
+    Returns
+    -------
+    result : dict
+        Flexmessageの元になる辞書型データ
+    """
+    rows = [
+        _make_receipt_row('{0} × {1}'.format(product_name, quantity), amount)
+        for product_name, quantity, amount in lines
+    ]
+    rows.extend(_make_summary_rows(
+        postage, fee, discount, subtotal, tax, total, point, language))
+    return _make_flex_bubble(date, rows, None, language)
+
+
+def _make_summary_rows(postage, fee, discount, subtotal, tax, total, point,
+                       language):
+    """
+    電子レシートの商品明細以下（送料～付与ポイント）の行を作成する
+
+    Returns
+    -------
+    rows : list
+        行のdict型データのリスト
+    """
+    const = members_card_const.const
+    return [
+        _make_receipt_row(const.MESSAGE_POSTAGE[language], postage),
+        _make_receipt_row(const.MESSAGE_FEE[language], fee),
+        _make_receipt_row(const.MESSAGE_DISCOUNT[language], discount),
+        _make_receipt_row(const.MESSAGE_SUBTOTAL[language], subtotal),
+        _make_receipt_row(const.MESSAGE_TAX[language], tax),
+        _make_receipt_row(const.MESSAGE_TOTAL[language], total),
+        _make_receipt_row(const.MESSAGE_AWARD_POINTS[language], point),
+    ]
+
+
+def _make_receipt_row(label, value):
+    """
+    電子レシートの1行（項目名と金額）のdict型データを作成する
+
+    Parameters
+    ----------
+    label: str
+        項目名
+    value: str
+        金額
+
+    Returns
+    -------
+    result : dict
+        行のdict型データ
+    """
+    return {
+        "type": "box",
+        "layout": "baseline",
+        "spacing": "sm",
+        "contents": [
+            {
+                "type": "text",
+                "text": label,
+                "color": "#5B5B5B",
+                "size": "sm",
+                "flex": 5
+            },
+            {
+                "type": "text",
+                "text": value,
+                "wrap": True,
+                "color": "#666666",
+                "size": "sm",
+                "flex": 2,
+                "align": "end"
+            }
+        ]
+    }
+
+
+def _make_flex_bubble(date, rows, img_url, language):
+    """
+    電子レシートのフレックスメッセージのdict型データを作成する
+
+    Parameters
+    ----------
+    date: str
+        yyyy/MM/dd hh:mm:ss形式の日付時刻
+    rows: list
+        明細・金額の行のdict型データのリスト
+    img_url: str
+        商品画像のURL（Noneの場合は画像を表示しない）
+    language: str
+        言語設定
+
+    Returns
+    -------
+    result : dict
+        Flexmessageの元になる辞書型データ
+    """
+    body_contents = [
+        {
+            "type": "box",
+            "layout": "vertical",
+            "margin": "lg",
+            "spacing": "sm",
+            "contents": rows,
+            "paddingBottom": "xxl"
+        },
+        {
+            "type": "box",
+            "layout": "vertical",
+            "contents": [
+                {
+                    "type": "text",
+                    "text": members_card_const.const.MESSAGE_THANKS[language],  # noqa: E501
+                    "wrap": True,
+                    "size": "sm",
+                    "color": "#767676"
+                }
+            ]
+        },
+    ]
+    if img_url is not None:
+        body_contents.append({
+            "type": "box",
+            "layout": "vertical",
+            "contents": [
+                {
+                    "type": "image",
+                    "url": img_url,
+                    "size": "lg"
+                }
+            ],
+            "margin": "xxl"
+        })
+
+    return {
+        "type": "flex",
+        "altText": members_card_const.const.MESSAGE_ALT_TEXT[language],
+        "contents": {
+            "type": "bubble",
+            "header": {
+                "type": "box",
+                "layout": "vertical",
+                "contents": [
+                    {
+                        "type": "text",
+                        "text": "Use Case STORE",
+                        "size": "xxl",
+                        "weight": "bold"
+                    },
+                    {
+                        "type": "text",
+                        "text": date,
+                        "color": "#767676"
+                    },
+                    {
+                        "type": "text",
+                        "wrap": True,
+                        "text": members_card_const.const.MESSAGE_NOTES[language],  # noqa: E501
+                        "color": "#ff6347"
+                    }
+                ]
+            },
+            "body": {
+                "type": "box",
+                "layout": "vertical",
+                "contents": body_contents,
+                "paddingTop": "0%"
+            },
+            "footer": {
+                "type": "box",
+                "layout": "vertical",
+                "spacing": "sm",
+                "contents": [
+                    {
+                        "type": "button",
+                        "style": "link",
+                        "height": "sm",
+                        "action": {
+                            "type": "uri",
+                            "label": members_card_const.const.MESSAGE_VIEW[language],  # noqa: E501
+                            "uri": "https://liff.line.me/{liff_id}?lang={language}".format(liff_id=LIFF_ID, language=language)  # noqa: E501
+                        },
+                        "color": "#0033cc"
+                    },
+                    {
+                        "type": "spacer",
+                        "size": "md"
+                    }
+                ],
+                "flex": 0
+            }
+        }
+    }
@@ -0,0 +1,119 @@
+"""
+AWSサービスへの接続管理用モジュール
+※プロセス内で1つのresource・clientを共有し、初回使用時に生成します
+※boto3は初回使用時に読み込みます（コールドスタート短縮のため）
+
+"""
+import os
+import threading
+
+# 接続設定（Lambdaのタイムアウト内でリトライできる値とする）
+MAX_POOL_CONNECTIONS = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', 16))
+CONNECT_TIMEOUT = float(os.getenv('AWS_CONNECT_TIMEOUT', 1))
+READ_TIMEOUT = float(os.getenv('AWS_READ_TIMEOUT', 2))
+MAX_ATTEMPTS = int(os.getenv('AWS_MAX_ATTEMPTS', 3))
+RETRY_MODE = os.getenv('AWS_RETRY_MODE', 'standard')
+
+_lock = threading.Lock()
+_config = None
+_resources = {}
+_clients = {}
+
+
+def get_config():
+    """
+    botocoreの接続設定を取得する
+
+    Returns
+    -------
+    config : botocore.config.Config
+        接続設定
+    """
+    global _config
+    if _config is None:
+        from botocore.config import Config
+        options = {
+            'max_pool_connections': MAX_POOL_CONNECTIONS,
+            'connect_timeout': CONNECT_TIMEOUT,
+            'read_timeout': READ_TIMEOUT,
+            'retries': {'max_attempts': MAX_ATTEMPTS, 'mode': RETRY_MODE},
+        }
+        try:
+            _config = Config(tcp_keepalive=True, **options)
+        except TypeError:
+            # tcp_keepalive未対応のbotocoreの場合
+            _config = Config(**options)
+    return _config
+
+
+def get_resource(service_name):
+    """
+    プロセス内で共有するresourceを取得する
+    ※初回呼び出し時に生成します
+
+    Parameters
+    ----------
+    service_name : str
+        サービス名
+
+    Returns
+    -------
+    resource : boto3.resources.base.ServiceResource
+        resource
+    """
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                import boto3
+                resource = boto3.resource(service_name, config=get_config())
+                _resources[service_name] = resource
+    return resource
+
+
+def get_client(service_name):
+    """
+    プロセス内で共有するclientを取得する
+    ※初回呼び出し時に生成します
+    ※resource.meta.clientにはresource用の型変換処理が登録されているため、
+    　ワイヤー形式で扱う場合はresourceとは別のclientを使用します
+
+    Parameters
+    ----------
+    service_name : str
+        サービス名
+
+    Returns
+    -------
+    client : botocore.client.BaseClient
+        client
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                import boto3
+                client = boto3.client(service_name, config=get_config())
+                _clients[service_name] = client
+    return client
+
+
+def new_resource(service_name):
+    """
+    新しいセッションでresourceを生成する
+    ※resourceはスレッドセーフではないため、ワーカースレッドごとに使用します
+
+    Parameters
+    ----------
+    service_name : str
+        サービス名
+
+    Returns
+    -------
+    resource : boto3.resources.base.ServiceResource
+        resource
+    """
+    import boto3
+    return boto3.session.Session().resource(service_name, config=get_config())
@@ -1,269 +1,1115 @@
-"""
-DynamoDB操作用基底モジュール
-
-"""
-import boto3
-from boto3.dynamodb.conditions import Key
-import logging
-
-# ログ出力の設定
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-
-class DynamoDB:
-    """DynamoDB操作用基底クラス"""
-    __slots__ = ['_db', '_table_name']
-
-    def __init__(self, table_name):
-        """初期化メソッド"""
-        self._table_name = table_name
-        self._db = boto3.resource('dynamodb')
-
-    def _put_item(self, item):
-        """
-        アイテムを登録する
-
-        Parameters
-        ----------
-        item : dict
-            登録するアイテム
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        try:
-            response = self._table.put_item(
-                Item=self._replace_data_for_dynamodb(item))
-        except Exception as e:
-            raise e
-
-        return response
-
-    def _update_item(self, key, expression, expression_value, return_value):
-        """
-        アイテムを更新する
-
-        Parameters
-        ----------
-        key : dict
-            更新するアイテムのキー
-        expression : str
-            更新の式
-        expression_value : dict
-            更新する値
-        return_value : str
-            responseで取得する値
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        try:
-            response = self._table.update_item(Key=key,
-                                               UpdateExpression=expression,
-                                               ExpressionAttributeValues=self._replace_data_for_dynamodb(  # noqa: E501
-                                                   expression_value),
-                                               ReturnValues=return_value)
-        except Exception as e:
-            raise e
-
-        return response
-
-    def _update_item_optional(self, key, update_expression,
-                              condition_expression, expression_attribute_names,
-                              expression_value, return_value):
-        """
-        アイテムを更新する
-        ※キー以外の更新条件がある場合に対応します
-        ※
-
-        Parameters
-        ----------
-        key : dict
-            更新するアイテムのキー
-        update_expression : str
-            更新の式
-        condition_expression : str
-            更新条件
-        expression_attribute_names:dict
-            プレースホルダー
-            （予約語に対応するため）
-        expression_value : dict
-            各変数宣言
-        return_value : str
-            responseで取得する値
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        try:
-            response = self._table.update_item(
-                Key=key,
-                UpdateExpression=update_expression,
-                ConditionExpression=condition_expression,
-                ExpressionAttributeNames=expression_attribute_names,  # noqa 501
-                ExpressionAttributeValues=self._replace_data_for_dynamodb(
-                    expression_value),
-                ReturnValues=return_value,
-            )
-        except Exception as e:
-            raise e
-
-        return response
-
-    def _delete_item(self, key):
-        """
-        アイテムを削除する
-
-        Parameters
-        ----------
-        key : dict
-            削除するアイテムのキー
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        try:
-            response = self._table.delete_item(Key=key)
-        except Exception as e:
-            raise e
-
-        return response
-
-    def _get_item(self, key):
-        """
-        アイテムを取得する
-
-        Parameters
-        ----------
-        key : dict
-            取得するアイテムのキー
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        try:
-            response = self._table.get_item(Key=key)
-        except Exception as e:
-            raise e
-
-        return response.get('Item', {})
-
-    def _query(self, key, value):
-        """
-        queryメソッドを使用してアイテムを取得する
-
-        Parameters
-        ----------
-        key : dict
-            取得するアイテムのキー
-
-        Returns
-        -------
-        items : list
-            対象アイテムのリスト
-
-        """
-        try:
-            response = self._table.query(
-                KeyConditionExpression=Key(key).eq(value)
-            )
-        except Exception as e:
-            raise e
-
-        return response['Items']
-
-    def _query_index(self, index, expression, expression_value):
-        """
-        indexからアイテムを取得する
-
-        Parameters
-        ----------
-        index : str
-            index名
-        expression : str
-            検索対象の式
-        expression_value : dict
-            expression内で使用する変数名と値
-
-        Returns
-        -------
-        items : list
-            検索結果
-
-        """
-        try:
-            response = self._table.query(
-                IndexName=index,
-                KeyConditionExpression=expression,
-                ExpressionAttributeValues=self._replace_data_for_dynamodb(
-                    expression_value),
-            )
-        except Exception as e:
-            raise e
-
-        return response['Items']
-
-    def _scan(self, key, value=None):
-        """
-        scanメソッドを使用してデータ取得
-
-        Parameters
-        ----------
-        key : str
-            キー名
-        value : object, optional
-            検索する値, by default None
-
-        Returns
-        -------
-        items : list
-            対象アイテムのリスト
-
-
-        """
-        scan_kwargs = {}
-        if value:
-            scan_kwargs['FilterExpression'] = Key(key).eq(value)
-
-        try:
-            response = self._table.scan(**scan_kwargs)
-        except Exception as e:
-            raise e
-
-        return response['Items']
-
-    def _get_table_size(self):
-        """
-        アイテム数を取得する
-
-        Returns
-        -------
-        count : int
-            テーブルのアイテム数
-
-        """
-        try:
-            response = self._table.scan(Select='COUNT')
-        except Exception as e:
-            raise e
-
-        return response.get('Count', 0)
-
-    def _replace_data_for_dynamodb(self, value: dict):
-        return value
+"""
+DynamoDB操作用基底モジュール
+
+"""
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import logging
+
+from aws import connection
+from aws.dynamodb.cache import (ItemCache, MISS)
+from common import metrics
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# BatchGetItem/BatchWriteItemの1リクエストあたりの上限件数
+BATCH_GET_ITEM_LIMIT = 100
+BATCH_WRITE_ITEM_LIMIT = 25
+# 未処理アイテムの再実行設定
+BATCH_MAX_RETRIES = 8
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+BATCH_BACKOFF_MAX_SECONDS = 2.0
+# 並列scanでワーカーから受け取るページのキュー上限（バックプレッシャー）
+PARALLEL_SCAN_QUEUE_SIZE = 16
+# 並列scanで走査が完了したセグメントのカーソル値
+SEGMENT_COMPLETED = 'COMPLETED'
+
+# get_itemでclientを使用した高速取得を行うか
+# ※数値はDecimal型ではなくint型（小数はDecimal型）で返却されます
+CLIENT_FAST_PATH = os.getenv(
+    'DYNAMODB_CLIENT_FAST_PATH', 'false').lower() == 'true'
+
+# 処理時間・消費キャパシティを計測する操作
+INSTRUMENTED_OPERATIONS = frozenset([
+    'get_item', 'put_item', 'update_item', 'delete_item', 'query', 'scan',
+    'batch_get_item', 'batch_write_item'])
+
+# テーブル名ごとのアイテムキャッシュ（同一テーブルのインスタンス間で共有する）
+_table_caches = {}
+# テーブル名ごとのアイテムキャッシュの設定（ttl, max_size, negative_ttl）
+_table_cache_settings = {}
+# テーブル操作に使用するストレージ（Noneの場合はboto3のresourceを使用する）
+_backend = None
+
+
+def set_backend(backend):
+    """
+    テーブル操作に使用するストレージを差し替える
+    ※以降に生成したテーブル操作クラスに反映されます
+
+    Parameters
+    ----------
+    backend : object
+        boto3のDynamoDB resourceと同じインターフェースを持つオブジェクト
+        （aws.dynamodb.memory.InMemoryDynamoDBなど）
+        Noneの場合はboto3のresourceに戻す
+
+    """
+    global _backend
+    _backend = backend
+    _table_caches.clear()
+    _table_cache_settings.clear()
+
+
+class DynamoDB:
+    """DynamoDB操作用基底クラス"""
+    __slots__ = ['_db_resource', '_table_object', '_table_name', '_cache',
+                 '_cache_key_names', '_attribute_schema']
+
+    def __init__(self, table_name):
+        """初期化メソッド"""
+        self._table_name = table_name
+        # resourceとTableは初回使用時に生成する
+        self._db_resource = None
+        self._table_object = None
+        self._cache = None
+        self._cache_key_names = ()
+        self._attribute_schema = None
+
+    @property
+    def _db(self):
+        """
+        DynamoDBのresource
+        ※プロセス内で共有するresourceを初回使用時に取得します
+        """
+        if self._db_resource is None:
+            if _backend is not None:
+                db_resource = _backend
+            else:
+                db_resource = connection.get_resource('dynamodb')
+            if metrics.is_enabled():
+                db_resource = _InstrumentedOperations(db_resource)
+            self._db_resource = db_resource
+        return self._db_resource
+
+    @property
+    def _client(self):
+        """
+        ワイヤー形式で入出力するDynamoDBのclient
+        ※resourceの型変換処理を通さないため、resource.meta.clientとは別に取得します
+        """
+        if _backend is not None:
+            client = _backend.meta.client
+        else:
+            client = connection.get_client('dynamodb')
+        if metrics.is_enabled():
+            return _InstrumentedOperations(client)
+        return client
+
+    @property
+    def _table(self):
+        """
+        操作対象のTableオブジェクト
+        ※初回使用時に生成します
+        """
+        if self._table_object is None:
+            table_object = self._db.Table(self._table_name)
+            if metrics.is_enabled():
+                table_object = _InstrumentedOperations(
+                    table_object, self._table_name)
+            self._table_object = table_object
+        return self._table_object
+
+    def _enable_cache(self, key_names, ttl, max_size=1024, negative_ttl=0,
+                      cache=None):
+        """
+        _get_itemの読み込みキャッシュを有効にする
+        ※同一テーブルのインスタンス間でキャッシュを共有します
+        ※書き込み時の破棄を全インスタンスに反映するため、異なる設定を指定した場合も
+        　最初に作成したキャッシュを使用し、警告を出力します
+
+        Parameters
+        ----------
+        key_names : tuple
+            テーブルのキー名
+        ttl : float
+            アイテムの有効秒数
+        max_size : int, optional
+            保持する最大件数
+        negative_ttl : float, optional
+            存在しなかったアイテムの有効秒数, by default 0（保持しない）
+        cache : object, optional
+            get/set/invalidate/statsを持つ任意のキャッシュ, by default None
+            指定が無い場合はItemCacheを使用する
+
+        """
+        settings = (ttl, max_size, negative_ttl)
+        if cache is None:
+            cache = _table_caches.get(self._table_name)
+            current_settings = _table_cache_settings.get(self._table_name)
+            if cache is not None and current_settings is not None and \
+                    current_settings != settings:
+                logger.warning(
+                    'Cache settings for %s are ignored: %s (using %s)',
+                    self._table_name, settings, current_settings)
+        else:
+            # 任意のキャッシュの場合は設定を比較しない
+            _table_cache_settings.pop(self._table_name, None)
+        if cache is None:
+            cache = ItemCache(ttl, max_size=max_size,
+                              negative_ttl=negative_ttl)
+            _table_cache_settings[self._table_name] = settings
+        _table_caches[self._table_name] = cache
+        self._cache = cache
+        self._cache_key_names = tuple(key_names)
+
+    def _set_attribute_schema(self, schema):
+        """
+        テーブルの属性定義を設定する
+        ※CLIENT_FAST_PATHが有効な場合、_get_itemはclientで取得し、
+        　属性定義から事前に生成した変換関数でPythonの型に変換します
+
+        Parameters
+        ----------
+        schema : aws.dynamodb.schema.AttributeSchema
+            テーブルの属性定義
+
+        """
+        self._attribute_schema = schema
+
+    def cache_stats(self):
+        """
+        読み込みキャッシュの利用状況を取得する
+
+        Returns
+        -------
+        stats : dict
+            ヒット数、ミス数、保持件数
+            キャッシュが無効の場合は空のdict
+
+        """
+        if self._cache is None:
+            return {}
+        return self._cache.stats()
+
+    def _invalidate_cache(self, key):
+        """
+        書き込み対象アイテムのキャッシュを破棄する
+
+        Parameters
+        ----------
+        key : dict
+            アイテムのキー（キー以外の属性を含んでもよい）
+
+        """
+        if self._cache is None:
+            return
+        self._cache.invalidate(_key_signature(
+            {name: key[name] for name in self._cache_key_names}))
+
+    def _put_item(self, item):
+        """
+        アイテムを登録する
+
+        Parameters
+        ----------
+        item : dict
+            登録するアイテム
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        try:
+            response = self._table.put_item(
+                Item=self._replace_data_for_dynamodb(item))
+        except Exception as e:
+            raise e
+        self._invalidate_cache(item)
+
+        return response
+
+    def _put_item_optional(self, item, condition_expression,
+                           expression_attribute_names, expression_value):
+        """
+        条件を満たす場合のみアイテムを登録する
+        ※条件を満たさない場合はConditionalCheckFailedExceptionとなります
+
+        Parameters
+        ----------
+        item : dict
+            登録するアイテム
+        condition_expression : str
+            登録条件
+        expression_attribute_names : dict
+            プレースホルダー
+            （予約語に対応するため）
+        expression_value : dict
+            各変数宣言
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        try:
+            response = self._table.put_item(
+                Item=self._replace_data_for_dynamodb(item),
+                ConditionExpression=condition_expression,
+                ExpressionAttributeNames=expression_attribute_names,
+                ExpressionAttributeValues=self._replace_data_for_dynamodb(
+                    expression_value),
+            )
+        except Exception as e:
+            raise e
+        self._invalidate_cache(item)
+
+        return response
+
+    def _update_item(self, key, expression, expression_value, return_value):
+        """
+        アイテムを更新する
+
+        Parameters
+        ----------
+        key : dict
+            更新するアイテムのキー
+        expression : str
+            更新の式
+        expression_value : dict
+            更新する値
+        return_value : str
+            responseで取得する値
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        try:
+            response = self._table.update_item(Key=key,
+                                               UpdateExpression=expression,
+                                               ExpressionAttributeValues=self._replace_data_for_dynamodb(  # noqa: E501
+                                                   expression_value),
+                                               ReturnValues=return_value)
+        except Exception as e:
+            raise e
+        self._update_cache(key, return_value, response)
+
+        return response
+
+    def _update_item_optional(self, key, update_expression,
+                              condition_expression, expression_attribute_names,
+                              expression_value, return_value):
+        """
+        アイテムを更新する
+        ※キー以外の更新条件がある場合に対応します
+        ※
+
+        Parameters
+        ----------
+        key : dict
+            更新するアイテムのキー
+        update_expression : str
+            更新の式
+        condition_expression : str
+            更新条件
+        expression_attribute_names:dict
+            プレースホルダー
+            （予約語に対応するため）
+        expression_value : dict
+            各変数宣言
+        return_value : str
+            responseで取得する値
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        try:
+            response = self._table.update_item(
+                Key=key,
+                UpdateExpression=update_expression,
+                ConditionExpression=condition_expression,
+                ExpressionAttributeNames=expression_attribute_names,  # noqa 501
+                ExpressionAttributeValues=self._replace_data_for_dynamodb(
+                    expression_value),
+                ReturnValues=return_value,
+            )
+        except Exception as e:
+            raise e
+        self._update_cache(key, return_value, response)
+
+        return response
+
+    def _delete_item(self, key):
+        """
+        アイテムを削除する
+
+        Parameters
+        ----------
+        key : dict
+            削除するアイテムのキー
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        try:
+            response = self._table.delete_item(Key=key)
+        except Exception as e:
+            raise e
+        self._invalidate_cache(key)
+
+        return response
+
+    def _get_item(self, key):
+        """
+        アイテムを取得する
+
+        Parameters
+        ----------
+        key : dict
+            取得するアイテムのキー
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        if self._cache is not None:
+            cache_key = _key_signature(key)
+            item = self._cache.get(cache_key)
+            if item is not MISS:
+                return item
+
+        if CLIENT_FAST_PATH and self._attribute_schema is not None:
+            item = self._get_item_by_client(key)
+        else:
+            try:
+                response = self._table.get_item(Key=key)
+            except Exception as e:
+                raise e
+            item = response.get('Item', {})
+
+        if self._cache is not None:
+            self._cache.set(cache_key, item)
+        return item
+
+    def _get_item_by_client(self, key):
+        """
+        clientを使用してアイテムを取得する
+        ※resourceのTypeDeserializerを介さず、属性定義の変換関数で直接変換します
+
+        Parameters
+        ----------
+        key : dict
+            取得するアイテムのキー
+
+        Returns
+        -------
+        item : dict
+            取得したアイテム
+
+        """
+        schema = self._attribute_schema
+        try:
+            response = self._client.get_item(
+                TableName=self._table_name, Key=schema.encode_key(key))
+        except Exception as e:
+            raise e
+
+        return schema.decode_item(response.get('Item'))
+
+    def _update_cache(self, key, return_value, response):
+        """
+        更新結果をキャッシュに反映する
+        ※更新後の全属性が返却された場合のみ置き換え、それ以外は破棄します
+
+        Parameters
+        ----------
+        key : dict
+            更新したアイテムのキー
+        return_value : str
+            更新時に指定したReturnValues
+        response : dict
+            更新時のレスポンス情報
+
+        """
+        if self._cache is None:
+            return
+        if return_value == 'ALL_NEW' and response.get('Attributes'):
+            self._cache.set(_key_signature(key), response['Attributes'])
+        else:
+            self._invalidate_cache(key)
+
+    def _query(self, key, value):
+        """
+        queryメソッドを使用してアイテムを取得する
+        ※LastEvaluatedKeyを辿り、全ページのアイテムを取得します
+
+        Parameters
+        ----------
+        key : dict
+            取得するアイテムのキー
+
+        Returns
+        -------
+        items : list
+            対象アイテムのリスト
+
+        """
+        try:
+            items = list(self._query_iter(key, value))
+        except Exception as e:
+            raise e
+
+        return items
+
+    def _query_pages(self, key, value, page_size=None, limit=None,
+                     exclusive_start_key=None):
+        """
+        queryメソッドの結果をページ単位で返すジェネレータ
+
+        Parameters
+        ----------
+        key : str
+            パーティションキー名
+        value : object
+            検索する値
+        page_size : int, optional
+            1リクエストあたりの評価件数（Limit）, by default None
+        limit : int, optional
+            取得する最大件数, by default None
+        exclusive_start_key : dict, optional
+            再開用カーソル（前回のLastEvaluatedKey）, by default None
+
+        Yields
+        -------
+        page : tuple
+            (アイテムのリスト, 次ページ取得用カーソル)
+            カーソルがNoneの場合は最終ページ
+
+        """
+        query_kwargs = {'KeyConditionExpression': _key_equals(key, value)}
+        yield from self._paginate(self._table.query, query_kwargs,
+                                  page_size, limit, exclusive_start_key)
+
+    def _query_iter(self, key, value, page_size=None, limit=None,
+                    exclusive_start_key=None):
+        """
+        queryメソッドの結果をアイテム単位で返すジェネレータ
+
+        Parameters
+        ----------
+        _query_pagesを参照
+
+        Yields
+        -------
+        item : dict
+            対象アイテム
+
+        """
+        for items, _ in self._query_pages(key, value, page_size, limit,
+                                          exclusive_start_key):
+            yield from items
+
+    def _query_index(self, index, expression, expression_value):
+        """
+        indexからアイテムを取得する
+        ※LastEvaluatedKeyを辿り、全ページのアイテムを取得します
+
+        Parameters
+        ----------
+        index : str
+            index名
+        expression : str
+            検索対象の式
+        expression_value : dict
+            expression内で使用する変数名と値
+
+        Returns
+        -------
+        items : list
+            検索結果
+
+        """
+        try:
+            items = list(self._query_index_iter(
+                index, expression, expression_value))
+        except Exception as e:
+            raise e
+
+        return items
+
+    def _query_index_pages(self, index, expression, expression_value,
+                           page_size=None, limit=None,
+                           exclusive_start_key=None):
+        """
+        indexのquery結果をページ単位で返すジェネレータ
+
+        Parameters
+        ----------
+        index : str
+            index名
+        expression : str
+            検索対象の式
+        expression_value : dict
+            expression内で使用する変数名と値
+        page_size : int, optional
+            1リクエストあたりの評価件数（Limit）, by default None
+        limit : int, optional
+            取得する最大件数, by default None
+        exclusive_start_key : dict, optional
+            再開用カーソル（前回のLastEvaluatedKey）, by default None
+
+        Yields
+        -------
+        page : tuple
+            (アイテムのリスト, 次ページ取得用カーソル)
+            カーソルがNoneの場合は最終ページ
+
+        """
+        query_kwargs = {
+            'IndexName': index,
+            'KeyConditionExpression': expression,
+            'ExpressionAttributeValues': self._replace_data_for_dynamodb(
+                expression_value),
+        }
+        yield from self._paginate(self._table.query, query_kwargs,
+                                  page_size, limit, exclusive_start_key)
+
+    def _query_index_iter(self, index, expression, expression_value,
+                          page_size=None, limit=None,
+                          exclusive_start_key=None):
+        """
+        indexのquery結果をアイテム単位で返すジェネレータ
+
+        Parameters
+        ----------
+        _query_index_pagesを参照
+
+        Yields
+        -------
+        item : dict
+            検索結果のアイテム
+
+        """
+        for items, _ in self._query_index_pages(
+                index, expression, expression_value, page_size, limit,
+                exclusive_start_key):
+            yield from items
+
+    def _scan(self, key, value=None):
+        """
+        scanメソッドを使用してデータ取得
+        ※LastEvaluatedKeyを辿り、全ページのアイテムを取得します
+
+        Parameters
+        ----------
+        key : str
+            キー名
+        value : object, optional
+            検索する値, by default None
+
+        Returns
+        -------
+        items : list
+            対象アイテムのリスト
+
+
+        """
+        try:
+            items = list(self._scan_iter(key, value))
+        except Exception as e:
+            raise e
+
+        return items
+
+    def _scan_pages(self, key=None, value=None, page_size=None, limit=None,
+                    exclusive_start_key=None):
+        """
+        scan結果をページ単位で返すジェネレータ
+
+        Parameters
+        ----------
+        key : str, optional
+            キー名, by default None
+        value : object, optional
+            検索する値, by default None
+        page_size : int, optional
+            1リクエストあたりの評価件数（Limit）, by default None
+        limit : int, optional
+            取得する最大件数, by default None
+        exclusive_start_key : dict, optional
+            再開用カーソル（前回のLastEvaluatedKey）, by default None
+
+        Yields
+        -------
+        page : tuple
+            (アイテムのリスト, 次ページ取得用カーソル)
+            カーソルがNoneの場合は最終ページ
+
+        """
+        scan_kwargs = {}
+        if value:
+            scan_kwargs['FilterExpression'] = _key_equals(key, value)
+
+        yield from self._paginate(self._table.scan, scan_kwargs,
+                                  page_size, limit, exclusive_start_key)
+
+    def _scan_iter(self, key=None, value=None, page_size=None, limit=None,
+                   exclusive_start_key=None):
+        """
+        scan結果をアイテム単位で返すジェネレータ
+        ※1ページ分のアイテムのみ保持するため、件数に関わらずメモリ使用量は一定です
+
+        Parameters
+        ----------
+        _scan_pagesを参照
+
+        Yields
+        -------
+        item : dict
+            対象アイテム
+
+        """
+        for items, _ in self._scan_pages(key, value, page_size, limit,
+                                         exclusive_start_key):
+            yield from items
+
+    def _parallel_scan(self, total_segments, key=None, value=None,
+                       max_workers=None, page_size=None,
+                       queue_size=PARALLEL_SCAN_QUEUE_SIZE, cursors=None):
+        """
+        Segment/TotalSegmentsでテーブルを分割し、スレッドプールで並列にscanする
+        ※各セグメントの結果は1つのジェネレータにまとめて返します（順不同）
+        ※ワーカーは上限付きキューにページを渡すため、消費が遅い場合は読み込みを待機します
+
+        Parameters
+        ----------
+        total_segments : int
+            分割するセグメント数
+        key : str, optional
+            キー名, by default None
+        value : object, optional
+            検索する値, by default None
+        max_workers : int, optional
+            ワーカースレッド数, by default None（セグメント数）
+        page_size : int, optional
+            1リクエストあたりの評価件数（Limit）, by default None
+        queue_size : int, optional
+            キューに保持する最大ページ数
+        cursors : dict, optional
+            セグメント番号をキーとした再開用カーソル, by default None
+            渡された場合、呼び出し元がページを消費するごとに更新されます
+            走査完了したセグメントはSEGMENT_COMPLETEDとなり、再開時はスキップします
+
+        Yields
+        -------
+        item : dict
+            対象アイテム
+
+        """
+        if cursors is None:
+            cursors = {}
+        segments = [segment for segment in range(total_segments)
+                    if cursors.get(segment) != SEGMENT_COMPLETED]
+        if not segments:
+            return
+
+        scan_kwargs = {'TotalSegments': total_segments}
+        if value:
+            scan_kwargs['FilterExpression'] = _key_equals(key, value)
+
+        pages = queue.Queue(maxsize=queue_size)
+        stop_event = threading.Event()
+
+        def put_page(page):
+            # 呼び出し元が中断した場合に備え、タイムアウト付きで投入する
+            while not stop_event.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan_segment(segment):
+            try:
+                table = self._segment_table()
+                request_kwargs = dict(scan_kwargs, Segment=segment)
+                for items, last_key in self._paginate(
+                        table.scan, request_kwargs, page_size,
+                        exclusive_start_key=cursors.get(segment)):
+                    if not put_page((segment, items, last_key, None)):
+                        return
+            except Exception as e:
+                put_page((segment, [], None, e))
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or len(segments),
+            thread_name_prefix='%s-scan' % self._table_name)
+        try:
+            for segment in segments:
+                executor.submit(scan_segment, segment)
+
+            running = len(segments)
+            while running:
+                segment, items, last_key, error = pages.get()
+                if error:
+                    raise error
+                yield from items
+                # ページを消費し終えてからカーソルを進める
+                cursors[segment] = last_key or SEGMENT_COMPLETED
+                if not last_key:
+                    running -= 1
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True)
+
+    def _segment_table(self):
+        """
+        並列scanのワーカー用にテーブルオブジェクトを生成する
+        ※boto3のresourceはスレッドセーフではないため、新しいセッションで生成します
+        ※差し替えたストレージはスレッドセーフであることを前提に共有します
+
+        Returns
+        -------
+        table : boto3.resources.factory.dynamodb.Table
+            テーブルオブジェクト
+
+        """
+        if _backend is not None:
+            return self._db.Table(self._table_name)
+        return connection.new_resource('dynamodb').Table(self._table_name)
+
+    def _paginate(self, operation, request_kwargs, page_size=None,
+                  limit=None, exclusive_start_key=None):
+        """
+        LastEvaluatedKeyを辿りながらscan/queryを実行するジェネレータ
+
+        Parameters
+        ----------
+        operation : function
+            実行するメソッド（Table.scan, Table.query）
+        request_kwargs : dict
+            メソッドに渡す引数
+        page_size : int, optional
+            1リクエストあたりの評価件数（Limit）, by default None
+        limit : int, optional
+            取得する最大件数, by default None
+            最終ページのLimitを残件数に絞るため、返却するカーソルから正確に再開できます
+        exclusive_start_key : dict, optional
+            再開用カーソル（前回のLastEvaluatedKey）, by default None
+
+        Yields
+        -------
+        page : tuple
+            (アイテムのリスト, 次ページ取得用カーソル)
+
+        """
+        remaining = limit
+        start_key = exclusive_start_key
+        while remaining is None or remaining > 0:
+            kwargs = dict(request_kwargs)
+            request_limit = page_size
+            if remaining is not None:
+                request_limit = min(page_size or remaining, remaining)
+            if request_limit:
+                kwargs['Limit'] = request_limit
+            if start_key:
+                kwargs['ExclusiveStartKey'] = start_key
+
+            try:
+                response = operation(**kwargs)
+            except Exception as e:
+                raise e
+
+            items = response.get('Items', [])
+            start_key = response.get('LastEvaluatedKey')
+            if remaining is not None:
+                remaining -= response.get('Count', len(items))
+            yield items, start_key
+
+            if not start_key:
+                break
+
+    def _batch_get_items(self, keys):
+        """
+        BatchGetItemを使用して複数アイテムを取得する
+        ※100件ずつに分割して取得し、UnprocessedKeysはバックオフ後に再取得します
+
+        Parameters
+        ----------
+        keys : list
+            取得するアイテムのキーのリスト
+
+        Returns
+        -------
+        items : list
+            取得したアイテムのリスト（順不同）
+
+        """
+        items = []
+        # 同一キーを含むとValidationExceptionとなるため重複を除く
+        unique_keys = list({_key_signature(key): key for key in keys}.values())
+        for chunk in _chunk(unique_keys, BATCH_GET_ITEM_LIMIT):
+            request_items = {self._table_name: {'Keys': chunk}}
+            retry_count = 0
+            while request_items:
+                try:
+                    response = self._db.batch_get_item(
+                        RequestItems=request_items)
+                except Exception as e:
+                    raise e
+                items.extend(
+                    response.get('Responses', {}).get(self._table_name, []))
+                request_items = response.get('UnprocessedKeys')
+                if request_items:
+                    retry_count = _wait_for_retry(retry_count, 'UnprocessedKeys')  # noqa: E501
+
+        return items
+
+    def _batch_write_items(self, put_items=None, delete_keys=None,
+                           key_names=None):
+        """
+        BatchWriteItemを使用して複数アイテムを登録・削除する
+        ※25件ずつに分割して実行し、UnprocessedItemsはバックオフ後に再実行します
+        ※同一キーの登録は後のアイテムのみを登録します
+
+        Parameters
+        ----------
+        put_items : list, optional
+            登録するアイテムのリスト, by default None
+        delete_keys : list, optional
+            削除するアイテムのキーのリスト, by default None
+        key_names : tuple, optional
+            テーブルのキー名, by default None
+            指定が無い場合は読み込みキャッシュのキー名、削除するアイテムのキー名の順に使用する
+
+        Returns
+        -------
+        count : int
+            処理したリクエスト件数
+
+        Raises
+        ------
+        ValueError
+            キー名が不明な場合、同一キーの登録と削除を指定した場合
+
+        """
+        if not key_names:
+            key_names = self._cache_key_names
+        if not key_names and delete_keys:
+            key_names = tuple(delete_keys[0])
+        if not key_names and put_items:
+            raise ValueError('key_names is required for put_items')
+
+        # 同一キーを含むとValidationExceptionとなるため重複を除く
+        unique_items = {}
+        for item in put_items or []:
+            unique_items[_key_signature(
+                {name: item[name] for name in key_names})] = item
+        unique_keys = {}
+        for key in delete_keys or []:
+            unique_keys[_key_signature(
+                {name: key[name] for name in key_names})] = key
+        conflicts = unique_items.keys() & unique_keys.keys()
+        if conflicts:
+            raise ValueError(
+                'put and delete for the same key: %s' % next(iter(conflicts)))
+
+        write_requests = [
+            {'PutRequest': {'Item': self._replace_data_for_dynamodb(item)}}
+            for item in unique_items.values()
+        ]
+        write_requests.extend(
+            {'DeleteRequest': {'Key': key}} for key in unique_keys.values())
+
+        for chunk in _chunk(write_requests, BATCH_WRITE_ITEM_LIMIT):
+            request_items = {self._table_name: chunk}
+            retry_count = 0
+            while request_items:
+                try:
+                    response = self._db.batch_write_item(
+                        RequestItems=request_items)
+                except Exception as e:
+                    raise e
+                request_items = response.get('UnprocessedItems')
+                if request_items:
+                    retry_count = _wait_for_retry(retry_count, 'UnprocessedItems')  # noqa: E501
+
+        for item in put_items or []:
+            self._invalidate_cache(item)
+        for key in delete_keys or []:
+            self._invalidate_cache(key)
+
+        return len(write_requests)
+
+    def _get_table_size(self):
+        """
+        アイテム数を取得する
+
+        Returns
+        -------
+        count : int
+            テーブルのアイテム数
+
+        """
+        count = 0
+        start_key = None
+        while True:
+            kwargs = {'Select': 'COUNT'}
+            if start_key:
+                kwargs['ExclusiveStartKey'] = start_key
+            try:
+                response = self._table.scan(**kwargs)
+            except Exception as e:
+                raise e
+            count += response.get('Count', 0)
+            start_key = response.get('LastEvaluatedKey')
+            if not start_key:
+                break
+
+        return count
+
+    def _replace_data_for_dynamodb(self, value: dict):
+        return value
+
+
+class _InstrumentedOperations:
+    """
+    resource・client・Tableの操作の処理時間と消費キャパシティを計測するラッパー
+    ※metricsが有効な場合のみ使用し、INSTRUMENTED_OPERATIONS以外はそのまま委譲します
+    """
+    __slots__ = ['_target', '_table_name']
+
+    def __init__(self, target, table_name=None):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        target : object
+            boto3（またはInMemoryDynamoDB）のresource・client・Table
+        table_name : str, optional
+            Tableの場合のテーブル名（spanの名称に使用する）
+        """
+        self._target = target
+        self._table_name = table_name
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name not in INSTRUMENTED_OPERATIONS:
+            return attribute
+
+        def operation(**kwargs):
+            table_name = self._table_name or kwargs.get('TableName')
+            span_name = 'dynamodb.%s.%s' % (table_name, name) \
+                if table_name else 'dynamodb.%s' % name
+            kwargs.setdefault('ReturnConsumedCapacity', 'TOTAL')
+            with metrics.span(span_name):
+                response = attribute(**kwargs)
+            metrics.add_consumed_capacity(response.get('ConsumedCapacity'))
+            return response
+        return operation
+
+
+def _key_equals(name, value):
+    """
+    「属性 = 値」の条件を生成する
+    ※boto3は使用時に読み込む（コールドスタート短縮のため）
+
+    Parameters
+    ----------
+    name : str
+        属性名
+    value : object
+        値
+
+    Returns
+    -------
+    condition : boto3.dynamodb.conditions.Equals
+        条件
+    """
+    from boto3.dynamodb.conditions import Key
+    return Key(name).eq(value)
+
+
+def _chunk(values, size):
+    """
+    リストを指定件数ごとに分割する
+
+    Parameters
+    ----------
+    values : list
+        分割するリスト
+    size : int
+        1チャンクあたりの件数
+
+    Returns
+    -------
+    chunks : generator
+        分割したリスト
+    """
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _key_signature(key):
+    """
+    キーのdictを比較可能なタプルに変換する
+
+    Parameters
+    ----------
+    key : dict
+        アイテムのキー
+
+    Returns
+    -------
+    signature : tuple
+        キー名と値のタプル
+    """
+    return tuple(sorted(key.items()))
+
+
+def _wait_for_retry(retry_count, target):
+    """
+    未処理アイテム再実行前にExponential Backoff（Full Jitter）で待機する
+
+    Parameters
+    ----------
+    retry_count : int
+        これまでの再実行回数
+    target : str
+        再実行対象（ログ出力用）
+
+    Returns
+    -------
+    retry_count : int
+        加算後の再実行回数
+    """
+    if retry_count >= BATCH_MAX_RETRIES:
+        raise Exception('%s remained after %d retries' % (target, retry_count))
+    wait_seconds = min(BATCH_BACKOFF_MAX_SECONDS,
+                       BATCH_BACKOFF_BASE_SECONDS * (2 ** retry_count))
+    logger.info('%s exists. retry after %.3f sec', target, wait_seconds)
+    time.sleep(random.uniform(0, wait_seconds))
+    return retry_count + 1
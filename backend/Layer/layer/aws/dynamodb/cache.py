@@ -0,0 +1,128 @@
+"""
+DynamoDBアイテムのプロセス内キャッシュ用モジュール
+
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+# キャッシュ未登録を表す値
+MISS = object()
+
+
+class ItemCache:
+    """
+    TTL・LRU上限付きのアイテムキャッシュ
+    ※Lambdaのウォームコンテナ内で再利用されることを想定しています
+    """
+    __slots__ = ['_ttl', '_negative_ttl', '_max_size', '_entries', '_lock',
+                 'hits', 'misses']
+
+    def __init__(self, ttl, max_size=1024, negative_ttl=0):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        ttl : float
+            アイテムの有効秒数
+        max_size : int, optional
+            保持する最大件数（超過時は最も古く参照されたものから破棄）
+        negative_ttl : float, optional
+            存在しなかったアイテムの有効秒数, by default 0（保持しない）
+        """
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        キャッシュからアイテムを取得する
+
+        Parameters
+        ----------
+        key : tuple
+            アイテムのキー
+
+        Returns
+        -------
+        item : dict
+            アイテムのコピー
+            存在しないアイテムとして保持している場合は空のdict
+            キャッシュに無い場合はMISS
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            item = entry[1]
+        # 呼び出し元での変更がキャッシュに波及しないようコピーを返す
+        return copy.deepcopy(item)
+
+    def set(self, key, item, ttl=None):
+        """
+        アイテムをキャッシュに登録する
+
+        Parameters
+        ----------
+        key : tuple
+            アイテムのキー
+        item : dict
+            登録するアイテム
+            空のdictの場合は存在しないアイテムとしてnegative_ttlの間保持する
+        ttl : float, optional
+            このアイテムの有効秒数, by default None（初期化時の設定に従う）
+        """
+        if ttl is None:
+            ttl = self._ttl if item else self._negative_ttl
+        if ttl <= 0:
+            self.invalidate(key)
+            return
+        entry = (time.monotonic() + ttl, copy.deepcopy(item))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        キャッシュを破棄する
+
+        Parameters
+        ----------
+        key : tuple, optional
+            破棄するアイテムのキー, by default None（全件破棄）
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """
+        キャッシュの利用状況を取得する
+
+        Returns
+        -------
+        stats : dict
+            ヒット数、ミス数、保持件数
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+            }
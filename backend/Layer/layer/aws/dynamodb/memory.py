@@ -0,0 +1,845 @@
+"""
+DynamoDBのインメモリ代替実装用モジュール
+※AWSに接続せずにテーブル操作クラスを動作・計測するために使用します
+
+使用例
+    db = InMemoryDynamoDB(latency=0.005, throttle_rate=0.01, seed=1)
+    db.create_table('MembersCardUserInfo', ('userId',),
+                    {'barcodeNum-index': (('barcodeNum',), ())})
+    base.set_backend(db)
+    user_info = MembersCardUserInfo()
+
+"""
+import copy
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from decimal import Decimal
+
+from botocore.exceptions import ClientError
+
+from aws import connection
+
+# 1ページで返却する最大件数（DynamoDBの1MB制限の代わり）
+DEFAULT_PAGE_ITEM_LIMIT = 1000
+# 再試行前の最大待機秒数（botocoreのstandardリトライと同じ）
+_MAX_RETRY_BACKOFF = 20
+
+_TOKEN_PATTERN = re.compile(
+    r'\s*(?:(<>|<=|>=|=|<|>|\+|-|\(|\)|,)|([#:]?[A-Za-z0-9_]+))')
+_UPDATE_CLAUSES = ('SET', 'ADD', 'REMOVE', 'DELETE')
+
+
+def _client_error(code, operation, message=''):
+    """
+    botocoreと同じ形式の例外を生成する
+
+    Parameters
+    ----------
+    code : str
+        エラーコード
+    operation : str
+        操作名
+    message : str, optional
+        エラーメッセージ
+
+    Returns
+    -------
+    error : botocore.exceptions.ClientError
+        例外
+    """
+    return ClientError(
+        {'Error': {'Code': code, 'Message': message or code}}, operation)
+
+
+def _to_dynamodb_value(value):
+    """
+    登録する値をboto3のresourceと同じ型に変換する
+
+    Parameters
+    ----------
+    value : object
+        登録する値
+
+    Returns
+    -------
+    value : object
+        数値はDecimal型に変換した値
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        raise TypeError(
+            'Float types are not supported. Use Decimal types instead.')
+    if isinstance(value, dict):
+        return {k: _to_dynamodb_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_dynamodb_value(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {_to_dynamodb_value(v) for v in value}
+    return value
+
+
+def _item_size(item):
+    """
+    アイテムのおおよそのサイズ（バイト）を算出する
+
+    Parameters
+    ----------
+    item : dict
+        アイテム
+
+    Returns
+    -------
+    size : int
+        バイト数
+    """
+    return len(json.dumps(item, default=str, ensure_ascii=False)
+               .encode('utf-8'))
+
+
+def _tokenize(expression):
+    """
+    式をトークンに分割する
+
+    Parameters
+    ----------
+    expression : str
+        式
+
+    Returns
+    -------
+    tokens : list
+        トークンのリスト
+    """
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if not match or match.end() == position:
+            raise _client_error('ValidationException', 'Expression',
+                                'Invalid expression: %s' % expression)
+        tokens.append(match.group(1) or match.group(2))
+        position = match.end()
+        while position < len(expression) and expression[position].isspace():
+            position += 1
+    return tokens
+
+
+class _Expression:
+    """式の評価用クラス"""
+
+    def __init__(self, expression, names, values):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = {k: _to_dynamodb_value(v)
+                       for k, v in (values or {}).items()}
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expect(self, token):
+        actual = self.next()
+        if actual is None or actual.upper() != token:
+            raise _client_error('ValidationException', 'Expression',
+                                'Expected %s but got %s' % (token, actual))
+
+    def name(self, token):
+        if token.startswith('#'):
+            return self.names[token]
+        return token
+
+    def value(self, token):
+        return self.values[token]
+
+    # 条件式
+    def condition(self, item):
+        result = self._or(item)
+        if self.peek() is not None:
+            raise _client_error('ValidationException', 'Expression',
+                                'Unexpected token: %s' % self.peek())
+        return result
+
+    def _or(self, item):
+        result = self._and(item)
+        while self.peek() and self.peek().upper() == 'OR':
+            self.next()
+            right = self._and(item)
+            result = result or right
+        return result
+
+    def _and(self, item):
+        result = self._not(item)
+        while self.peek() and self.peek().upper() == 'AND':
+            self.next()
+            right = self._not(item)
+            result = result and right
+        return result
+
+    def _not(self, item):
+        if self.peek() and self.peek().upper() == 'NOT':
+            self.next()
+            return not self._not(item)
+        return self._primary(item)
+
+    def _primary(self, item):
+        token = self.peek()
+        if token == '(':
+            self.next()
+            result = self._or(item)
+            self.expect(')')
+            return result
+
+        function = token.lower()
+        if function in ('attribute_exists', 'attribute_not_exists',
+                        'begins_with', 'contains'):
+            self.next()
+            self.expect('(')
+            path = self.name(self.next())
+            operand = None
+            if self.peek() == ',':
+                self.next()
+                operand = self._operand(item)
+            self.expect(')')
+            if function == 'attribute_exists':
+                return path in item
+            if function == 'attribute_not_exists':
+                return path not in item
+            if path not in item:
+                return False
+            if function == 'begins_with':
+                return str(item[path]).startswith(str(operand))
+            return operand in item[path]
+
+        left = self._operand(item)
+        operator = self.next()
+        if operator.upper() == 'BETWEEN':
+            low = self._operand(item)
+            self.expect('AND')
+            high = self._operand(item)
+            return left is not None and low <= left <= high
+        if operator.upper() == 'IN':
+            self.expect('(')
+            candidates = [self._operand(item)]
+            while self.peek() == ',':
+                self.next()
+                candidates.append(self._operand(item))
+            self.expect(')')
+            return left in candidates
+        right = self._operand(item)
+        if operator == '=':
+            return left is not None and left == right
+        if operator == '<>':
+            return left != right
+        if left is None or right is None:
+            return False
+        try:
+            if operator == '<':
+                return left < right
+            if operator == '<=':
+                return left <= right
+            if operator == '>':
+                return left > right
+            if operator == '>=':
+                return left >= right
+        except TypeError:
+            return False
+        raise _client_error('ValidationException', 'Expression',
+                            'Unsupported operator: %s' % operator)
+
+    def _operand(self, item):
+        token = self.next()
+        if token.startswith(':'):
+            return self.value(token)
+        if token.lower() == 'size':
+            self.expect('(')
+            path = self.name(self.next())
+            self.expect(')')
+            return Decimal(len(item[path])) if path in item else None
+        return item.get(self.name(token))
+
+    # 更新式
+    def update(self, item):
+        clause = None
+        while self.peek() is not None:
+            token = self.peek()
+            if token.upper() in _UPDATE_CLAUSES:
+                clause = self.next().upper()
+                continue
+            if token == ',':
+                self.next()
+                continue
+            path = self.name(self.next())
+            if clause == 'SET':
+                self.expect('=')
+                item[path] = self._set_value(item)
+            elif clause == 'ADD':
+                delta = self.value(self.next())
+                if isinstance(delta, set):
+                    item[path] = set(item.get(path, set())) | delta
+                else:
+                    item[path] = item.get(path, Decimal(0)) + delta
+            elif clause == 'REMOVE':
+                item.pop(path, None)
+            elif clause == 'DELETE':
+                remaining = set(item.get(path, set())) - \
+                    self.value(self.next())
+                if remaining:
+                    item[path] = remaining
+                else:
+                    item.pop(path, None)
+            else:
+                raise _client_error('ValidationException', 'Expression',
+                                    'Invalid update expression')
+
+    def _set_value(self, item):
+        value = self._set_operand(item)
+        while self.peek() in ('+', '-'):
+            operator = self.next()
+            right = self._set_operand(item)
+            value = value + right if operator == '+' else value - right
+        return value
+
+    def _set_operand(self, item):
+        token = self.next()
+        function = token.lower()
+        if function == 'if_not_exists':
+            self.expect('(')
+            path = self.name(self.next())
+            self.expect(',')
+            default = self._set_operand(item)
+            self.expect(')')
+            return item[path] if path in item else default
+        if function == 'list_append':
+            self.expect('(')
+            first = self._set_operand(item)
+            self.expect(',')
+            second = self._set_operand(item)
+            self.expect(')')
+            return list(first) + list(second)
+        if token.startswith(':'):
+            return self.value(token)
+        return item.get(self.name(token))
+
+
+def _build_condition(condition, names, values, is_key_condition=False):
+    """
+    boto3のConditionオブジェクトを文字列の式に変換する
+
+    Parameters
+    ----------
+    condition : str, boto3.dynamodb.conditions.ConditionBase
+        条件式
+    names : dict
+        ExpressionAttributeNames
+    values : dict
+        ExpressionAttributeValues
+
+    Returns
+    -------
+    expression : tuple
+        (式, ExpressionAttributeNames, ExpressionAttributeValues)
+    """
+    if condition is None or isinstance(condition, str):
+        return condition, names, values
+    from boto3.dynamodb.conditions import ConditionExpressionBuilder
+    built = ConditionExpressionBuilder().build_expression(
+        condition, is_key_condition=is_key_condition)
+    names = dict(names or {}, **built.attribute_name_placeholders)
+    values = dict(values or {}, **built.attribute_value_placeholders)
+    return built.condition_expression, names, values
+
+
+class InMemoryTable:
+    """
+    DynamoDBのTableオブジェクトのインメモリ代替クラス
+    ※boto3のTableと同じメソッド・引数・戻り値の形式で動作します
+    """
+
+    def __init__(self, db, name, key_names, indexes=None):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        db : InMemoryDynamoDB
+            テーブルを保持するDB
+        name : str
+            テーブル名
+        key_names : tuple
+            テーブルのキー名（パーティションキー, ソートキー）
+        indexes : dict, optional
+            index名をキーとした(indexのキー名のタプル, 射影する属性のタプル or None)
+            射影する属性がNoneの場合は全属性を射影する
+        """
+        self._db = db
+        self.name = name
+        self.key_names = tuple(key_names)
+        self.indexes = indexes or {}
+        self._items = {}
+        self._sorted_keys = None
+        self._lock = threading.RLock()
+
+    @property
+    def table_name(self):
+        return self.name
+
+    @property
+    def item_count(self):
+        return len(self._items)
+
+    def _key(self, key):
+        try:
+            return tuple(_to_dynamodb_value(key[name])
+                         for name in self.key_names)
+        except KeyError:
+            raise _client_error(
+                'ValidationException', 'GetItem',
+                'The provided key element does not match the schema')
+
+    def _key_dict(self, item, key_names=None):
+        return {name: item[name] for name in key_names or self.key_names}
+
+    def _ordered_keys(self):
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(
+                self._items, key=lambda key: tuple(str(v) for v in key))
+        return self._sorted_keys
+
+    def _write(self, key, item):
+        if key not in self._items:
+            self._sorted_keys = None
+        if item is None:
+            self._items.pop(key, None)
+            self._sorted_keys = None
+        else:
+            self._items[key] = item
+
+    def _response(self, response, kwargs, read_units=0, write_units=0):
+        if kwargs.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = {
+                'TableName': self.name,
+                'CapacityUnits': read_units + write_units,
+            }
+        return response
+
+    def get_item(self, Key, **kwargs):
+        self._db._before_request('GetItem')
+        with self._lock:
+            item = self._items.get(self._key(Key))
+            item = copy.deepcopy(item)
+        units = self._db._consume_read(self.name, item or {},
+                                       kwargs.get('ConsistentRead'))
+        response = {'Item': item} if item is not None else {}
+        return self._response(response, kwargs, read_units=units)
+
+    def put_item(self, Item, ConditionExpression=None,
+                 ExpressionAttributeNames=None,
+                 ExpressionAttributeValues=None, ReturnValues='NONE',
+                 **kwargs):
+        self._db._before_request('PutItem')
+        item = _to_dynamodb_value(copy.deepcopy(Item))
+        key = self._key(item)
+        with self._lock:
+            old = self._items.get(key)
+            self._check_condition(old, ConditionExpression,
+                                  ExpressionAttributeNames,
+                                  ExpressionAttributeValues, 'PutItem')
+            self._write(key, item)
+        units = self._db._consume_write(self.name, item)
+        response = {}
+        if ReturnValues == 'ALL_OLD' and old is not None:
+            response['Attributes'] = copy.deepcopy(old)
+        return self._response(response, kwargs, write_units=units)
+
+    def update_item(self, Key, UpdateExpression,
+                    ConditionExpression=None,
+                    ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE',
+                    **kwargs):
+        self._db._before_request('UpdateItem')
+        key = self._key(Key)
+        with self._lock:
+            old = self._items.get(key)
+            self._check_condition(old, ConditionExpression,
+                                  ExpressionAttributeNames,
+                                  ExpressionAttributeValues, 'UpdateItem')
+            item = copy.deepcopy(old) if old is not None else \
+                _to_dynamodb_value(dict(Key))
+            _Expression(UpdateExpression, ExpressionAttributeNames,
+                        ExpressionAttributeValues).update(item)
+            self._write(key, item)
+        units = self._db._consume_write(self.name, item)
+
+        response = {}
+        old = old or {}
+        if ReturnValues == 'ALL_NEW':
+            response['Attributes'] = copy.deepcopy(item)
+        elif ReturnValues == 'ALL_OLD' and old:
+            response['Attributes'] = copy.deepcopy(old)
+        elif ReturnValues in ('UPDATED_NEW', 'UPDATED_OLD'):
+            source = item if ReturnValues == 'UPDATED_NEW' else old
+            response['Attributes'] = {
+                name: copy.deepcopy(source[name])
+                for name in set(item) | set(old)
+                if name in source and item.get(name) != old.get(name)
+            }
+        return self._response(response, kwargs, write_units=units)
+
+    def delete_item(self, Key, ConditionExpression=None,
+                    ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues='NONE',
+                    **kwargs):
+        self._db._before_request('DeleteItem')
+        key = self._key(Key)
+        with self._lock:
+            old = self._items.get(key)
+            self._check_condition(old, ConditionExpression,
+                                  ExpressionAttributeNames,
+                                  ExpressionAttributeValues, 'DeleteItem')
+            self._write(key, None)
+        units = self._db._consume_write(self.name, old or {})
+        response = {}
+        if ReturnValues == 'ALL_OLD' and old is not None:
+            response['Attributes'] = old
+        return self._response(response, kwargs, write_units=units)
+
+    def query(self, KeyConditionExpression, IndexName=None,
+              FilterExpression=None, ExpressionAttributeNames=None,
+              ExpressionAttributeValues=None, **kwargs):
+        self._db._before_request('Query')
+        names, values = ExpressionAttributeNames, ExpressionAttributeValues
+        key_condition, names, values = _build_condition(
+            KeyConditionExpression, names, values, is_key_condition=True)
+        return self._read_page(kwargs, IndexName, key_condition,
+                               FilterExpression, names, values)
+
+    def scan(self, IndexName=None, FilterExpression=None,
+             ExpressionAttributeNames=None, ExpressionAttributeValues=None,
+             Segment=None, TotalSegments=None, **kwargs):
+        self._db._before_request('Scan')
+        segment = None
+        if TotalSegments:
+            segment = (Segment, TotalSegments)
+        return self._read_page(kwargs, IndexName, None, FilterExpression,
+                               ExpressionAttributeNames,
+                               ExpressionAttributeValues, segment)
+
+    def _read_page(self, kwargs, index_name, key_condition,
+                   filter_expression, names, values, segment=None):
+        filter_expression, names, values = _build_condition(
+            filter_expression, names, values)
+        page_key_names = self.key_names
+        projection = None
+        if index_name:
+            index_key_names, projection = self.indexes[index_name]
+            page_key_names = tuple(index_key_names) + tuple(
+                name for name in self.key_names
+                if name not in index_key_names)
+
+        limit = min(kwargs.get('Limit') or DEFAULT_PAGE_ITEM_LIMIT,
+                    self._db.page_item_limit)
+        start_key = kwargs.get('ExclusiveStartKey')
+        start = self._key(start_key) if start_key else None
+
+        items = []
+        evaluated = 0
+        last_item = None
+        with self._lock:
+            ordered_keys = self._ordered_keys()
+            begin = 0
+            if start is not None:
+                begin = next((i + 1 for i, key in enumerate(ordered_keys)
+                              if key == start), len(ordered_keys))
+            for position in range(begin, len(ordered_keys)):
+                key = ordered_keys[position]
+                item = self._items[key]
+                if segment and zlib.crc32(repr(key).encode()) % \
+                        segment[1] != segment[0]:
+                    continue
+                if index_name and not all(name in item
+                                          for name in page_key_names):
+                    continue
+                if key_condition and not _Expression(
+                        key_condition, names, values).condition(item):
+                    continue
+                evaluated += 1
+                last_item = item
+                if filter_expression and not _Expression(
+                        filter_expression, names, values).condition(item):
+                    if evaluated >= limit:
+                        break
+                    continue
+                if projection is not None:
+                    item = {name: item[name]
+                            for name in page_key_names + tuple(projection)
+                            if name in item}
+                items.append(copy.deepcopy(item))
+                if evaluated >= limit:
+                    break
+            else:
+                last_item = None
+
+        units = self._db._consume_read(
+            self.name, {'Items': items}, kwargs.get('ConsistentRead'))
+        response = {'Count': len(items), 'ScannedCount': evaluated}
+        if kwargs.get('Select') != 'COUNT':
+            response['Items'] = items
+        if last_item is not None:
+            response['LastEvaluatedKey'] = self._key_dict(
+                last_item, page_key_names)
+        return self._response(response, kwargs, read_units=units)
+
+    def _check_condition(self, item, condition, names, values, operation):
+        condition, names, values = _build_condition(condition, names, values)
+        if condition and not _Expression(
+                condition, names, values).condition(item or {}):
+            raise _client_error('ConditionalCheckFailedException', operation,
+                                'The conditional request failed')
+
+
+class _InMemoryClient:
+    """
+    DynamoDBのclientのインメモリ代替クラス
+    ※ワイヤー形式で入出力するget_itemのみ対応しています
+    """
+
+    def __init__(self, db):
+        self._db = db
+
+    def get_item(self, TableName, Key, **kwargs):
+        from boto3.dynamodb.types import (TypeDeserializer, TypeSerializer)
+        deserializer = TypeDeserializer()
+        key = {k: deserializer.deserialize(v) for k, v in Key.items()}
+        response = self._db.Table(TableName).get_item(Key=key, **kwargs)
+        if 'Item' in response:
+            serializer = TypeSerializer()
+            response['Item'] = {k: serializer.serialize(v)
+                                for k, v in response['Item'].items()}
+        return response
+
+
+class _InMemoryMeta:
+    """resource.metaの代替クラス"""
+
+    def __init__(self, client):
+        self.client = client
+
+
+class InMemoryDynamoDB:
+    """
+    DynamoDBのresourceオブジェクトのインメモリ代替クラス
+    ※スレッドセーフに動作し、遅延・スロットリングの注入と消費キャパシティの集計ができます
+    """
+
+    def __init__(self, latency=0, throttle_rate=0, seed=None,
+                 page_item_limit=DEFAULT_PAGE_ITEM_LIMIT, max_attempts=None,
+                 retry_backoff_scale=1):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        latency : float or function, optional
+            1リクエストあたりの遅延秒数, by default 0
+            関数の場合は呼び出すごとの戻り値を遅延秒数とする
+        throttle_rate : float, optional
+            1回の試行でスロットリングを発生させる確率（0～1）, by default 0
+            ※botocoreのstandardリトライと同様に、max_attempts回続けて
+            　スロットリングした場合のみ例外とします
+        seed : int, optional
+            スロットリング判定に使用する乱数のシード, by default None
+        page_item_limit : int, optional
+            scan/queryの1ページで返却する最大件数
+        max_attempts : int, optional
+            スロットリング時の最大試行回数, by default None
+            （connection.MAX_ATTEMPTSと同じ回数）
+        retry_backoff_scale : float, optional
+            再試行前の待機秒数（rand(0, 1) × 2^(試行回数 - 1)、最大20秒）に掛ける倍率
+            , by default 1（0の場合は待機しない）
+        """
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.max_attempts = max_attempts or connection.MAX_ATTEMPTS
+        self.retry_backoff_scale = retry_backoff_scale
+        self.page_item_limit = page_item_limit
+        self._random = random.Random(seed)
+        self.meta = _InMemoryMeta(_InMemoryClient(self))
+        self._tables = {}
+        self._lock = threading.Lock()
+        self.request_counts = {}
+        self.consumed_read_units = {}
+        self.consumed_write_units = {}
+        # 操作ごとのスロットリングした試行回数（再試行で成功した試行を含む）
+        self.throttled_counts = {}
+
+    def create_table(self, name, key_names, indexes=None):
+        """
+        テーブルを作成する
+
+        Parameters
+        ----------
+        name : str
+            テーブル名
+        key_names : tuple
+            テーブルのキー名
+        indexes : dict, optional
+            InMemoryTableを参照
+
+        Returns
+        -------
+        table : InMemoryTable
+            作成したテーブル
+        """
+        with self._lock:
+            table = InMemoryTable(self, name, key_names, indexes)
+            self._tables[name] = table
+        return table
+
+    def Table(self, name):
+        """
+        テーブルを取得する
+
+        Parameters
+        ----------
+        name : str
+            テーブル名
+
+        Returns
+        -------
+        table : InMemoryTable
+            テーブル
+        """
+        try:
+            return self._tables[name]
+        except KeyError:
+            raise _client_error('ResourceNotFoundException', 'DescribeTable',
+                                'Requested resource not found: %s' % name)
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        self._before_request('BatchGetItem', throttle=False)
+        responses = {}
+        unprocessed = {}
+        consumed = {}
+        for table_name, request in RequestItems.items():
+            table = self.Table(table_name)
+            for key in request['Keys']:
+                if self._is_throttled():
+                    unprocessed.setdefault(
+                        table_name, {'Keys': []})['Keys'].append(key)
+                    continue
+                with table._lock:
+                    item = copy.deepcopy(table._items.get(table._key(key)))
+                units = self._consume_read(table_name, item or {},
+                                           request.get('ConsistentRead'))
+                consumed[table_name] = consumed.get(table_name, 0) + units
+                if item is not None:
+                    responses.setdefault(table_name, []).append(item)
+        return self._batch_response(
+            {'Responses': responses, 'UnprocessedKeys': unprocessed},
+            kwargs, consumed)
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        self._before_request('BatchWriteItem', throttle=False)
+        unprocessed = {}
+        consumed = {}
+        for table_name, requests in RequestItems.items():
+            table = self.Table(table_name)
+            for request in requests:
+                if self._is_throttled():
+                    unprocessed.setdefault(table_name, []).append(request)
+                    continue
+                with table._lock:
+                    if 'PutRequest' in request:
+                        item = _to_dynamodb_value(
+                            copy.deepcopy(request['PutRequest']['Item']))
+                        table._write(table._key(item), item)
+                    else:
+                        item = request['DeleteRequest']['Key']
+                        table._write(table._key(item), None)
+                units = self._consume_write(table_name, item)
+                consumed[table_name] = consumed.get(table_name, 0) + units
+        return self._batch_response(
+            {'UnprocessedItems': unprocessed}, kwargs, consumed)
+
+    def _batch_response(self, response, kwargs, consumed):
+        if kwargs.get('ReturnConsumedCapacity') in ('TOTAL', 'INDEXES'):
+            response['ConsumedCapacity'] = [
+                {'TableName': table_name, 'CapacityUnits': units}
+                for table_name, units in consumed.items()
+            ]
+        return response
+
+    def reset_stats(self):
+        """
+        リクエスト数・消費キャパシティの集計をリセットする
+        """
+        with self._lock:
+            self.request_counts = {}
+            self.consumed_read_units = {}
+            self.consumed_write_units = {}
+            self.throttled_counts = {}
+
+    def _is_throttled(self):
+        with self._lock:
+            return self.throttle_rate and \
+                self._random.random() < self.throttle_rate
+
+    def _before_request(self, operation, throttle=True):
+        # botocoreのstandardリトライと同様に、スロットリングした場合は
+        # 待機して再試行し、最大試行回数に達した場合のみ例外とする
+        attempt = 1
+        while True:
+            with self._lock:
+                self.request_counts[operation] = \
+                    self.request_counts.get(operation, 0) + 1
+            latency = self.latency() if callable(self.latency) \
+                else self.latency
+            if latency:
+                time.sleep(latency)
+            if not throttle or not self._is_throttled():
+                return
+            with self._lock:
+                self.throttled_counts[operation] = \
+                    self.throttled_counts.get(operation, 0) + 1
+                backoff = self._random.random() * min(
+                    2 ** (attempt - 1), _MAX_RETRY_BACKOFF)
+            if attempt >= self.max_attempts:
+                raise _client_error('ProvisionedThroughputExceededException',
+                                    operation, 'Rate of requests exceeds '
+                                    'the allowed throughput')
+            if self.retry_backoff_scale:
+                time.sleep(backoff * self.retry_backoff_scale)
+            attempt += 1
+
+    def _consume_read(self, table_name, item, consistent_read=False):
+        # 4KBごとに強い整合性で1、結果整合性で0.5の読み込みキャパシティを消費する
+        units = max(1, -(-_item_size(item) // 4096))
+        if not consistent_read:
+            units *= 0.5
+        with self._lock:
+            self.consumed_read_units[table_name] = \
+                self.consumed_read_units.get(table_name, 0) + units
+        return units
+
+    def _consume_write(self, table_name, item):
+        # 1KBごとに1の書き込みキャパシティを消費する
+        units = max(1, -(-_item_size(item) // 1024))
+        with self._lock:
+            self.consumed_write_units[table_name] = \
+                self.consumed_write_units.get(table_name, 0) + units
+        return units
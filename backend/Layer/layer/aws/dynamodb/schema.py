@@ -0,0 +1,189 @@
+"""
+DynamoDBのワイヤー形式変換用モジュール
+※clientの応答をresourceのTypeDeserializerを介さずにPythonの型へ直接変換します
+
+"""
+from decimal import Decimal
+from operator import itemgetter
+
+
+def _to_number(value):
+    """
+    数値文字列を変換する
+
+    Parameters
+    ----------
+    value : str
+        DynamoDBの数値文字列
+
+    Returns
+    -------
+    number : int, Decimal
+        整数の場合int型、小数を含む場合Decimal型
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return Decimal(value)
+
+
+def _decode_any(value):
+    """
+    型情報からワイヤー形式の値を変換する
+
+    Parameters
+    ----------
+    value : dict
+        {'S': 'abc'}形式の値
+
+    Returns
+    -------
+    result : object
+        変換後の値
+    """
+    (tag, raw), = value.items()
+    if tag == 'S' or tag == 'BOOL' or tag == 'B':
+        return raw
+    if tag == 'N':
+        return _to_number(raw)
+    if tag == 'M':
+        return {k: _decode_any(v) for k, v in raw.items()}
+    if tag == 'L':
+        return [_decode_any(v) for v in raw]
+    if tag == 'NULL':
+        return None
+    if tag == 'SS' or tag == 'BS':
+        return set(raw)
+    if tag == 'NS':
+        return {_to_number(v) for v in raw}
+    raise TypeError('Unsupported DynamoDB type: %s' % tag)
+
+
+def _encode_any(value):
+    """
+    Pythonの値をワイヤー形式に変換する
+
+    Parameters
+    ----------
+    value : object
+        変換する値
+
+    Returns
+    -------
+    result : dict
+        {'S': 'abc'}形式の値
+    """
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, (int, Decimal)):
+        return {'N': str(value)}
+    if isinstance(value, bytes):
+        return {'B': value}
+    raise TypeError('Unsupported key type: %s' % type(value))
+
+
+def _compile_decoder(attribute_type):
+    """
+    属性の型定義から変換関数を生成する
+
+    Parameters
+    ----------
+    attribute_type : str, dict
+        'S', 'N', 'BOOL'、またはMap型の場合は属性名をキーとした型定義
+
+    Returns
+    -------
+    decoder : function
+        ワイヤー形式の値を変換する関数
+    """
+    if isinstance(attribute_type, dict):
+        decoders = {name: _compile_decoder(child_type)
+                    for name, child_type in attribute_type.items()}
+
+        def decode_map(value):
+            return {k: decoders.get(k, _decode_any)(v)
+                    for k, v in value['M'].items()}
+        return decode_map
+    if attribute_type == 'N':
+        get_number = itemgetter('N')
+        return lambda value: _to_number(get_number(value))
+    if attribute_type in ('S', 'BOOL', 'B'):
+        return itemgetter(attribute_type)
+    raise TypeError('Unsupported schema type: %s' % attribute_type)
+
+
+class AttributeSchema:
+    """
+    テーブルの属性定義から事前に生成した変換関数を保持するクラス
+    """
+    __slots__ = ['_decoders', '_key_types']
+
+    def __init__(self, key_types, attribute_types):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        key_types : dict
+            キー名をキーとした型（'S' or 'N'）
+        attribute_types : dict
+            属性名をキーとした型定義
+            定義の無い属性、定義と異なる型の値は型情報から変換する
+        """
+        self._key_types = dict(key_types)
+        self._decoders = {
+            name: _compile_decoder(attribute_type)
+            for name, attribute_type in dict(
+                attribute_types, **key_types).items()
+        }
+
+    def encode_key(self, key):
+        """
+        キーをワイヤー形式に変換する
+
+        Parameters
+        ----------
+        key : dict
+            アイテムのキー
+
+        Returns
+        -------
+        key : dict
+            ワイヤー形式のキー
+        """
+        return {
+            name: {self._key_types[name]: str(value)}
+            if name in self._key_types else _encode_any(value)
+            for name, value in key.items()
+        }
+
+    def decode_item(self, item):
+        """
+        ワイヤー形式のアイテムを変換する
+
+        Parameters
+        ----------
+        item : dict
+            clientで取得したアイテム
+
+        Returns
+        -------
+        item : dict
+            数値をint型（小数はDecimal型）、文字列をstr型に変換したアイテム
+        """
+        if not item:
+            return {}
+        decoders = self._decoders
+        result = {}
+        for name, value in item.items():
+            decoder = decoders.get(name)
+            if decoder is None:
+                result[name] = _decode_any(value)
+                continue
+            try:
+                result[name] = decoder(value)
+            except (KeyError, TypeError):
+                result[name] = _decode_any(value)
+        return result
@@ -0,0 +1,153 @@
+"""
+SQSキューのインメモリ代替実装用モジュール
+※AWSに接続せずに送信・受信処理を動作確認するために使用します
+
+使用例
+    queue = InMemoryQueue(visibility_timeout=30, max_receive_count=3)
+    app.receipt_queue = queue
+    receipt_worker.drain(queue)
+
+"""
+import copy
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from aws.sqs.queue import RECEIVE_MESSAGE_LIMIT
+
+
+class InMemoryQueue:
+    """
+    SQSQueueと同じインターフェースを持つインメモリのキュー
+    ※受信後に削除されなかったメッセージは可視性タイムアウト後に再受信でき、
+    　受信回数がmax_receive_countを超えたメッセージはdead_lettersへ移動します
+    """
+    __slots__ = ['_messages', '_lock', '_visibility_timeout',
+                 '_max_receive_count', '_handles', 'dead_letters',
+                 'sent_count', 'deleted_count']
+
+    def __init__(self, visibility_timeout=30, max_receive_count=3):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        visibility_timeout : float, optional
+            受信したメッセージを他の受信者から隠す秒数
+        max_receive_count : int, optional
+            デッドレターへ移動するまでの最大受信回数
+        """
+        self._messages = OrderedDict()
+        self._lock = threading.Lock()
+        self._visibility_timeout = visibility_timeout
+        self._max_receive_count = max_receive_count
+        self._handles = itertools.count()
+        self.dead_letters = []
+        self.sent_count = 0
+        self.deleted_count = 0
+
+    def __len__(self):
+        return len(self._messages)
+
+    def send_message(self, body):
+        """
+        メッセージを送信する
+
+        Parameters
+        ----------
+        body : dict
+            メッセージ本文
+
+        Returns
+        -------
+        message_id : str
+            メッセージID
+        """
+        message_id = str(uuid.uuid4())
+        with self._lock:
+            self._messages[message_id] = {
+                'body': copy.deepcopy(body),
+                'visibleAt': 0,
+                'receiveCount': 0,
+                'receiptHandle': None,
+            }
+            self.sent_count += 1
+        return message_id
+
+    def receive_messages(self, max_number=RECEIVE_MESSAGE_LIMIT,
+                         wait_time=0):
+        """
+        メッセージを受信する
+
+        Parameters
+        ----------
+        max_number : int, optional
+            受信する最大件数（10件まで）
+        wait_time : int, optional
+            SQSQueueとの互換のための引数（待機しない）
+
+        Returns
+        -------
+        messages : list
+            messageId, receiptHandle, body(dict), receiveCountを持つメッセージのリスト
+        """
+        now = time.monotonic()
+        received = []
+        with self._lock:
+            for message_id, message in list(self._messages.items()):
+                if len(received) >= min(max_number, RECEIVE_MESSAGE_LIMIT):
+                    break
+                if message['visibleAt'] > now:
+                    continue
+                if message['receiveCount'] >= self._max_receive_count:
+                    self.dead_letters.append(self._messages.pop(message_id))
+                    continue
+                message['receiveCount'] += 1
+                message['visibleAt'] = now + self._visibility_timeout
+                message['receiptHandle'] = '%s:%d' % (
+                    message_id, next(self._handles))
+                received.append({
+                    'messageId': message_id,
+                    'receiptHandle': message['receiptHandle'],
+                    'body': copy.deepcopy(message['body']),
+                    'receiveCount': message['receiveCount'],
+                })
+        return received
+
+    def delete_messages(self, receipt_handles):
+        """
+        処理済みのメッセージを削除する
+        ※再受信により無効になった受信ハンドルは削除に失敗します
+
+        Parameters
+        ----------
+        receipt_handles : list
+            削除するメッセージの受信ハンドル
+
+        Returns
+        -------
+        failed : list
+            削除に失敗した受信ハンドル
+        """
+        failed = []
+        with self._lock:
+            for handle in receipt_handles:
+                message_id = handle.rsplit(':', 1)[0]
+                message = self._messages.get(message_id)
+                if message is None or message['receiptHandle'] != handle:
+                    failed.append(handle)
+                    continue
+                del self._messages[message_id]
+                self.deleted_count += 1
+        return failed
+
+    def expire_visibility(self):
+        """
+        受信中のメッセージを即時に再受信可能にする
+        ※可視性タイムアウトを待たずにリトライを確認するために使用します
+        """
+        with self._lock:
+            for message in self._messages.values():
+                message['visibleAt'] = 0
@@ -0,0 +1,127 @@
+"""
+SQSキュー操作用モジュール
+※メッセージ本文はJSON文字列として送受信します
+
+"""
+import json
+import logging
+
+from aws import connection
+from common import metrics
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 1回の受信・削除で扱える最大件数
+RECEIVE_MESSAGE_LIMIT = 10
+
+
+class SQSQueue:
+    """
+    SQSキュー操作用クラス
+    """
+    __slots__ = ['_queue_url']
+
+    def __init__(self, queue_url):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        queue_url : str
+            キューのURL
+        """
+        self._queue_url = queue_url
+
+    @property
+    def _client(self):
+        return connection.get_client('sqs')
+
+    def send_message(self, body):
+        """
+        メッセージを送信する
+
+        Parameters
+        ----------
+        body : dict
+            メッセージ本文
+
+        Returns
+        -------
+        message_id : str
+            メッセージID
+        """
+        try:
+            with metrics.span('sqs.send_message'):
+                response = self._client.send_message(
+                    QueueUrl=self._queue_url,
+                    MessageBody=json.dumps(body, ensure_ascii=False))
+        except Exception as e:
+            raise e
+        return response['MessageId']
+
+    def receive_messages(self, max_number=RECEIVE_MESSAGE_LIMIT,
+                         wait_time=0):
+        """
+        メッセージを受信する
+        ※受信したメッセージは削除するまで可視性タイムアウトの間、他の受信者から見えなくなります
+
+        Parameters
+        ----------
+        max_number : int, optional
+            受信する最大件数（10件まで）
+        wait_time : int, optional
+            ロングポーリングの待機秒数
+
+        Returns
+        -------
+        messages : list
+            messageId, receiptHandle, body(dict), receiveCountを持つメッセージのリスト
+        """
+        try:
+            with metrics.span('sqs.receive_message'):
+                response = self._client.receive_message(
+                    QueueUrl=self._queue_url,
+                    MaxNumberOfMessages=min(max_number, RECEIVE_MESSAGE_LIMIT),
+                    WaitTimeSeconds=wait_time,
+                    AttributeNames=['ApproximateReceiveCount'])
+        except Exception as e:
+            raise e
+        return [{
+            'messageId': message['MessageId'],
+            'receiptHandle': message['ReceiptHandle'],
+            'body': json.loads(message['Body']),
+            'receiveCount': int(message.get('Attributes', {}).get(
+                'ApproximateReceiveCount', 1)),
+        } for message in response.get('Messages', [])]
+
+    def delete_messages(self, receipt_handles):
+        """
+        処理済みのメッセージを削除する
+
+        Parameters
+        ----------
+        receipt_handles : list
+            削除するメッセージの受信ハンドル
+
+        Returns
+        -------
+        failed : list
+            削除に失敗した受信ハンドル
+        """
+        failed = []
+        for start in range(0, len(receipt_handles), RECEIVE_MESSAGE_LIMIT):
+            chunk = receipt_handles[start:start + RECEIVE_MESSAGE_LIMIT]
+            entries = [{'Id': str(i), 'ReceiptHandle': handle}
+                       for i, handle in enumerate(chunk)]
+            try:
+                with metrics.span('sqs.delete_message_batch'):
+                    response = self._client.delete_message_batch(
+                        QueueUrl=self._queue_url, Entries=entries)
+            except Exception as e:
+                raise e
+            for entry in response.get('Failed', []):
+                logger.warning('delete message failed: %s', entry)
+                failed.append(chunk[int(entry['Id'])])
+        return failed
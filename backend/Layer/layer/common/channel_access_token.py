@@ -1,105 +1,359 @@
-"""
-ChannelAccessTokenテーブル操作用モジュール
-
-"""
-import os
-from datetime import datetime
-from dateutil.tz import gettz
-
-from aws.dynamodb.base import DynamoDB
-
-
-class ChannelAccessToken(DynamoDB):
-    """ChannelAccessToken操作用クラス"""
-    __slots__ = ['_table']
-
-    def __init__(self):
-        """初期化メソッド"""
-        table_name = os.getenv(
-            'CHANNEL_ACCESS_TOKEN_DB', 'LINEChannelAccessToken')
-        super().__init__(table_name)
-        self._table = self._db.Table(table_name)
-
-    def get_item(self, channel_id):
-        """
-        channelIdからアイテムを取得する
-
-        Parameters
-        ----------
-        channel_id : str
-            チャネルID
-
-        Returns
-        -------
-        item : dict
-            チャネルの情報
-
-        """
-        key = {'channelId': channel_id}
-
-        try:
-            item = self._get_item(key)
-        except Exception as e:
-            raise e
-        return item
-
-    def update_item(self, channel_id, channel_access_token, limit_date):
-        """
-        短期チャネルアクセストークンと期限日を更新する
-
-        Parameters
-        ----------
-        channel_id : str
-            LINE公式アカウント（Messageing API or MINIアプリ）のチャネルID
-        channel_access_token :　str
-            チャネルアクセストークン
-        limit_date : str
-            短期チャネルアクセストークンの期限日
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        key = {'channelId': channel_id}
-        expression = "set channelAccessToken = :channel_access_token, \
-            limitDate = :limit_date, updatedTime=:updated_time"
-        expression_value = {
-            ':channel_access_token': channel_access_token,
-            ':limit_date': limit_date,
-            ':updated_time': datetime.now(
-                gettz('Asia/Tokyo')).strftime("%Y/%m/%d %H:%M:%S")
-        }
-        return_value = "UPDATED_NEW"
-
-        try:
-            response = self._update_item(key, expression,
-                                         expression_value, return_value)
-        except Exception as e:
-            raise e
-        return response
-
-    def scan(self, channel_id=''):
-        """
-        scanメソッドを使用してデータ取得
-
-        Parameters
-        ----------
-        channel_id : str
-            LINE公式アカウント（Messageing API or MINIアプリ）のチャネルID
-
-        Returns
-        -------
-        items : list
-            取得したアイテムのリスト
-
-        """
-
-        key = 'channelId'
-
-        try:
-            items = self._scan(key, channel_id)
-        except Exception as e:
-            raise e
-        return items
+"""
+ChannelAccessTokenテーブル操作用モジュール
+
+"""
+import os
+import logging
+import threading
+import time
+from datetime import datetime
+
+from aws.dynamodb.base import DynamoDB
+from aws.dynamodb.schema import AttributeSchema
+from common import clock
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 期限日（limitDate）の何秒前からトークンを再取得するか
+CHANNEL_ACCESS_TOKEN_REFRESH_MARGIN = float(
+    os.getenv('CHANNEL_ACCESS_TOKEN_REFRESH_MARGIN', 60 * 60))
+# 再取得してもトークンが更新されていない場合に、次に再取得するまでの秒数
+CHANNEL_ACCESS_TOKEN_RECHECK_INTERVAL = float(
+    os.getenv('CHANNEL_ACCESS_TOKEN_RECHECK_INTERVAL', 5 * 60))
+
+# clientで取得する場合の属性定義
+CHANNEL_ACCESS_TOKEN_SCHEMA = AttributeSchema(
+    {'channelId': 'S'},
+    {
+        'channelAccessToken': 'S',
+        'channelSecret': 'S',
+        'limitDate': 'S',
+        'updatedTime': 'S',
+    },
+)
+
+
+class ChannelAccessToken(DynamoDB):
+    """ChannelAccessToken操作用クラス"""
+    __slots__ = []
+
+    def __init__(self):
+        """初期化メソッド"""
+        table_name = os.getenv(
+            'CHANNEL_ACCESS_TOKEN_DB', 'LINEChannelAccessToken')
+        super().__init__(table_name)
+        self._set_attribute_schema(CHANNEL_ACCESS_TOKEN_SCHEMA)
+        # トークンの更新は日次バッチのみのため、ウォームコンテナ内でキャッシュする
+        cache_ttl = float(os.getenv('CHANNEL_ACCESS_TOKEN_CACHE_TTL', 300))
+        if cache_ttl > 0:
+            self._enable_cache(('channelId',), cache_ttl, negative_ttl=10)
+
+    def get_item(self, channel_id):
+        """
+        channelIdからアイテムを取得する
+
+        Parameters
+        ----------
+        channel_id : str
+            チャネルID
+
+        Returns
+        -------
+        item : dict
+            チャネルの情報
+
+        """
+        key = {'channelId': channel_id}
+
+        try:
+            item = self._get_item(key)
+        except Exception as e:
+            raise e
+        return item
+
+    def invalidate_cache(self, channel_id):
+        """
+        channelIdのアイテムのキャッシュを破棄する
+
+        Parameters
+        ----------
+        channel_id : str
+            チャネルID
+
+        """
+        self._invalidate_cache({'channelId': channel_id})
+
+    def batch_get_items(self, channel_ids):
+        """
+        複数チャネルのアイテムを一括取得する
+
+        Parameters
+        ----------
+        channel_ids : list
+            チャネルIDのリスト
+
+        Returns
+        -------
+        items : list
+            チャネルの情報のリスト（順不同）
+
+        """
+        keys = [{'channelId': channel_id} for channel_id in channel_ids]
+
+        try:
+            items = self._batch_get_items(keys)
+        except Exception as e:
+            raise e
+        return items
+
+    def batch_put_items(self, items):
+        """
+        複数チャネルのアイテムを一括登録する
+
+        Parameters
+        ----------
+        items : list
+            チャネルの情報のリスト
+
+        Returns
+        -------
+        count : int
+            登録件数
+
+        """
+        try:
+            count = self._batch_write_items(put_items=items,
+                                            key_names=('channelId',))
+        except Exception as e:
+            raise e
+        return count
+
+    def update_item(self, channel_id, channel_access_token, limit_date):
+        """
+        短期チャネルアクセストークンと期限日を更新する
+
+        Parameters
+        ----------
+        channel_id : str
+            LINE公式アカウント（Messageing API or MINIアプリ）のチャネルID
+        channel_access_token :　str
+            チャネルアクセストークン
+        limit_date : str
+            短期チャネルアクセストークンの期限日
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        key = {'channelId': channel_id}
+        expression = "set channelAccessToken = :channel_access_token, \
+            limitDate = :limit_date, updatedTime=:updated_time"
+        expression_value = {
+            ':channel_access_token': channel_access_token,
+            ':limit_date': limit_date,
+            ':updated_time': clock.format_now()
+        }
+        return_value = "UPDATED_NEW"
+
+        try:
+            response = self._update_item(key, expression,
+                                         expression_value, return_value)
+        except Exception as e:
+            raise e
+        return response
+
+    def scan(self, channel_id=''):
+        """
+        scanメソッドを使用してデータ取得
+
+        Parameters
+        ----------
+        channel_id : str
+            LINE公式アカウント（Messageing API or MINIアプリ）のチャネルID
+
+        Returns
+        -------
+        items : list
+            取得したアイテムのリスト
+
+        """
+
+        key = 'channelId'
+
+        try:
+            items = self._scan(key, channel_id)
+        except Exception as e:
+            raise e
+        return items
+
+    def scan_iter(self, channel_id='', page_size=None):
+        """
+        scan結果をアイテム単位で返すジェネレータ
+        ※LastEvaluatedKeyを辿り、全ページのアイテムを返します
+
+        Parameters
+        ----------
+        channel_id : str
+            LINE公式アカウント（Messageing API or MINIアプリ）のチャネルID
+        page_size : int, optional
+            1リクエストあたりの評価件数, by default None
+
+        Yields
+        -------
+        item : dict
+            チャネルの情報
+
+        """
+        key = 'channelId'
+        yield from self._scan_iter(key, channel_id, page_size=page_size)
+
+    def parallel_scan(self, total_segments, max_workers=None, cursors=None):
+        """
+        テーブルを分割して並列にscanするジェネレータ
+
+        Parameters
+        ----------
+        total_segments : int
+            分割するセグメント数
+        max_workers : int, optional
+            ワーカースレッド数, by default None（セグメント数）
+        cursors : dict, optional
+            セグメントごとの再開用カーソル, by default None
+
+        Yields
+        -------
+        item : dict
+            チャネルの情報
+
+        """
+        yield from self._parallel_scan(total_segments,
+                                       max_workers=max_workers,
+                                       cursors=cursors)
+
+
+class ChannelAccessTokenProvider:
+    """
+    チャネルアクセストークンをメモリ上に保持するクラス
+    ※トークンは期限日の直前まで保持し、再取得時刻を過ぎるまで再取得しないため、
+    　通常はテーブルを読み込まずにトークンを返します
+    """
+    __slots__ = ['_table_controller', '_channel_id', '_token', '_next_check',
+                 '_lock', '_refresh_lock']
+
+    def __init__(self, table_controller, channel_id):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        table_controller : ChannelAccessToken
+            ChannelAccessTokenテーブル操作クラス
+        channel_id : str
+            チャネルID
+        """
+        self._table_controller = table_controller
+        self._channel_id = channel_id
+        self._token = None
+        self._next_check = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def get(self):
+        """
+        チャネルアクセストークンを取得する
+        ※再取得時刻を過ぎた場合はテーブルから再取得します（失敗した場合は保持中のトークンを返します）
+
+        Returns
+        -------
+        channel_access_token : str
+            チャネルアクセストークン
+        """
+        token = self._token
+        if token is None:
+            return self.reload()
+        if time.time() >= self._next_check:
+            return self._refresh(token)
+        return token
+
+    def reload(self):
+        """
+        テーブルからチャネルアクセストークンを再取得する
+        ※プッシュメッセージAPIで401が返却された場合にも使用します
+
+        Returns
+        -------
+        channel_access_token : str
+            チャネルアクセストークン
+        """
+        with self._lock:
+            self._table_controller.invalidate_cache(self._channel_id)
+            item = self._table_controller.get_item(self._channel_id)
+            if not item or not item.get('channelAccessToken'):
+                raise Exception(
+                    'Channel access token not found: %s' % self._channel_id)
+            self._token = item['channelAccessToken']
+            self._next_check = self._get_next_check(item.get('limitDate'))
+        return self._token
+
+    def _get_next_check(self, limit_date):
+        """
+        次にトークンを再取得する時刻を算出する
+
+        Parameters
+        ----------
+        limit_date : str
+            短期チャネルアクセストークンの期限日
+
+        Returns
+        -------
+        next_check : float
+            再取得するUNIX時刻
+        """
+        now = time.time()
+        recheck = now + CHANNEL_ACCESS_TOKEN_RECHECK_INTERVAL
+        if not limit_date:
+            return recheck
+        try:
+            limit = datetime.strptime(
+                limit_date, clock.LIMIT_DATE_FORMAT).timestamp()
+        except ValueError:
+            logger.warning('Invalid limitDate: %s', limit_date)
+            return recheck
+        next_check = limit - CHANNEL_ACCESS_TOKEN_REFRESH_MARGIN
+        # 期限日を過ぎてもバッチで更新されていない場合は間隔を空けて再取得する
+        if next_check <= now:
+            return recheck
+        return next_check
+
+    def _refresh(self, token):
+        """
+        リクエスト内でトークンを再取得する
+        ※Lambdaでは呼び出し間にスレッドが停止するため、別スレッドでは再取得しません
+        ※他のスレッドが再取得中の場合は待たずに保持中のトークンを返します
+
+        Parameters
+        ----------
+        token : str
+            保持中のチャネルアクセストークン
+
+        Returns
+        -------
+        channel_access_token : str
+            チャネルアクセストークン
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return token
+        try:
+            return self.reload()
+        except Exception:
+            logger.exception('Failed to refresh channel access token')
+            # 失敗した場合も保持中のトークンを使い続け、間隔を空けて再試行する
+            self._next_check = time.time() + \
+                CHANNEL_ACCESS_TOKEN_RECHECK_INTERVAL
+            return token
+        finally:
+            self._refresh_lock.release()
@@ -0,0 +1,226 @@
+"""
+現在日時の取得・書式変換用モジュール
+※タイムゾーンはプロセス内で1度だけ解決し、リクエスト中は同じ日時のスナップショットを共有します
+※set_clockで時計を差し替えることで、検証・ベンチマーク時に日時を固定できます
+
+使用例
+    @clock.request_scoped
+    def lambda_handler(event, context):
+        updated_time = clock.format_now()
+
+"""
+import functools
+import threading
+from datetime import datetime
+
+# 日時のタイムゾーン
+TIMEZONE = 'Asia/Tokyo'
+# 日時の書式
+DATETIME_FORMAT = '%Y/%m/%d %H:%M:%S'
+DATE_FORMAT = '%Y/%m/%d'
+LIMIT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S%z'
+
+_tz = None
+_local = threading.local()
+
+
+class SystemClock:
+    """システム時刻を返す時計"""
+    __slots__ = []
+
+    def now(self, tz):
+        return datetime.now(tz)
+
+
+class FixedClock:
+    """
+    固定の日時を返す時計
+    ※stepを指定した場合は取得するたびにstep分進めます
+    """
+    __slots__ = ['_value', '_step']
+
+    def __init__(self, value, step=None):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        value : datetime
+            返却する日時（タイムゾーン無しの場合はTIMEZONEの日時とする）
+        step : timedelta, optional
+            取得するたびに進める時間, by default None
+        """
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=get_timezone())
+        self._value = value
+        self._step = step
+
+    def now(self, tz):
+        value = self._value
+        if self._step is not None:
+            self._value = value + self._step
+        return value.astimezone(tz)
+
+
+class TimeSnapshot:
+    """
+    ある時点の日時と、その書式変換結果を保持するクラス
+    """
+    __slots__ = ['datetime', '_formatted']
+
+    def __init__(self, value):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        value : datetime
+            日時
+        """
+        self.datetime = value
+        self._formatted = {}
+
+    def format(self, date_format=DATETIME_FORMAT):
+        """
+        日時を書式変換する
+        ※同じ書式の変換結果は再利用します
+
+        Parameters
+        ----------
+        date_format : str, optional
+            書式, by default DATETIME_FORMAT
+
+        Returns
+        -------
+        result : str
+            変換後の文字列
+        """
+        result = self._formatted.get(date_format)
+        if result is None:
+            result = self.datetime.strftime(date_format)
+            self._formatted[date_format] = result
+        return result
+
+
+_clock = SystemClock()
+
+
+def get_timezone():
+    """
+    TIMEZONEのタイムゾーンを取得する
+    ※初回呼び出し時に解決し、以降は同じオブジェクトを返します
+
+    Returns
+    -------
+    tz : datetime.tzinfo
+        タイムゾーン
+    """
+    global _tz
+    if _tz is None:
+        from dateutil.tz import gettz
+        _tz = gettz(TIMEZONE)
+    return _tz
+
+
+def set_clock(clock):
+    """
+    日時の取得に使用する時計を差し替える
+
+    Parameters
+    ----------
+    clock : SystemClock or FixedClock
+        now(tz)を持つ時計
+        Noneの場合はシステム時刻に戻す
+    """
+    global _clock
+    _clock = clock if clock is not None else SystemClock()
+    end_request()
+
+
+def start_request():
+    """
+    リクエスト中に共有する日時のスナップショットを作成する
+
+    Returns
+    -------
+    snapshot : TimeSnapshot
+        スナップショット
+    """
+    _local.snapshot = TimeSnapshot(_clock.now(get_timezone()))
+    return _local.snapshot
+
+
+def end_request():
+    """
+    リクエスト中に共有する日時のスナップショットを破棄する
+    """
+    _local.snapshot = None
+
+
+def request_scoped(handler):
+    """
+    ハンドラーの実行中、日時のスナップショットを共有するデコレーター
+
+    Parameters
+    ----------
+    handler : function
+        Lambdaのハンドラー
+
+    Returns
+    -------
+    wrapper : function
+        デコレート後のハンドラー
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        start_request()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            end_request()
+    return wrapper
+
+
+def snapshot():
+    """
+    現在日時のスナップショットを取得する
+    ※リクエスト中の場合はリクエスト開始時のスナップショットを返します
+
+    Returns
+    -------
+    snapshot : TimeSnapshot
+        スナップショット
+    """
+    current = getattr(_local, 'snapshot', None)
+    if current is None:
+        return TimeSnapshot(_clock.now(get_timezone()))
+    return current
+
+
+def now():
+    """
+    現在日時を取得する
+
+    Returns
+    -------
+    now : datetime
+        TIMEZONEの現在日時
+    """
+    return snapshot().datetime
+
+
+def format_now(date_format=DATETIME_FORMAT):
+    """
+    現在日時を書式変換する
+
+    Parameters
+    ----------
+    date_format : str, optional
+        書式, by default DATETIME_FORMAT
+
+    Returns
+    -------
+    result : str
+        変換後の文字列
+    """
+    return snapshot().format(date_format)
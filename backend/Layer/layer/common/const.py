@@ -1,18 +1,35 @@
-"""
-Constant types in Python.
-定数上書きチェック用
-"""
-import sys
-
-
-class Const:
-    class ConstError(TypeError):
-        pass
-
-    def __setattr__(self, name, value):
-        if name in self.__dict__:
-            raise self.ConstError("Can't rebind const (%s)" % name)
-        self.__dict__[name] = value
-
-
-sys.modules[__name__] = Const()
+"""
+Constant types in Python.
+定数上書きチェック用
+"""
+import sys
+
+
+class Const:
+    class ConstError(TypeError):
+        pass
+
+    def __setattr__(self, name, value):
+        if name in self.__dict__ or name in self._factories():
+            raise self.ConstError("Can't rebind const (%s)" % name)
+        self.__dict__[name] = value
+
+    def __getattr__(self, name):
+        # 未生成の遅延定数の場合は生成して保持する
+        factory = self._factories().pop(name, None)
+        if factory is None:
+            raise AttributeError(name)
+        self.__dict__[name] = value = factory()
+        return value
+
+    def _factories(self):
+        return self.__dict__.setdefault('_lazy_factories', {})
+
+    def set_lazy(self, name, factory):
+        """初回参照時にfactoryの戻り値を値とする定数を登録する"""
+        if name in self.__dict__ or name in self._factories():
+            raise self.ConstError("Can't rebind const (%s)" % name)
+        self._factories()[name] = factory
+
+
+sys.modules[__name__] = Const()
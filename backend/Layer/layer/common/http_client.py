@@ -0,0 +1,154 @@
+"""
+LINE APIへのHTTP接続管理用モジュール
+※プロセス内で1つのセッションを共有し、ウォームコンテナではTCP・TLS接続を再利用します
+※requestsは初回使用時に読み込みます（コールドスタート短縮のため）
+
+"""
+import os
+import threading
+
+# 接続設定
+# ※既定値はAPIのLambdaのタイムアウト（3秒）内にリトライまで終わる値とし、
+# 　タイムアウトの長い関数は環境変数で変更します
+LINE_HTTP_POOL_SIZE = int(os.getenv('LINE_HTTP_POOL_SIZE', 10))
+LINE_HTTP_CONNECT_TIMEOUT = float(os.getenv('LINE_HTTP_CONNECT_TIMEOUT', 1))
+LINE_HTTP_READ_TIMEOUT = float(os.getenv('LINE_HTTP_READ_TIMEOUT', 1))
+# リトライ設定（429・5xxの場合に指数バックオフでリトライする）
+LINE_HTTP_MAX_RETRIES = int(os.getenv('LINE_HTTP_MAX_RETRIES', 1))
+LINE_HTTP_BACKOFF_FACTOR = float(os.getenv('LINE_HTTP_BACKOFF_FACTOR', 0.3))
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# POSTをリトライ対象とするリクエストヘッダー（重複送信が防止されるリクエストのみ）
+RETRY_KEY_HEADER = 'X-Line-Retry-Key'
+
+# 接続・読み込みのタイムアウト
+TIMEOUT = (LINE_HTTP_CONNECT_TIMEOUT, LINE_HTTP_READ_TIMEOUT)
+
+_lock = threading.Lock()
+_sessions = {}
+
+
+def _create_retry(retry_post):
+    """
+    リトライ設定を生成する
+
+    Parameters
+    ----------
+    retry_post : bool
+        POSTもリトライ対象とする場合True
+        ※リトライキーで重複送信を防止できるリクエストのみ指定します
+
+    Returns
+    -------
+    retry : urllib3.util.retry.Retry
+        リトライ設定
+    """
+    from urllib3.util.retry import Retry
+
+    options = {
+        'total': LINE_HTTP_MAX_RETRIES,
+        'backoff_factor': LINE_HTTP_BACKOFF_FACTOR,
+        'status_forcelist': RETRY_STATUS_CODES,
+        'raise_on_status': False,
+        'respect_retry_after_header': True,
+    }
+    if not retry_post:
+        # 既定のリトライ対象（GETなどの冪等なメソッド）のみリトライする
+        return Retry(**options)
+    try:
+        return Retry(allowed_methods=None, **options)
+    except TypeError:
+        # allowed_methods未対応のurllib3の場合
+        return Retry(method_whitelist=False, **options)
+
+
+def get_session(retry_post=False):
+    """
+    プロセス内で共有するセッションを取得する
+    ※初回呼び出し時に生成します
+
+    Parameters
+    ----------
+    retry_post : bool, optional
+        POSTもリトライするセッションを取得する場合True, by default False
+
+    Returns
+    -------
+    session : requests.Session
+        セッション
+    """
+    session = _sessions.get(retry_post)
+    if session is None:
+        with _lock:
+            session = _sessions.get(retry_post)
+            if session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(
+                    pool_connections=LINE_HTTP_POOL_SIZE,
+                    pool_maxsize=LINE_HTTP_POOL_SIZE,
+                    max_retries=_create_retry(retry_post))
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _sessions[retry_post] = session
+    return session
+
+
+def has_retry_key(headers):
+    """
+    リクエストヘッダーにリトライキーが指定されているか
+
+    Parameters
+    ----------
+    headers : dict
+        リクエストヘッダー
+
+    Returns
+    -------
+    result : bool
+        リトライキーが指定されている場合True
+    """
+    return bool(headers) and RETRY_KEY_HEADER in headers
+
+
+def post(url, **kwargs):
+    """
+    共有セッションでPOSTリクエストを送信する
+
+    Parameters
+    ----------
+    url : str
+        リクエスト先URL
+    **kwargs
+        requestsに渡す引数（timeout未指定の場合はTIMEOUTを使用）
+        ※リトライキーをheadersに指定した場合のみ429・5xxでリトライします
+
+    Returns
+    -------
+    response : requests.Response
+        レスポンス
+    """
+    kwargs.setdefault('timeout', TIMEOUT)
+    return get_session(has_retry_key(kwargs.get('headers'))).post(
+        url, **kwargs)
+
+
+def get(url, **kwargs):
+    """
+    共有セッションでGETリクエストを送信する
+
+    Parameters
+    ----------
+    url : str
+        リクエスト先URL
+    **kwargs
+        requestsに渡す引数（timeout未指定の場合はTIMEOUTを使用）
+
+    Returns
+    -------
+    response : requests.Response
+        レスポンス
+    """
+    kwargs.setdefault('timeout', TIMEOUT)
+    return get_session().get(url, **kwargs)
@@ -0,0 +1,225 @@
+"""
+IDトークンのローカル検証用モジュール
+※LINEの検証APIを呼び出さずに、署名・クレームをコンテナ内で検証します
+
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+
+from common import (common_const, http_client)
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.asymmetric.utils import (
+        encode_dss_signature)
+except ImportError:
+    # cryptography未導入の環境ではES256の署名をローカル検証しない
+    ec = None
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# HS256署名の検証に使用するLIFFチャネルのチャネルシークレット
+LIFF_CHANNEL_SECRET = os.getenv('LIFF_CHANNEL_SECRET', None)
+# 公開鍵（JWK）を保持する秒数
+ID_TOKEN_CERTS_TTL = float(os.getenv('ID_TOKEN_CERTS_TTL', 60 * 60 * 24))
+# 未知の鍵IDによる公開鍵の再取得を行う最短間隔（秒）
+ID_TOKEN_CERTS_MIN_REFRESH_INTERVAL = 60
+# 有効期限判定の許容秒数（時刻のずれを考慮する）
+ID_TOKEN_LEEWAY = 5
+
+# LINEの検証APIと同じ形式のエラーレスポンス
+ERROR_EXPIRED = {'error': 'invalid_request',
+                 'error_description': 'IdToken expired.'}
+ERROR_INVALID = {'error': 'invalid_request',
+                 'error_description': 'Invalid IdToken.'}
+
+
+class UnverifiableTokenError(Exception):
+    """
+    ローカルで検証できないIDトークンの例外
+    ※鍵が取得できない場合など。呼び出し元は検証APIでの検証に切り替えます
+    """
+    pass
+
+
+class _CertStore:
+    """LINEの公開鍵（JWK）をコンテナ内で保持するクラス"""
+    __slots__ = ['_keys', '_fetched_at', '_lock']
+
+    def __init__(self):
+        self._keys = {}
+        self._fetched_at = 0
+        self._lock = threading.Lock()
+
+    def get(self, kid):
+        """
+        鍵IDから公開鍵を取得する
+        ※保持期限切れ、または未知の鍵IDの場合に再取得します
+
+        Parameters
+        ----------
+        kid : str
+            鍵ID
+
+        Returns
+        -------
+        key : EllipticCurvePublicKey
+            公開鍵
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = now - self._fetched_at >= ID_TOKEN_CERTS_TTL
+            unknown = kid not in self._keys and \
+                now - self._fetched_at >= ID_TOKEN_CERTS_MIN_REFRESH_INTERVAL
+            if expired or unknown:
+                self._keys = self._fetch()
+                self._fetched_at = now
+            key = self._keys.get(kid)
+        if key is None:
+            raise UnverifiableTokenError('Unknown key id: %s' % kid)
+        return key
+
+    def _fetch(self):
+        try:
+            response = http_client.get(
+                common_const.const.API_ID_TOKEN_CERTS_URL)
+            response.raise_for_status()
+            jwks = response.json()
+        except Exception as e:
+            raise UnverifiableTokenError('Failed to fetch certs: %s' % e)
+
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            if jwk.get('kty') != 'EC' or jwk.get('crv') != 'P-256':
+                continue
+            keys[jwk['kid']] = ec.EllipticCurvePublicNumbers(
+                int.from_bytes(_b64decode(jwk['x']), 'big'),
+                int.from_bytes(_b64decode(jwk['y']), 'big'),
+                ec.SECP256R1()).public_key()
+        logger.info('id token certs loaded: %s', list(keys))
+        return keys
+
+
+_cert_store = _CertStore()
+
+
+def _b64decode(value):
+    """
+    パディング無しのBase64URL文字列をデコードする
+
+    Parameters
+    ----------
+    value : str
+        Base64URL文字列
+
+    Returns
+    -------
+    result : bytes
+        デコード結果
+    """
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+def _verify_signature(header, signing_input, signature):
+    """
+    IDトークンの署名を検証する
+
+    Parameters
+    ----------
+    header : dict
+        JWTのヘッダー
+    signing_input : bytes
+        署名対象（ヘッダー.ペイロード）
+    signature : bytes
+        署名
+
+    Returns
+    -------
+    result : bool
+        署名が正しい場合True
+    """
+    alg = header.get('alg')
+    if alg == 'HS256':
+        if not LIFF_CHANNEL_SECRET:
+            raise UnverifiableTokenError('LIFF_CHANNEL_SECRET is not set')
+        expected = hmac.new(LIFF_CHANNEL_SECRET.encode('utf-8'),
+                            signing_input, hashlib.sha256).digest()
+        return hmac.compare_digest(expected, signature)
+    if alg == 'ES256':
+        if ec is None:
+            raise UnverifiableTokenError('cryptography is not installed')
+        if len(signature) != 64:
+            return False
+        key = _cert_store.get(header.get('kid'))
+        der_signature = encode_dss_signature(
+            int.from_bytes(signature[:32], 'big'),
+            int.from_bytes(signature[32:], 'big'))
+        try:
+            key.verify(der_signature, signing_input,
+                       ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            return False
+        return True
+    raise UnverifiableTokenError('Unsupported algorithm: %s' % alg)
+
+
+def verify(id_token, channel_id):
+    """
+    IDトークンをローカルで検証する
+
+    Parameters
+    ----------
+    id_token : str
+        IDトークン
+    channel_id : str
+        使用アプリのLIFFチャネルID
+        ※LIFFのIDトークンにはアプリからnonceを指定できないため、nonceは検証しません
+
+    Returns
+    -------
+    res_body : dict
+        検証APIと同じ形式のレスポンス情報
+        検証に成功した場合はペイロード、失敗した場合はerrorを含むdict
+
+    Raises
+    ------
+    UnverifiableTokenError
+        ローカルで検証できない場合
+    """
+    try:
+        encoded_header, encoded_payload, encoded_signature = \
+            id_token.split('.')
+        header = json.loads(_b64decode(encoded_header))
+        payload = json.loads(_b64decode(encoded_payload))
+        signature = _b64decode(encoded_signature)
+    except (AttributeError, ValueError):
+        return dict(ERROR_INVALID)
+
+    signing_input = ('%s.%s' % (encoded_header, encoded_payload)).encode(
+        'ascii')
+    if not _verify_signature(header, signing_input, signature):
+        return dict(ERROR_INVALID)
+
+    if payload.get('iss') != common_const.const.ID_TOKEN_ISSUER:
+        return dict(ERROR_INVALID)
+    audience = payload.get('aud')
+    if isinstance(audience, list):
+        valid_audience = channel_id in audience
+    else:
+        valid_audience = audience == channel_id
+    if not valid_audience:
+        return dict(ERROR_INVALID)
+    if float(payload.get('exp', 0)) + ID_TOKEN_LEEWAY < time.time():
+        return dict(ERROR_EXPIRED)
+
+    return payload
@@ -0,0 +1,196 @@
+"""
+冪等キー（idempotencyKey）テーブル操作用モジュール
+※同じ冪等キーのリクエストは1度だけ処理し、再送時は保存済みのレスポンスを返すために使用します
+
+使用例
+    cached = idempotency_store.begin(key, request_hash)
+    if cached is not None:
+        return cached
+    response = ...
+    idempotency_store.complete(key, response)
+
+"""
+import os
+import json
+import hashlib
+
+from aws.dynamodb.base import DynamoDB
+from common import (clock, utils)
+
+# 処理中のまま残った冪等キー（処理中にタイムアウトした場合など）を再取得できるまでの秒数
+# ※Lambdaのタイムアウトより長くすること
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', 30))
+
+# 冪等キーの状態
+STATUS_IN_PROGRESS = 'IN_PROGRESS'
+STATUS_COMPLETED = 'COMPLETED'
+
+
+class IdempotencyError(Exception):
+    """冪等キーのリクエストを処理できない場合の例外"""
+    pass
+
+
+class IdempotencyInProgressError(IdempotencyError):
+    """同じ冪等キーのリクエストが処理中の場合の例外"""
+    pass
+
+
+class IdempotencyKeyMismatchError(IdempotencyError):
+    """同じ冪等キーで異なる内容のリクエストを受け付けた場合の例外"""
+    pass
+
+
+class IdempotencyStore(DynamoDB):
+    """冪等キーテーブル操作用クラス"""
+    __slots__ = []
+
+    def __init__(self):
+        """初期化メソッド"""
+        table_name = os.getenv('IDEMPOTENCY_DB', 'MembersCardIdempotency')
+        super().__init__(table_name)
+
+    def begin(self, idempotency_key, request_hash):
+        """
+        冪等キーを処理中として登録する
+        ※登録済みの場合は登録せず、処理済みであれば保存済みのレスポンスを返します
+
+        Parameters
+        ----------
+        idempotency_key : str
+            冪等キー
+        request_hash : str
+            リクエスト内容のハッシュ値（make_request_hashの戻り値）
+
+        Returns
+        -------
+        response : dict
+            処理済みの場合、保存済みのレスポンス
+            登録した場合（未処理の場合）はNone
+
+        Raises
+        ------
+        IdempotencyInProgressError
+            同じ冪等キーのリクエストが処理中の場合
+        IdempotencyKeyMismatchError
+            同じ冪等キーで異なる内容のリクエストが処理済みまたは処理中の場合
+        """
+        now = clock.now()
+        now_unixtime = int(now.timestamp())
+        item = {
+            'idempotencyKey': idempotency_key,
+            'status': STATUS_IN_PROGRESS,
+            'requestHash': request_hash,
+            'lockedUntil': now_unixtime + IDEMPOTENCY_LOCK_TIMEOUT,
+            'ttl': utils.get_ttl_time(now),
+        }
+        # TTLによる削除は即時ではないため、期限切れのアイテムは未登録として扱う
+        condition_expression = 'attribute_not_exists(idempotencyKey) OR #ttl < :now OR (#status = :in_progress AND lockedUntil < :now)'  # noqa: E501
+        expression_attribute_names = {'#ttl': 'ttl', '#status': 'status'}
+        expression_value = {
+            ':now': now_unixtime,
+            ':in_progress': STATUS_IN_PROGRESS,
+        }
+
+        try:
+            self._put_item_optional(
+                item, condition_expression, expression_attribute_names,
+                expression_value)
+        except Exception as e:
+            if not _is_conditional_check_failed(e):
+                raise e
+        else:
+            return None
+
+        try:
+            existing = self._get_item({'idempotencyKey': idempotency_key})
+        except Exception as e:
+            raise e
+        if existing and existing.get('requestHash') != request_hash:
+            raise IdempotencyKeyMismatchError(idempotency_key)
+        if existing and existing.get('status') == STATUS_COMPLETED:
+            return json.loads(existing['response'])
+        raise IdempotencyInProgressError(idempotency_key)
+
+    def complete(self, idempotency_key, response):
+        """
+        冪等キーを処理済みとし、レスポンスを保存する
+
+        Parameters
+        ----------
+        idempotency_key : str
+            冪等キー
+        response : dict
+            再送時に返却するレスポンス
+
+        """
+        key = {'idempotencyKey': idempotency_key}
+        update_expression = "SET #status = :completed, #response = :response"
+        condition_expression = 'attribute_exists(idempotencyKey)'
+        expression_attribute_names = {
+            '#status': 'status', '#response': 'response'}
+        expression_value = {
+            ':completed': STATUS_COMPLETED,
+            ':response': json.dumps(response, ensure_ascii=False),
+        }
+
+        try:
+            self._update_item_optional(
+                key, update_expression, condition_expression,
+                expression_attribute_names, expression_value, 'NONE')
+        except Exception as e:
+            raise e
+
+    def release(self, idempotency_key):
+        """
+        冪等キーを削除し、同じ冪等キーで再実行できるようにする
+        ※処理が失敗した場合に使用します
+
+        Parameters
+        ----------
+        idempotency_key : str
+            冪等キー
+
+        """
+        try:
+            self._delete_item({'idempotencyKey': idempotency_key})
+        except Exception as e:
+            raise e
+
+
+def make_request_hash(params):
+    """
+    リクエスト内容のハッシュ値を作成する
+
+    Parameters
+    ----------
+    params : dict
+        冪等性の判定に使用するリクエストパラメータ
+
+    Returns
+    -------
+    request_hash : str
+        SHA-256のハッシュ値
+    """
+    body = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def _is_conditional_check_failed(error):
+    """
+    条件付き書き込みの条件を満たさなかったことによる例外か判定する
+    ※botocoreは使用時に読み込むため、エラーコードで判定します
+
+    Parameters
+    ----------
+    error : Exception
+        例外
+
+    Returns
+    -------
+    result : bool
+        ConditionalCheckFailedExceptionの場合True
+    """
+    error_response = getattr(error, 'response', None) or {}
+    return error_response.get('Error', {}).get(
+        'Code') == 'ConditionalCheckFailedException'
@@ -1,78 +1,219 @@
-import logging
-import requests
-import json
-from linebot import LineBotApi
-from linebot.models import FlexSendMessage
-from linebot.exceptions import (
-    LineBotApiError, InvalidSignatureError)
-
-
-from common import common_const
-
-# ログ出力の設定
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-
-
-def send_push_message(channel_access_token, flex_obj, user_id):
-    """
-    プッシュメッセージ送信処理
-    Parameters
-    channel_access_token:str
-        短期チャネルアクセストークン
-    flex_obj:dict
-        メッセージ情報
-    user_id:str
-        送信先のユーザーI
-    Returns
-    -------
-    response:dict
-        レスポンス情報
-    """
-    try:
-        line_bot_api = LineBotApi(
-            channel_access_token)
-        # flexdictを生成する
-        flex_obj = FlexSendMessage.new_from_json_dict(flex_obj)
-        user_id = user_id
-        response = line_bot_api.push_message(user_id, flex_obj)
-    except LineBotApiError as e:
-        logger.error(
-            'Got exception from LINE Messaging API: %s\n' % e.message)
-        for m in e.error.details:
-            logger.error('  %s: %s' % (m.property, m.message))
-        raise Exception
-    except InvalidSignatureError as e:
-        logger.error('Occur Exception: %s', e)
-        raise Exception
-
-    return response
-
-
-def get_profile(id_token, channel_id):
-    """
-    プッシュメッセージ送信処理
-    Parameters
-    id_token:str
-        IDトークン
-    channel_id:dict
-        使用アプリのLIFFチャネルID
-    Returns
-    -------
-    res_body:dict
-        レスポンス情報
-    """
-
-    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-    body = {
-        'id_token': id_token,
-        'client_id': channel_id
-    }
-    response = requests.post(
-        common_const.const.API_USER_ID_URL,
-        headers=headers,
-        data=body
-    )
-
-    res_body = json.loads(response.text)
-    return res_body
+import hashlib
+import logging
+import os
+import time
+import uuid
+import json
+from functools import lru_cache
+
+
+from aws.dynamodb.cache import (ItemCache, MISS)
+from common import (common_const, http_client, metrics)
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# IDトークン検証結果のキャッシュ設定
+ID_TOKEN_CACHE_SIZE = int(os.getenv('ID_TOKEN_CACHE_SIZE', 1024))
+# 検証エラーを保持する秒数
+ID_TOKEN_NEGATIVE_TTL = float(os.getenv('ID_TOKEN_NEGATIVE_TTL', 5))
+# IDトークンの検証方法
+# remote: LINEの検証APIで検証する
+# local: コンテナ内で検証し、検証できない場合のみ検証APIを使用する
+ID_TOKEN_VERIFY_MODE = os.getenv('ID_TOKEN_VERIFY_MODE', 'remote')
+
+# 保持するLineBotApiの件数（チャネルアクセストークンごとに生成する）
+LINE_BOT_API_CACHE_SIZE = int(os.getenv('LINE_BOT_API_CACHE_SIZE', 16))
+
+# ウォームコンテナ内で再利用するIDトークン検証結果のキャッシュ
+# ※有効なトークンは有効期限(exp)まで保持します
+_id_token_cache = ItemCache(0, max_size=ID_TOKEN_CACHE_SIZE)
+
+
+class UnauthorizedError(Exception):
+    """チャネルアクセストークンが無効（401）の場合の例外"""
+
+
+@lru_cache(maxsize=LINE_BOT_API_CACHE_SIZE)
+def get_line_bot_api(channel_access_token):
+    """
+    チャネルアクセストークンに対応するLineBotApiを取得する
+    ※ウォームコンテナ内ではトークンごとに生成済みのインスタンスを再利用します
+    Parameters
+    channel_access_token:str
+        短期チャネルアクセストークン
+    Returns
+    -------
+    line_bot_api:LineBotApi
+        共有セッションを使用するLineBotApi
+    """
+    # linebotは使用時に読み込む（コールドスタート短縮のため）
+    from linebot import LineBotApi
+    from common.line_bot_http_client import SessionHttpClient
+
+    return LineBotApi(channel_access_token, timeout=http_client.TIMEOUT,
+                      http_client=SessionHttpClient)
+
+
+def send_push_message(channel_access_token, flex_obj, user_id):
+    """
+    プッシュメッセージ送信処理
+    Parameters
+    channel_access_token:str
+        短期チャネルアクセストークン
+    flex_obj:dict
+        メッセージ情報
+    user_id:str
+        送信先のユーザーI
+    Returns
+    -------
+    response:dict
+        レスポンス情報
+    """
+    from linebot.models import FlexSendMessage
+    from linebot.exceptions import (
+        LineBotApiError, InvalidSignatureError)
+
+    try:
+        line_bot_api = get_line_bot_api(channel_access_token)
+        # flexdictを生成する
+        flex_obj = FlexSendMessage.new_from_json_dict(flex_obj)
+        user_id = user_id
+        # リトライ時に重複送信されないようリトライキーを指定する
+        with metrics.span('line.push_message'):
+            response = line_bot_api.push_message(
+                user_id, flex_obj, retry_key=str(uuid.uuid4()))
+    except LineBotApiError as e:
+        if e.status_code == 409:
+            # リトライ前のリクエストが受理済みの場合
+            logger.info('Push message already accepted: %s',
+                        e.accepted_request_id)
+            return None
+        if e.status_code == 401:
+            raise UnauthorizedError(e.message)
+        logger.error(
+            'Got exception from LINE Messaging API: %s\n' % e.message)
+        for m in e.error.details:
+            logger.error('  %s: %s' % (m.property, m.message))
+        raise Exception
+    except InvalidSignatureError as e:
+        logger.error('Occur Exception: %s', e)
+        raise Exception
+
+    return response
+
+
+def send_push_message_body(channel_access_token, body, retry_key=None):
+    """
+    JSON文字列のリクエスト本文でプッシュメッセージを送信する
+    ※メッセージのモデルオブジェクトを経由せず、生成済みの本文をそのまま送信します
+    Parameters
+    channel_access_token:str
+        短期チャネルアクセストークン
+    body:str
+        プッシュメッセージAPIのリクエスト本文（JSON文字列）
+    retry_key:str
+        リトライキー（同じメッセージの再送では同じ値を指定する）
+        未指定の場合は送信ごとに生成する
+    Returns
+    -------
+    request_id:str
+        リクエストID
+    """
+    headers = {
+        'Authorization': 'Bearer ' + channel_access_token,
+        'Content-Type': 'application/json',
+        # リトライ時に重複送信されないようリトライキーを指定する
+        'X-Line-Retry-Key': retry_key or str(uuid.uuid4()),
+    }
+    with metrics.span('line.push_message'):
+        response = http_client.post(
+            common_const.const.API_PUSH_MESSAGE_URL,
+            headers=headers,
+            data=body.encode('utf-8')
+        )
+    if response.status_code == 409:
+        # リトライ前のリクエストが受理済みの場合
+        logger.info('Push message already accepted: %s',
+                    response.headers.get('X-Line-Accepted-Request-Id'))
+        return None
+    if response.status_code == 401:
+        raise UnauthorizedError(response.text)
+    if response.status_code != 200:
+        logger.error(
+            'Got exception from LINE Messaging API: %s\n' % response.text)
+        raise Exception
+    return response.headers.get('X-Line-Request-Id')
+
+
+def get_profile(id_token, channel_id):
+    """
+    プッシュメッセージ送信処理
+    ※検証結果はIDトークンのハッシュをキーにキャッシュし、同一トークンの再検証を省略します
+    ※ID_TOKEN_VERIFY_MODEがlocalの場合はコンテナ内で検証します
+    Parameters
+    id_token:str
+        IDトークン
+    channel_id:dict
+        使用アプリのLIFFチャネルID
+    Returns
+    -------
+    res_body:dict
+        レスポンス情報
+    """
+    # トークン自体は保持しないようハッシュ化してキーとする
+    cache_key = hashlib.sha256(
+        ('%s:%s' % (channel_id, id_token)).encode('utf-8')).hexdigest()
+    res_body = _id_token_cache.get(cache_key)
+    if res_body is not MISS:
+        return res_body
+
+    res_body = None
+    if ID_TOKEN_VERIFY_MODE == 'local':
+        # cryptographyを読み込むため、使用時に読み込む
+        from common import id_token_verifier
+        try:
+            with metrics.span('line.verify_id_token_local'):
+                res_body = id_token_verifier.verify(id_token, channel_id)
+        except id_token_verifier.UnverifiableTokenError as e:
+            logger.info('IDトークンを検証APIで検証します: %s', e)
+    if res_body is None:
+        res_body = verify_id_token_remote(id_token, channel_id)
+
+    if 'error' in res_body:
+        ttl = ID_TOKEN_NEGATIVE_TTL
+    else:
+        ttl = float(res_body.get('exp', 0)) - time.time()
+    if ttl > 0:
+        _id_token_cache.set(cache_key, res_body, ttl=ttl)
+    return res_body
+
+
+def verify_id_token_remote(id_token, channel_id):
+    """
+    LINEの検証APIでIDトークンを検証する
+    Parameters
+    id_token:str
+        IDトークン
+    channel_id:dict
+        使用アプリのLIFFチャネルID
+    Returns
+    -------
+    res_body:dict
+        レスポンス情報
+    """
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    body = {
+        'id_token': id_token,
+        'client_id': channel_id
+    }
+    with metrics.span('line.verify_id_token_remote'):
+        response = http_client.post(
+            common_const.const.API_USER_ID_URL,
+            headers=headers,
+            data=body
+        )
+
+    res_body = json.loads(response.text)
+    return res_body
@@ -0,0 +1,31 @@
+"""
+LineBotApi用のHTTPクライアントモジュール
+※LineBotApiの通信をhttp_clientの共有セッションで行います
+
+"""
+from linebot.http_client import (RequestsHttpClient, RequestsHttpResponse)
+
+from common.http_client import (get_session, has_retry_key)
+
+
+class SessionHttpClient(RequestsHttpClient):
+    """
+    共有セッションを使用するLineBotApi用のHTTPクライアント
+    """
+
+    def get(self, url, headers=None, params=None, stream=False, timeout=None):
+        response = get_session().get(
+            url, headers=headers, params=params, stream=stream,
+            timeout=timeout or self.timeout)
+        return RequestsHttpResponse(response)
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        # リトライキーを指定したリクエスト（プッシュメッセージ）のみリトライする
+        response = get_session(has_retry_key(headers)).post(
+            url, headers=headers, data=data, timeout=timeout or self.timeout)
+        return RequestsHttpResponse(response)
+
+    def delete(self, url, headers=None, data=None, timeout=None):
+        response = get_session().delete(
+            url, headers=headers, data=data, timeout=timeout or self.timeout)
+        return RequestsHttpResponse(response)
@@ -0,0 +1,324 @@
+"""
+処理時間・消費キャパシティの計測用モジュール
+※1回の呼び出しごとに、処理区間（span）ごとの処理時間、DynamoDBの消費キャパシティ、
+　コールドスタートかどうかをCloudWatch Embedded Metric Format（EMF）形式の
+　JSONとして1行で出力します
+※METRICS_ENABLEDがtrueでない場合は計測・出力を行いません
+
+使用例
+    @metrics.record_invocation
+    @clock.request_scoped
+    def lambda_handler(event, context):
+        with metrics.span('param_check'):
+            ...
+
+"""
+import os
+import sys
+import json
+import functools
+import threading
+import time
+import logging
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 計測を行うか
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+# CloudWatchメトリクスの名前空間
+METRICS_NAMESPACE = os.getenv('METRICS_NAMESPACE', 'LINEUseCase/MembersCard')
+
+_enabled = METRICS_ENABLED
+_local = threading.local()
+# プロセス内で最初の呼び出しか（コールドスタート判定用）
+_cold_start = True
+_emitter = None
+
+
+class _NullSpan:
+    """計測を行わない場合のspan"""
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """処理区間の処理時間を計測するspan"""
+    __slots__ = ['_recorder', '_name', '_start']
+
+    def __init__(self, recorder, name):
+        self._recorder = recorder
+        self._name = name
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._recorder.add_duration(
+            self._name, (time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class InvocationRecorder:
+    """
+    1回の呼び出しの計測結果を保持するクラス
+    """
+    __slots__ = ['function_name', 'cold_start', 'durations', 'counts',
+                 'consumed_capacity', 'dimensions', 'properties']
+
+    def __init__(self, function_name, cold_start):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        function_name : str
+            関数名（メトリクスのディメンション）
+        cold_start : bool
+            コールドスタートの場合True
+        """
+        self.function_name = function_name
+        self.cold_start = cold_start
+        self.durations = {}
+        self.counts = {}
+        self.consumed_capacity = {}
+        self.dimensions = {'FunctionName': function_name}
+        self.properties = {}
+
+    def add_duration(self, name, duration_ms):
+        """
+        処理区間の処理時間を加算する
+        ※同じ処理区間を複数回実行した場合は合計します
+        """
+        self.durations[name] = self.durations.get(name, 0) + duration_ms
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def add_consumed_capacity(self, table_name, capacity_units):
+        """
+        テーブルの消費キャパシティを加算する
+        """
+        self.consumed_capacity[table_name] = \
+            self.consumed_capacity.get(table_name, 0) + capacity_units
+
+    def to_record(self, timestamp=None):
+        """
+        EMF形式の計測結果を作成する
+
+        Parameters
+        ----------
+        timestamp : float, optional
+            計測時刻のUNIX時間（秒）, by default None（現在時刻）
+
+        Returns
+        -------
+        record : dict
+            EMF形式の計測結果
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        metrics = []
+        record = {}
+        for name, duration_ms in self.durations.items():
+            metric_name = '%s.Duration' % name
+            metrics.append({'Name': metric_name, 'Unit': 'Milliseconds'})
+            record[metric_name] = round(duration_ms, 3)
+        for table_name, capacity_units in self.consumed_capacity.items():
+            metric_name = 'ConsumedCapacity.%s' % table_name
+            metrics.append({'Name': metric_name, 'Unit': 'Count'})
+            record[metric_name] = capacity_units
+        metrics.append({'Name': 'ColdStart', 'Unit': 'Count'})
+        record['ColdStart'] = 1 if self.cold_start else 0
+
+        record['_aws'] = {
+            'Timestamp': int(timestamp * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [sorted(self.dimensions)],
+                'Metrics': metrics,
+            }],
+        }
+        record.update(self.dimensions)
+        record.update(self.properties)
+        record['SpanCounts'] = dict(self.counts)
+        return record
+
+
+def is_enabled():
+    """
+    計測を行うか
+
+    Returns
+    -------
+    enabled : bool
+        計測を行う場合True
+    """
+    return _enabled
+
+
+def set_enabled(enabled):
+    """
+    計測を行うかを切り替える
+    ※DynamoDBの計測は切り替え後に初めて使用するテーブルから反映されます
+
+    Parameters
+    ----------
+    enabled : bool
+        計測を行う場合True
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def set_emitter(emitter):
+    """
+    計測結果の出力先を差し替える
+
+    Parameters
+    ----------
+    emitter : function
+        EMF形式の計測結果（dict）を受け取る関数
+        Noneの場合は標準出力に戻す
+    """
+    global _emitter
+    _emitter = emitter
+
+
+def _current():
+    if not _enabled:
+        return None
+    return getattr(_local, 'recorder', None)
+
+
+def span(name):
+    """
+    処理区間の処理時間を計測する
+
+    Parameters
+    ----------
+    name : str
+        処理区間の名称
+
+    Returns
+    -------
+    span : context manager
+        withで使用するspan
+    """
+    recorder = _current()
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name)
+
+
+def add_consumed_capacity(consumed_capacity):
+    """
+    DynamoDBのレスポンスのConsumedCapacityを加算する
+
+    Parameters
+    ----------
+    consumed_capacity : dict or list
+        レスポンスのConsumedCapacity（バッチ操作の場合はlist）
+    """
+    recorder = _current()
+    if recorder is None or not consumed_capacity:
+        return
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    for capacity in consumed_capacity:
+        recorder.add_consumed_capacity(
+            capacity.get('TableName', ''), capacity.get('CapacityUnits', 0))
+
+
+def set_dimension(name, value):
+    """
+    計測結果のディメンションを設定する
+
+    Parameters
+    ----------
+    name : str
+        ディメンション名
+    value : str
+        値
+    """
+    recorder = _current()
+    if recorder is not None:
+        recorder.dimensions[name] = str(value)
+
+
+def set_property(name, value):
+    """
+    計測結果にメトリクス以外の項目を設定する
+
+    Parameters
+    ----------
+    name : str
+        項目名
+    value : object
+        JSONに変換できる値
+    """
+    recorder = _current()
+    if recorder is not None:
+        recorder.properties[name] = value
+
+
+def _emit(record):
+    if _emitter is not None:
+        _emitter(record)
+        return
+    # EMFはロガーの書式を通さず1行のJSONとして出力する
+    sys.stdout.write(json.dumps(record, separators=(',', ':')) + '\n')
+    sys.stdout.flush()
+
+
+def record_invocation(handler):
+    """
+    ハンドラーの呼び出しごとに計測し、終了時に計測結果を出力するデコレーター
+
+    Parameters
+    ----------
+    handler : function
+        Lambdaのハンドラー
+
+    Returns
+    -------
+    wrapper : function
+        デコレート後のハンドラー
+    """
+    function_name = os.getenv('AWS_LAMBDA_FUNCTION_NAME', handler.__module__)
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _cold_start
+        if not _enabled:
+            _cold_start = False
+            return handler(event, context)
+
+        recorder = InvocationRecorder(function_name, _cold_start)
+        _cold_start = False
+        request_id = getattr(context, 'aws_request_id', None)
+        if request_id:
+            recorder.properties['RequestId'] = request_id
+        _local.recorder = recorder
+        start = time.perf_counter()
+        try:
+            return handler(event, context)
+        finally:
+            recorder.add_duration(
+                'Invocation', (time.perf_counter() - start) * 1000)
+            _local.recorder = None
+            try:
+                _emit(recorder.to_record())
+            except Exception:
+                # 計測結果の出力失敗で処理を失敗させない
+                logger.exception('Failed to emit metrics')
+    return wrapper
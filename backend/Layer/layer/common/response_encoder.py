@@ -0,0 +1,161 @@
+"""
+フロントに返却するレスポンスのJSON変換用モジュール
+※orjsonが導入されている場合はorjsonで変換し、未導入の場合は標準のjsonで変換します
+
+"""
+import json
+from datetime import (date, datetime)
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _encode_decimal(value):
+    """
+    Decimal型を変換する
+
+    Parameters
+    ----------
+    value : Decimal
+        DynamoDBの数値
+
+    Returns
+    -------
+    result : int, float
+        整数の場合int型、小数を含む場合float型
+    """
+    if value == value.to_integral_value():
+        return int(value)
+    return float(value)
+
+
+def _encode_date(value):
+    return value.isoformat()
+
+
+def _encode_set(value):
+    # 出力を安定させるため、並べ替えできる場合は並べ替える
+    try:
+        return sorted(value)
+    except TypeError:
+        return list(value)
+
+
+# 型ごとの変換関数（JSONで表現できない型のみ登録する）
+_ENCODERS = {
+    Decimal: _encode_decimal,
+    datetime: _encode_date,
+    date: _encode_date,
+    set: _encode_set,
+    frozenset: _encode_set,
+}
+
+
+def register(value_type, encoder):
+    """
+    型の変換関数を登録する
+
+    Parameters
+    ----------
+    value_type : type
+        変換対象の型
+    encoder : function
+        値を受け取り、JSONで表現できる値を返す関数
+    """
+    _ENCODERS[value_type] = encoder
+
+
+def _default(value):
+    """
+    JSONで表現できない値を変換する
+
+    Parameters
+    ----------
+    value : object
+        変換する値
+
+    Returns
+    -------
+    result : object
+        JSONで表現できる値
+
+    Raises
+    ------
+    TypeError
+        変換関数が登録されていない型の場合
+    """
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        # サブクラスの場合は登録済みの型から探す
+        for value_type, candidate in _ENCODERS.items():
+            if isinstance(value, value_type):
+                encoder = candidate
+                break
+        else:
+            raise TypeError('Object of type %s is not JSON serializable'
+                            % type(value).__name__)
+    return encoder(value)
+
+
+def _select_fields(obj, fields):
+    """
+    許可された項目のみを抽出する
+
+    Parameters
+    ----------
+    obj : dict, list
+        変換対象のデータ（listの場合は各要素のdictから抽出する）
+    fields : tuple
+        返却を許可する項目名
+
+    Returns
+    -------
+    result : dict, list
+        許可された項目のみのデータ
+    """
+    if isinstance(obj, dict):
+        return {field: obj[field] for field in fields if field in obj}
+    if isinstance(obj, (list, tuple)):
+        return [_select_fields(item, fields) for item in obj]
+    return obj
+
+
+_json_encoder = json.JSONEncoder(
+    default=_default, ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps_json(obj):
+    return _json_encoder.encode(obj)
+
+
+def _dumps_orjson(obj):
+    return orjson.dumps(obj, default=_default).decode('utf-8')
+
+
+# 使用する変換処理
+BACKEND = 'json' if orjson is None else 'orjson'
+_dumps = _dumps_json if orjson is None else _dumps_orjson
+
+
+def encode(obj, fields=None):
+    """
+    データをJSON文字列に変換する
+
+    Parameters
+    ----------
+    obj : object
+        変換するデータ
+    fields : tuple, optional
+        返却を許可する項目名, by default None（すべて返却する）
+
+    Returns
+    -------
+    body : str
+        JSON文字列
+    """
+    if fields is not None:
+        obj = _select_fields(obj, fields)
+    return _dumps(obj)
@@ -0,0 +1,190 @@
+"""
+会員バーコード番号の採番用モジュール
+
+"""
+import hashlib
+import threading
+import logging
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# バーコード本体（チェックデジットを除く12桁）の範囲
+# 先頭桁を0にしないため10^11以上とする
+BARCODE_BODY_MIN = 10**11
+BARCODE_BODY_MAX = 10**12
+# 採番可能な件数
+BARCODE_CAPACITY = BARCODE_BODY_MAX - BARCODE_BODY_MIN
+# カウンターテーブルでのカウンター名
+BARCODE_COUNTER_NAME = 'barcodeNum'
+
+# Feistel構造の片側の値域（10^6 × 10^6 = 10^12）
+_HALF_DOMAIN = 10**6
+_FEISTEL_ROUNDS = 8
+
+
+def ean13_check_digit(body):
+    """
+    EAN-13のチェックデジットを算出する
+
+    Parameters
+    ----------
+    body : int
+        チェックデジットを除く12桁の数値
+
+    Returns
+    -------
+    check_digit : int
+        チェックデジット
+    """
+    digits = str(body).zfill(12)
+    # 左から奇数桁は1倍、偶数桁は3倍して合計する
+    total = sum(int(d) for d in digits[0::2]) + \
+        sum(int(d) for d in digits[1::2]) * 3
+    return (10 - total % 10) % 10
+
+
+class BarcodePermutation:
+    """
+    鍵付きFeistel構造による10^12空間上の置換
+    ※置換は全単射のため、異なる連番からは必ず異なる番号が得られます
+    """
+    __slots__ = ['_key']
+
+    def __init__(self, key):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        key : str
+            置換の鍵
+            発行済みの番号と重複しないよう、運用開始後は変更しないこと
+        """
+        self._key = hashlib.blake2b(key.encode('utf-8'),
+                                    digest_size=32).digest()
+
+    def _round(self, round_num, value):
+        """
+        ラウンド関数
+
+        Parameters
+        ----------
+        round_num : int
+            ラウンド番号
+        value : int
+            入力値
+
+        Returns
+        -------
+        result : int
+            0以上10^6未満の値
+        """
+        digest = hashlib.blake2b(
+            value.to_bytes(4, 'big'), digest_size=8, key=self._key,
+            person=round_num.to_bytes(1, 'big')).digest()
+        return int.from_bytes(digest, 'big') % _HALF_DOMAIN
+
+    def permute(self, value):
+        """
+        0以上10^12未満の値を置換する
+
+        Parameters
+        ----------
+        value : int
+            置換する値
+
+        Returns
+        -------
+        result : int
+            置換後の値
+        """
+        left, right = divmod(value, _HALF_DOMAIN)
+        for round_num in range(_FEISTEL_ROUNDS):
+            left, right = right, \
+                (left + self._round(round_num, right)) % _HALF_DOMAIN
+        return left * _HALF_DOMAIN + right
+
+    def encode(self, serial):
+        """
+        連番をバーコード本体の範囲内の番号に変換する
+        ※範囲外の値はCycle-walkingで範囲内に入るまで置換を繰り返します
+
+        Parameters
+        ----------
+        serial : int
+            0以上BARCODE_CAPACITY未満の連番
+
+        Returns
+        -------
+        body : int
+            BARCODE_BODY_MIN以上BARCODE_BODY_MAX未満の番号
+        """
+        body = self.permute(serial + BARCODE_BODY_MIN)
+        while body < BARCODE_BODY_MIN:
+            body = self.permute(body)
+        return body
+
+
+class MembersCardBarcodeAllocator:
+    """
+    会員バーコード番号の採番クラス
+    ※カウンターテーブルから連番をブロック単位で予約し、
+    　鍵付き置換とチェックデジットで13桁の番号に変換するため、採番した番号同士は重複しません
+    ※旧方式（乱数）で発行済みの番号との重複は考慮しないため、呼び出し元で確認します
+    """
+    __slots__ = ['_counter', '_permutation', '_block_size', '_next', '_end',
+                 '_lock']
+
+    def __init__(self, counter, key, block_size=100):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        counter : MembersCardCounter
+            カウンターのテーブル操作クラス
+        key : str
+            置換の鍵
+        block_size : int, optional
+            1回に予約する連番の件数
+        """
+        self._counter = counter
+        self._permutation = BarcodePermutation(key)
+        self._block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def _next_serial(self):
+        """
+        予約済みブロックから連番を1件取り出す
+        ※ブロックを使い切った場合は新しいブロックを予約します
+
+        Returns
+        -------
+        serial : int
+            連番
+        """
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = self._counter.reserve_block(
+                    BARCODE_COUNTER_NAME, self._block_size, BARCODE_CAPACITY)
+                logger.info('barcode block reserved: %d-%d',
+                            self._next, self._end)
+            serial = self._next
+            self._next += 1
+        return serial
+
+    def allocate(self):
+        """
+        バーコード番号を採番する
+
+        Returns
+        -------
+        barcode_num : int
+            チェックデジット付きの13桁のバーコード番号
+        """
+        body = self._permutation.encode(self._next_serial())
+        return body * 10 + ean13_check_digit(body)
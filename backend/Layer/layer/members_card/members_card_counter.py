@@ -0,0 +1,60 @@
+"""
+MembersCardCounter操作用モジュール
+
+"""
+import os
+
+from aws.dynamodb.base import DynamoDB
+from common import clock
+
+
+class MembersCardCounter(DynamoDB):
+    """MembersCardCounter操作用クラス"""
+    __slots__ = []
+
+    def __init__(self):
+        """初期化メソッド"""
+        table_name = os.getenv('COUNTER_DB', 'MembersCardCounter')
+        super().__init__(table_name)
+
+    def reserve_block(self, counter_name, size, max_value):
+        """
+        カウンターを加算し、連番のブロックを予約する
+        ※条件付き書き込みのため、上限を超える予約は失敗します
+
+        Parameters
+        ----------
+        counter_name : str
+            カウンター名
+        size : int
+            予約する件数
+        max_value : int
+            カウンターの上限値
+
+        Returns
+        -------
+        block : tuple
+            予約した連番の範囲（開始値, 終了値）
+            終了値は範囲に含まない
+
+        """
+        key = {'counterName': counter_name}
+        update_expression = "ADD #value :size SET updatedTime=:updated_time"
+        condition_expression = 'attribute_not_exists(#value) OR #value <= :max_start'  # noqa: E501
+        # valueは予約語のためプレースホルダーを使用する
+        expression_attribute_names = {'#value': 'value'}
+        expression_value = {
+            ':size': size,
+            ':max_start': max_value - size,
+            ':updated_time': clock.format_now()
+        }
+        return_value = "UPDATED_NEW"
+
+        try:
+            response = self._update_item_optional(
+                key, update_expression, condition_expression,
+                expression_attribute_names, expression_value, return_value)
+        except Exception as e:
+            raise e
+        end = int(response['Attributes']['value'])
+        return end - size, end
@@ -0,0 +1,140 @@
+"""
+購入金額・付与ポイントの計算用モジュール
+※金額は円単位の整数で計算し、端数は切り捨てます
+
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+# 税率・ポイント付与率（RATE_DENOMINATOR分率の整数）
+RATE_DENOMINATOR = 100
+RATE_TABLE = {
+    'tax': 10,
+    'point': 5,
+}
+_TAX_RATE = RATE_TABLE['tax']
+_POINT_RATE = RATE_TABLE['point']
+
+# 購入1件の計算結果
+Price = namedtuple('Price', [
+    'unitPrice', 'postage', 'fee', 'discount', 'subtotal', 'tax', 'total',
+    'point'])
+# カート内の1明細の計算結果
+LineItem = namedtuple('LineItem', [
+    'productId', 'quantity', 'unitPrice', 'amount', 'point'])
+
+
+@lru_cache(maxsize=1024)
+def _calculate(unit_price, postage, fee, discount):
+    subtotal = unit_price + postage + fee - discount
+    tax = subtotal * _TAX_RATE // RATE_DENOMINATOR
+    point = unit_price * _POINT_RATE // RATE_DENOMINATOR
+    return Price(unit_price, postage, fee, discount, subtotal, tax,
+                 subtotal + tax, point)
+
+
+def calculate(product, discount=0):
+    """
+    商品1件の購入金額と付与ポイントを計算する
+    ※同じ金額の組み合わせの計算結果は再利用します
+
+    Parameters
+    ----------
+    product : dict
+        unitPrice, postage, feeを持つ商品データ
+    discount : int, optional
+        値引き額, by default 0
+
+    Returns
+    -------
+    price : Price
+        小計（税抜）、消費税、合計、付与ポイント
+        付与ポイントは商品代金（税抜）に対して計算する
+    """
+    return _calculate(int(product['unitPrice']), int(product['postage']),
+                      int(product['fee']), int(discount))
+
+
+def calculate_cart(items, discount=0):
+    """
+    カート内の複数商品の購入金額と付与ポイントを計算する
+    ※商品代金は明細ごとの金額（単価×数量）の合計、送料・手数料は1回の購入につき
+    　カート内の最大額とし、消費税は合計に対して1度だけ計算します
+    ※付与ポイントは明細ごとに計算して合算します（同じ商品を個別に購入した場合と同じポイント）
+
+    Parameters
+    ----------
+    items : list
+        (商品データ, 数量)のリスト
+    discount : int, optional
+        値引き額, by default 0
+
+    Returns
+    -------
+    lines : list
+        明細ごとの計算結果（LineItem）のリスト
+    price : Price
+        カート全体の計算結果
+    """
+    lines = []
+    for product, quantity in items:
+        quantity = int(quantity)
+        unit_price = int(product['unitPrice'])
+        lines.append(LineItem(
+            int(product['productId']), quantity, unit_price,
+            unit_price * quantity,
+            unit_price * _POINT_RATE // RATE_DENOMINATOR * quantity))
+
+    postage = max((int(product['postage']) for product, _ in items),
+                  default=0)
+    fee = max((int(product['fee']) for product, _ in items), default=0)
+    amount = sum(line.amount for line in lines)
+    subtotal = amount + postage + fee - int(discount)
+    tax = subtotal * _TAX_RATE // RATE_DENOMINATOR
+    price = Price(amount, postage, fee, int(discount), subtotal, tax,
+                  subtotal + tax, sum(line.point for line in lines))
+    return lines, price
+
+
+def calculate_batch(unit_prices, postages, fees, discounts=None):
+    """
+    複数件の購入金額と付与ポイントを列単位で計算する
+    ※集計・バックフィル処理用
+
+    Parameters
+    ----------
+    unit_prices : list
+        商品代金のリスト
+    postages : list
+        送料のリスト
+    fees : list
+        手数料のリスト
+    discounts : list, optional
+        値引き額のリスト, by default None（すべて0）
+
+    Returns
+    -------
+    result : dict
+        Priceの項目名をキーとした、各件の計算結果のリスト
+    """
+    unit_prices = [int(v) for v in unit_prices]
+    if discounts is None:
+        discounts = [0] * len(unit_prices)
+    subtotals = [
+        unit_price + int(postage) + int(fee) - int(discount)
+        for unit_price, postage, fee, discount
+        in zip(unit_prices, postages, fees, discounts)
+    ]
+    taxes = [subtotal * _TAX_RATE // RATE_DENOMINATOR
+             for subtotal in subtotals]
+    return {
+        'unitPrice': unit_prices,
+        'postage': [int(v) for v in postages],
+        'fee': [int(v) for v in fees],
+        'discount': [int(v) for v in discounts],
+        'subtotal': subtotals,
+        'tax': taxes,
+        'total': [subtotal + tax for subtotal, tax in zip(subtotals, taxes)],
+        'point': [unit_price * _POINT_RATE // RATE_DENOMINATOR
+                  for unit_price in unit_prices],
+    }
@@ -0,0 +1,149 @@
+"""
+商品マスタのスナップショット用モジュール
+
+"""
+import copy
+import random
+import threading
+import time
+import logging
+
+# ログ出力の設定
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+
+class MembersCardProductCatalog:
+    """
+    商品マスタのインメモリスナップショット
+    ※コンテナごとに1度だけ全件を読み込み、有効期限切れ後の参照時に再読み込みします
+    """
+    __slots__ = ['_product_info', '_ttl', '_products', '_product_ids',
+                 '_expires_at', '_lock']
+
+    def __init__(self, product_info, ttl=600):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        product_info : MembersCardProductInfo
+            商品マスタのテーブル操作クラス
+        ttl : float, optional
+            スナップショットの有効秒数
+        """
+        self._product_info = product_info
+        self._ttl = ttl
+        self._products = {}
+        self._product_ids = []
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        商品マスタを全件読み込み、スナップショットを置き換える
+        """
+        products = {
+            int(item['productId']): item
+            for item in self._product_info.scan_iter()
+        }
+        with self._lock:
+            self._products = products
+            self._product_ids = sorted(products)
+            self._expires_at = time.monotonic() + self._ttl
+        logger.info('product catalog loaded: %d items', len(products))
+
+    def invalidate(self):
+        """
+        スナップショットを無効にし、次回参照時に再読み込みさせる
+        """
+        with self._lock:
+            self._expires_at = 0
+
+    def _ensure_loaded(self):
+        """
+        スナップショットが未読み込みまたは有効期限切れの場合に読み込む
+        """
+        if time.monotonic() >= self._expires_at:
+            self.refresh()
+
+    def product_ids(self):
+        """
+        商品IDのリストを取得する
+
+        Returns
+        -------
+        product_ids : list
+            昇順の商品IDのリスト
+        """
+        self._ensure_loaded()
+        return list(self._product_ids)
+
+    def choice(self):
+        """
+        商品をランダムに1件取得する
+
+        Returns
+        -------
+        item : dict
+            商品情報
+        """
+        self._ensure_loaded()
+        with self._lock:
+            item = self._products[random.choice(self._product_ids)]
+        return copy.deepcopy(item)
+
+    def get_item(self, product_id):
+        """
+        商品IDから商品情報を取得する
+
+        Parameters
+        ----------
+        product_id : int
+            商品ID
+
+        Returns
+        -------
+        item : dict
+            商品情報
+            存在しない場合は空のdict
+        """
+        self._ensure_loaded()
+        item = self._products.get(int(product_id))
+        return copy.deepcopy(item) if item else {}
+
+    def get_items(self, product_ids):
+        """
+        複数の商品IDから商品情報を一括取得する
+        ※スナップショットに無い商品（読み込み後に追加された商品）のみ、
+        　1回のBatchGetItemでテーブルから取得します
+
+        Parameters
+        ----------
+        product_ids : list
+            商品IDのリスト
+
+        Returns
+        -------
+        items : dict
+            商品IDをキーとした商品情報
+            存在しない商品IDは含まない
+        """
+        self._ensure_loaded()
+        items = {}
+        missing_ids = []
+        for product_id in {int(product_id) for product_id in product_ids}:
+            item = self._products.get(product_id)
+            if item:
+                items[product_id] = copy.deepcopy(item)
+            else:
+                missing_ids.append(product_id)
+
+        if missing_ids:
+            try:
+                fetched = self._product_info.batch_get_items(missing_ids)
+            except Exception as e:
+                raise e
+            for item in fetched:
+                items[int(item['productId'])] = item
+        return items
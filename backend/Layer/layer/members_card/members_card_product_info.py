@@ -1,59 +1,139 @@
-"""
-MembersCardProductInfo操作用モジュール
-
-"""
-import os
-
-
-from aws.dynamodb.base import DynamoDB
-
-
-class MembersCardProductInfo(DynamoDB):
-    """MembersCardProductInfo操作用クラス"""
-    __slots__ = ['_table']
-
-    def __init__(self):
-        """初期化メソッド"""
-        table_name = os.getenv('PRODUCT_INFO_DB',
-                               'MembersCardProductInfo')
-        super().__init__(table_name)
-        self._table = self._db.Table(table_name)
-
-    def get_item(self, product_id):
-        """
-        データ取得
-
-        Parameters
-        ----------
-        product_id : int
-            商品ID
-
-        Returns
-        -------
-        item : dict
-            商品情報
-
-        """
-        key = {'productId': product_id}
-
-        try:
-            item = self._get_item(key)
-        except Exception as e:
-            raise e
-        return item
-
-    def get_table_size(self):
-        """
-        テーブルのアイテム数を取得する
-
-        Returns
-        -------
-        count : int
-            アイテム数
-
-        """
-        try:
-            count = self._get_table_size()
-        except Exception as e:
-            raise e
-        return count
+"""
+MembersCardProductInfo操作用モジュール
+
+"""
+import os
+
+
+from aws.dynamodb.base import DynamoDB
+from aws.dynamodb.schema import AttributeSchema
+
+
+# clientで取得する場合の属性定義
+PRODUCT_INFO_SCHEMA = AttributeSchema(
+    {'productId': 'N'},
+    {
+        'unitPrice': 'N',
+        'postage': 'N',
+        'fee': 'N',
+        'imgUrl': 'S',
+        'productName': {'ja': 'S'},
+    },
+)
+
+
+class MembersCardProductInfo(DynamoDB):
+    """MembersCardProductInfo操作用クラス"""
+    __slots__ = []
+
+    def __init__(self):
+        """初期化メソッド"""
+        table_name = os.getenv('PRODUCT_INFO_DB',
+                               'MembersCardProductInfo')
+        super().__init__(table_name)
+        self._set_attribute_schema(PRODUCT_INFO_SCHEMA)
+        # 商品マスタは更新頻度が低いため、ウォームコンテナ内でキャッシュする
+        cache_ttl = float(os.getenv('PRODUCT_INFO_CACHE_TTL', 300))
+        if cache_ttl > 0:
+            self._enable_cache(('productId',), cache_ttl, negative_ttl=10)
+
+    def get_item(self, product_id):
+        """
+        データ取得
+
+        Parameters
+        ----------
+        product_id : int
+            商品ID
+
+        Returns
+        -------
+        item : dict
+            商品情報
+
+        """
+        key = {'productId': product_id}
+
+        try:
+            item = self._get_item(key)
+        except Exception as e:
+            raise e
+        return item
+
+    def batch_get_items(self, product_ids):
+        """
+        複数商品のデータを一括取得する
+
+        Parameters
+        ----------
+        product_ids : list
+            商品IDのリスト
+
+        Returns
+        -------
+        items : list
+            商品情報のリスト（順不同）
+
+        """
+        keys = [{'productId': product_id} for product_id in product_ids]
+
+        try:
+            items = self._batch_get_items(keys)
+        except Exception as e:
+            raise e
+        return items
+
+    def batch_put_items(self, items):
+        """
+        複数商品のデータを一括登録する
+
+        Parameters
+        ----------
+        items : list
+            商品情報のリスト
+
+        Returns
+        -------
+        count : int
+            登録件数
+
+        """
+        try:
+            count = self._batch_write_items(put_items=items,
+                                            key_names=('productId',))
+        except Exception as e:
+            raise e
+        return count
+
+    def get_table_size(self):
+        """
+        テーブルのアイテム数を取得する
+
+        Returns
+        -------
+        count : int
+            アイテム数
+
+        """
+        try:
+            count = self._get_table_size()
+        except Exception as e:
+            raise e
+        return count
+
+    def scan_iter(self, page_size=None):
+        """
+        全商品データをアイテム単位で返すジェネレータ
+
+        Parameters
+        ----------
+        page_size : int, optional
+            1リクエストあたりの評価件数, by default None
+
+        Yields
+        -------
+        item : dict
+            商品情報
+
+        """
+        yield from self._scan_iter(page_size=page_size)
@@ -1,142 +1,301 @@
-"""
-MembersCardUserInfo操作用モジュール
-
-"""
-import os
-from datetime import datetime
-from dateutil.tz import gettz
-
-from aws.dynamodb.base import DynamoDB
-
-
-class MembersCardUserInfo(DynamoDB):
-    """MembersCardUserInfo操作用クラス"""
-    __slots__ = ['_table']
-
-    def __init__(self):
-        """初期化メソッド"""
-        table_name = os.getenv('MEMBERS_INFO_DB', 'MembersCardUserInfo')
-        super().__init__(table_name)
-        self._table = self._db.Table(table_name)
-
-    def put_item(self, user_id, barcode_num, expiration_date, point):
-        """
-        データ登録
-
-        Parameters
-        ----------
-        user_id : str
-            ユーザーID
-        barcode_num : int
-            バーコード番号
-        expiration_date : str
-            ポイント期限日
-        point : int
-            ポイント
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        item = {
-            'userId': user_id,
-            'barcodeNum': barcode_num,
-            'pointExpirationDate': expiration_date,
-            'point': point,
-            'createdTime': datetime.now(
-                gettz('Asia/Tokyo')).strftime("%Y/%m/%d %H:%M:%S"),
-            'updatedTime': datetime.now(
-                gettz('Asia/Tokyo')).strftime("%Y/%m/%d %H:%M:%S"),
-        }
-
-        try:
-            response = self._put_item(item)
-        except Exception as e:
-            raise e
-        return response
-
-    def update_point_expiration_date(self, user_id, point, expiration_date):
-        """
-        ポイントと期限日を更新する
-
-        Parameters
-        ----------
-        user_id : str
-            ユーザーID
-        point : int
-            ポイント
-        expiration_date : str
-            ポイント期限日
-
-        Returns
-        -------
-        response : dict
-            レスポンス情報
-
-        """
-        key = {'userId': user_id}
-        expression = "set point=:point, pointExpirationDate=:expiration_date, updatedTime=:updated_time"  # noqa: E501
-        expression_value = {
-            ':point': point,
-            ':expiration_date': expiration_date,
-            ':updated_time': datetime.now(
-                gettz('Asia/Tokyo')).strftime("%Y/%m/%d %H:%M:%S")
-        }
-        return_value = "UPDATED_NEW"
-
-        try:
-            response = self._update_item(key, expression,
-                                         expression_value, return_value)
-        except Exception as e:
-            raise e
-        return response
-
-    def get_item(self, user_id):
-        """
-        データ取得
-
-        Parameters
-        ----------
-        user_id : str
-            ユーザーID
-
-        Returns
-        -------
-        item : dict
-            会員ユーザー情報
-
-        """
-        key = {'userId': user_id}
-
-        try:
-            item = self._get_item(key)
-        except Exception as e:
-            raise e
-        return item
-
-    def query_index_barcode_num(self, barcode_num):
-        """
-        queryメソッドでbarcodeNum-indexよりデータ取得
-
-        Parameters
-        ----------
-        barcode_num : int
-            バーコード番号
-
-        Returns
-        -------
-        items : list
-            バーコード番号のリスト
-
-        """
-        index = 'barcodeNum-index'
-        expression = 'barcodeNum = :barcode_num'
-        expression_value = {':barcode_num': barcode_num}
-
-        try:
-            items = self._query_index(index, expression, expression_value)
-        except Exception as e:
-            raise e
-        return items
+"""
+MembersCardUserInfo操作用モジュール
+
+"""
+import os
+
+from aws.dynamodb.base import DynamoDB
+from common import clock
+from aws.dynamodb.schema import AttributeSchema
+
+
+# clientで取得する場合の属性定義
+USER_INFO_SCHEMA = AttributeSchema(
+    {'userId': 'S'},
+    {
+        'barcodeNum': 'N',
+        'point': 'N',
+        'pointExpirationDate': 'S',
+        'createdTime': 'S',
+        'updatedTime': 'S',
+    },
+)
+
+
+class MembersCardUserInfo(DynamoDB):
+    """MembersCardUserInfo操作用クラス"""
+    __slots__ = []
+
+    def __init__(self):
+        """初期化メソッド"""
+        table_name = os.getenv('MEMBERS_INFO_DB', 'MembersCardUserInfo')
+        super().__init__(table_name)
+        self._set_attribute_schema(USER_INFO_SCHEMA)
+
+    def put_item(self, user_id, barcode_num, expiration_date, point):
+        """
+        データ登録
+
+        Parameters
+        ----------
+        user_id : str
+            ユーザーID
+        barcode_num : int
+            バーコード番号
+        expiration_date : str
+            ポイント期限日
+        point : int
+            ポイント
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        item = {
+            'userId': user_id,
+            'barcodeNum': barcode_num,
+            'pointExpirationDate': expiration_date,
+            'point': point,
+            'createdTime': clock.format_now(),
+            'updatedTime': clock.format_now(),
+        }
+
+        try:
+            response = self._put_item(item)
+        except Exception as e:
+            raise e
+        return response
+
+    def update_point_expiration_date(self, user_id, point, expiration_date):
+        """
+        ポイントと期限日を更新する
+
+        Parameters
+        ----------
+        user_id : str
+            ユーザーID
+        point : int
+            ポイント
+        expiration_date : str
+            ポイント期限日
+
+        Returns
+        -------
+        response : dict
+            レスポンス情報
+
+        """
+        key = {'userId': user_id}
+        expression = "set point=:point, pointExpirationDate=:expiration_date, updatedTime=:updated_time"  # noqa: E501
+        expression_value = {
+            ':point': point,
+            ':expiration_date': expiration_date,
+            ':updated_time': clock.format_now()
+        }
+        return_value = "UPDATED_NEW"
+
+        try:
+            response = self._update_item(key, expression,
+                                         expression_value, return_value)
+        except Exception as e:
+            raise e
+        return response
+
+    def add_points(self, user_id, point, expiration_date):
+        """
+        ポイントを加算し、期限日を更新する
+        ※ADD式で加算するため、読み込み無しの1リクエストで同時購入時も正しく加算されます
+
+        Parameters
+        ----------
+        user_id : str
+            ユーザーID
+        point : int
+            加算するポイント
+        expiration_date : str
+            ポイント期限日
+
+        Returns
+        -------
+        item : dict
+            更新後の会員ユーザー情報
+
+        """
+        key = {'userId': user_id}
+        update_expression = "ADD #point :point SET pointExpirationDate=:expiration_date, updatedTime=:updated_time"  # noqa: E501
+        # 会員データが存在しない場合は新規作成せずエラーとする
+        condition_expression = 'attribute_exists(userId)'
+        expression_attribute_names = {'#point': 'point'}
+        expression_value = {
+            ':point': point,
+            ':expiration_date': expiration_date,
+            ':updated_time': clock.format_now()
+        }
+        return_value = "ALL_NEW"
+
+        try:
+            response = self._update_item_optional(
+                key, update_expression, condition_expression,
+                expression_attribute_names, expression_value, return_value)
+        except Exception as e:
+            raise e
+        return response['Attributes']
+
+    def get_item(self, user_id):
+        """
+        データ取得
+
+        Parameters
+        ----------
+        user_id : str
+            ユーザーID
+
+        Returns
+        -------
+        item : dict
+            会員ユーザー情報
+
+        """
+        key = {'userId': user_id}
+
+        try:
+            item = self._get_item(key)
+        except Exception as e:
+            raise e
+        return item
+
+    def batch_get_items(self, user_ids):
+        """
+        複数ユーザーのデータを一括取得する
+
+        Parameters
+        ----------
+        user_ids : list
+            ユーザーIDのリスト
+
+        Returns
+        -------
+        items : list
+            会員ユーザー情報のリスト（順不同）
+
+        """
+        keys = [{'userId': user_id} for user_id in user_ids]
+
+        try:
+            items = self._batch_get_items(keys)
+        except Exception as e:
+            raise e
+        return items
+
+    def batch_put_items(self, items):
+        """
+        複数ユーザーのデータを一括登録する
+
+        Parameters
+        ----------
+        items : list
+            会員ユーザー情報のリスト
+            （userId, barcodeNum, pointExpirationDate, pointを含むdict）
+
+        Returns
+        -------
+        count : int
+            登録件数
+
+        """
+        now = clock.format_now()
+        put_items = [{
+            'userId': item['userId'],
+            'barcodeNum': item['barcodeNum'],
+            'pointExpirationDate': item['pointExpirationDate'],
+            'point': item['point'],
+            'createdTime': item.get('createdTime', now),
+            'updatedTime': now,
+        } for item in items]
+
+        try:
+            count = self._batch_write_items(put_items=put_items,
+                                            key_names=('userId',))
+        except Exception as e:
+            raise e
+        return count
+
+    def query_index_barcode_num(self, barcode_num):
+        """
+        queryメソッドでbarcodeNum-indexよりデータ取得
+        ※採番したバーコード番号と旧方式（乱数）で発行済みの番号との重複確認に使用します
+
+        Parameters
+        ----------
+        barcode_num : int
+            バーコード番号
+
+        Returns
+        -------
+        items : list
+            バーコード番号のリスト
+
+        """
+        index = 'barcodeNum-index'
+        expression = 'barcodeNum = :barcode_num'
+        expression_value = {':barcode_num': barcode_num}
+
+        try:
+            items = self._query_index(index, expression, expression_value)
+        except Exception as e:
+            raise e
+        return items
+
+    def scan_pages(self, page_size=None, limit=None,
+                   exclusive_start_key=None):
+        """
+        全会員データをページ単位で返すジェネレータ
+        ※バッチ処理で全会員を一定のメモリ使用量で処理するために使用します
+
+        Parameters
+        ----------
+        page_size : int, optional
+            1リクエストあたりの評価件数, by default None
+        limit : int, optional
+            取得する最大件数, by default None
+        exclusive_start_key : dict, optional
+            再開用カーソル（前回返却したカーソル）, by default None
+
+        Yields
+        -------
+        page : tuple
+            (会員ユーザー情報のリスト, 次ページ取得用カーソル)
+            カーソルがNoneの場合は最終ページ
+
+        """
+        yield from self._scan_pages(page_size=page_size, limit=limit,
+                                    exclusive_start_key=exclusive_start_key)
+
+    def parallel_scan(self, total_segments, max_workers=None, page_size=None,
+                      cursors=None):
+        """
+        全会員データを分割して並列にscanするジェネレータ
+
+        Parameters
+        ----------
+        total_segments : int
+            分割するセグメント数
+        max_workers : int, optional
+            ワーカースレッド数, by default None（セグメント数）
+        page_size : int, optional
+            1リクエストあたりの評価件数, by default None
+        cursors : dict, optional
+            セグメントごとの再開用カーソル, by default None
+
+        Yields
+        -------
+        item : dict
+            会員ユーザー情報
+
+        """
+        yield from self._parallel_scan(total_segments,
+                                       max_workers=max_workers,
+                                       page_size=page_size,
+                                       cursors=cursors)
@@ -1,18 +1,113 @@
-from validation.param_check import ParamCheck
-
-
-class MembersCardParamCheck(ParamCheck):
-    def __init__(self, params):
-        self.mode = params['mode'] if 'mode' in params else None
-
-        self.error_msg = []
-
-    def check_api_members_card(self):
-        self.check_mode()
-
-        return self.error_msg
-
-    def check_mode(self):
-        if error := self.check_required(self.mode, 'mode'):
-            self.error_msg.append(error)
-            return
+from validation.param_check import ParamCheck
+
+# カートに指定できる最大明細数
+# （電子レシートのフレックスメッセージが1バブルの上限（30KB）に収まる件数とする）
+CART_MAX_ITEMS = 50
+# 1商品に指定できる最大数量（同じ商品の明細は数量を合算して判定する）
+CART_MAX_QUANTITY = 99
+# 冪等キーの最大文字数
+IDEMPOTENCY_KEY_MAX_LENGTH = 128
+
+
+def _to_int(value):
+    """
+    int型または10進数の数字のみの文字列をintに変換する
+    ※str.isnumericは'½'や'①'も数字と判定し、int()で変換できないため使用しません
+
+    Parameters
+    ----------
+    value : obj
+        変換する値
+
+    Returns
+    -------
+    int
+        変換後の値（変換できない場合None）
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
+    return None
+
+
+class MembersCardParamCheck(ParamCheck):
+    def __init__(self, params):
+        self.mode = params['mode'] if 'mode' in params else None
+        self.items = params['items'] if 'items' in params else None
+        self.idempotency_key = params['idempotencyKey'] \
+            if 'idempotencyKey' in params else None
+
+        self.error_msg = []
+
+    def check_api_members_card(self):
+        self.check_mode()
+        if self.mode == 'cart':
+            self.check_items()
+        if self.idempotency_key is not None:
+            self.check_idempotency_key()
+
+        return self.error_msg
+
+    def check_mode(self):
+        if error := self.check_required(self.mode, 'mode'):
+            self.error_msg.append(error)
+            return
+
+    def check_items(self):
+        if error := self.check_required(self.items, 'items'):
+            self.error_msg.append(error)
+            return
+        if not isinstance(self.items, list) or not self.items:
+            self.error_msg.append('形式エラー:items')
+            return
+        if len(self.items) > CART_MAX_ITEMS:
+            self.error_msg.append(
+                f'件数エラー（最大件数[{CART_MAX_ITEMS}]超過）:items')
+            return
+
+        # 検証済みの(商品ID, 数量)のリスト
+        lines = []
+        for index, item in enumerate(self.items):
+            column_name = f'items[{index}]'
+            if not isinstance(item, dict):
+                self.error_msg.append('形式エラー:' + column_name)
+                continue
+            values = {}
+            for key in ('productId', 'quantity'):
+                value = item.get(key)
+                name = f'{column_name}.{key}'
+                if error := self.check_required(value, name):
+                    self.error_msg.append(error)
+                elif (number := _to_int(value)) is None:
+                    self.error_msg.append('int型チェックエラー:' + name)
+                elif key == 'quantity' and \
+                        not 1 <= number <= CART_MAX_QUANTITY:
+                    self.error_msg.append(
+                        f'範囲エラー（1～{CART_MAX_QUANTITY}）:{name}')
+                else:
+                    values[key] = number
+            if len(values) == 2:
+                lines.append((values['productId'], values['quantity']))
+        if self.error_msg:
+            return
+
+        # 同じ商品の明細を合算した数量も上限を超えないこと
+        quantities = {}
+        for product_id, quantity in lines:
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        for product_id, quantity in quantities.items():
+            if quantity > CART_MAX_QUANTITY:
+                self.error_msg.append(
+                    f'範囲エラー（合計1～{CART_MAX_QUANTITY}）:'
+                    f'items[productId={product_id}].quantity')
+
+    def check_idempotency_key(self):
+        if not isinstance(self.idempotency_key, str):
+            self.error_msg.append('形式エラー:idempotencyKey')
+            return
+        if error := self.check_length(self.idempotency_key, 'idempotencyKey',
+                                      1, IDEMPOTENCY_KEY_MAX_LENGTH):
+            self.error_msg.append(error)
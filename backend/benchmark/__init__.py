@@ -0,0 +1,7 @@
+"""
+会員証アプリのベンチマーク
+
+backendフォルダで`python -m benchmark.<モジュール名>`の形式で実行する
+すべてのベンチマークを実行し、計測結果をJSONファイルに出力する場合は`python -m benchmark.run`を実行する
+init/buyの比率を指定した負荷試験は`python -m benchmark.load_test`を実行する
+"""
@@ -0,0 +1,48 @@
+"""
+バーコード採番のベンチマーク
+
+"""
+from benchmark.common import (setup_path, measure, print_result)
+
+setup_path()
+
+from members_card.members_card_barcode import (  # noqa: E402
+    BarcodePermutation, MembersCardBarcodeAllocator, ean13_check_digit)
+
+
+class LocalCounter:
+    """カウンターテーブルの代わりにメモリ上で連番を予約するクラス"""
+
+    def __init__(self):
+        self.value = 0
+        self.reserved = 0
+
+    def reserve_block(self, counter_name, size, max_value):
+        self.value += size
+        self.reserved += 1
+        return self.value - size, self.value
+
+
+def main():
+    permutation = BarcodePermutation('benchmark')
+    print_result('ean13_check_digit',
+                 measure(lambda: ean13_check_digit(123456789012)))
+    print_result('BarcodePermutation.encode',
+                 measure(lambda: permutation.encode(123456)))
+
+    counter = LocalCounter()
+    allocator = MembersCardBarcodeAllocator(counter, 'benchmark')
+    print_result('MembersCardBarcodeAllocator.allocate',
+                 measure(allocator.allocate, number=10000))
+
+    # 採番した番号が13桁かつ重複しないことを確認する
+    count = 100000
+    barcodes = {allocator.allocate() for _ in range(count)}
+    assert len(barcodes) == count
+    assert all(10**12 <= barcode < 10**13 for barcode in barcodes)
+    print('unique barcodes: %d, counter reservations: %d' % (
+        len(barcodes), counter.reserved))
+
+
+if __name__ == '__main__':
+    main()
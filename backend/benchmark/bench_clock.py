@@ -0,0 +1,44 @@
+"""
+現在日時の書式変換のベンチマーク
+※1リクエストで更新日時を4回取得する場合を、従来の処理とリクエスト単位のスナップショットで比較する
+
+"""
+from datetime import datetime
+
+from benchmark.common import (setup_path, measure, print_result)
+
+setup_path()
+
+from dateutil.tz import gettz  # noqa: E402
+
+from common import clock  # noqa: E402
+
+# 1リクエストあたりの日時取得回数（put_item・add_points・レシート等）
+CALLS_PER_REQUEST = 4
+
+
+def per_call():
+    for _ in range(CALLS_PER_REQUEST):
+        datetime.now(gettz('Asia/Tokyo')).strftime('%Y/%m/%d %H:%M:%S')
+
+
+@clock.request_scoped
+def per_request():
+    for _ in range(CALLS_PER_REQUEST):
+        clock.format_now()
+
+
+def main():
+    print_result('datetime.now(gettz()).strftime x%d' % CALLS_PER_REQUEST,
+                 measure(per_call, number=10000))
+    print_result('clock snapshot x%d' % CALLS_PER_REQUEST,
+                 measure(per_request, number=10000))
+
+    # 時計を差し替えた場合は固定の日時を返す
+    clock.set_clock(clock.FixedClock(datetime(2021, 4, 1, 12, 0, 0)))
+    assert clock.format_now() == '2021/04/01 12:00:00'
+    clock.set_clock(None)
+
+
+if __name__ == '__main__':
+    main()
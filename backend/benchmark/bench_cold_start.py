@@ -0,0 +1,118 @@
+"""
+コールドスタート時のimport時間の計測と予算チェック
+※python -X importtimeで各Lambdaのハンドラーモジュールを新しいプロセスでimportし、
+　import時間が予算を超えた場合や、遅延読み込みの対象モジュールが読み込まれた場合は
+　終了コード1で終了します
+
+実行例
+    python -m benchmark.bench_cold_start
+    python -m benchmark.bench_cold_start --top 20 --budget-scale 2
+
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmark.common import (APP_DIR, LAYER_DIR)
+
+# ハンドラーモジュールごとのimport時間の予算（ミリ秒）
+IMPORT_BUDGET_MS = {
+    'app': 100,
+    'receipt_worker': 100,
+}
+# ハンドラーのimport時には読み込まないモジュール（使用時に読み込む）
+DEFERRED_MODULES = ('boto3', 'botocore', 'requests', 'urllib3', 'linebot',
+                    'cryptography')
+
+
+def run_import(module_name):
+    """
+    新しいプロセスでモジュールをimportし、import時間を取得する
+
+    Parameters
+    ----------
+    module_name : str
+        importするモジュール名
+
+    Returns
+    -------
+    timings : list
+        (自身の時間(us), 累計時間(us), モジュール名)のリスト
+    loaded : list
+        import後に読み込まれていた遅延読み込み対象のモジュール
+    """
+    code = (
+        'import sys\n'
+        'import {module}\n'
+        'print(",".join(sorted({{m.split(".")[0] for m in sys.modules}}'
+        ' & set({deferred!r}))))\n'
+    ).format(module=module_name, deferred=DEFERRED_MODULES)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([APP_DIR, LAYER_DIR])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, env=env, check=True)
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split(
+            '|', 2)
+        # 先頭の区切りの空白を除き、ネストの深さをインデントとして残す
+        timings.append((int(self_us), int(cumulative_us), name.rstrip()[1:]))
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=10,
+                        help='表示する上位モジュール数')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='計測回数（最小値で判定する）')
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help='予算の倍率（計測環境の性能差の調整用）')
+    args = parser.parse_args()
+
+    failed = False
+    for module_name, budget_ms in IMPORT_BUDGET_MS.items():
+        best = None
+        for _ in range(args.repeat):
+            timings, loaded = run_import(module_name)
+            # importtimeは子モジュールを親より先に出力するため、
+            # 直前の最上位（インデント無し）の行からハンドラーの行までを対象とする
+            start = 0
+            for index, (_, cumulative, name) in enumerate(timings):
+                if name.startswith(' '):
+                    continue
+                if name == module_name:
+                    break
+                start = index + 1
+            total_us = cumulative
+            if best is None or total_us < best[0]:
+                best = (total_us, timings[start:index + 1], loaded)
+        total_us, timings, loaded = best
+        limit_ms = budget_ms * args.budget_scale
+
+        print('%s: %.1f ms (budget %.1f ms)' % (
+            module_name, total_us / 1000, limit_ms))
+        for self_us, cumulative_us, name in sorted(
+                timings, key=lambda t: t[1], reverse=True)[:args.top]:
+            print('  %10.1f ms %10.1f ms  %s' % (
+                cumulative_us / 1000, self_us / 1000, name.strip()))
+
+        if total_us / 1000 > limit_ms:
+            print('  NG: import time exceeds the budget')
+            failed = True
+        if loaded:
+            print('  NG: deferred modules loaded at import: %s'
+                  % ', '.join(loaded))
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+get_itemのデシリアライズ処理のベンチマーク
+※resource（TypeDeserializerでDecimal型に変換）とclient（属性定義で直接変換）を比較する
+
+"""
+import copy
+import json
+import os
+
+from benchmark.common import (BACKEND_DIR, setup_path, measure, print_result)
+
+setup_path()
+
+import boto3  # noqa: E402
+from boto3.dynamodb.types import TypeSerializer  # noqa: E402
+from botocore.stub import Stubber  # noqa: E402
+
+from members_card.members_card_product_info import PRODUCT_INFO_SCHEMA  # noqa: E402,E501
+
+TABLE_NAME = 'MembersCardProductInfo'
+
+
+def load_product():
+    """
+    サンプル商品データをワイヤー形式で読み込む
+
+    Returns
+    -------
+    item : dict
+        ワイヤー形式の商品データ
+    """
+    path = os.path.join(BACKEND_DIR, 'APP', 'dynamodb_data',
+                        'product_master_id_1.json')
+    with open(path, encoding='utf-8') as f:
+        product = json.load(f)
+    serializer = TypeSerializer()
+    return {k: serializer.serialize(v) for k, v in product.items()}
+
+
+def main():
+    wire_item = load_product()
+    resource = boto3.resource(
+        'dynamodb', region_name='ap-northeast-1',
+        aws_access_key_id='dummy', aws_secret_access_key='dummy')
+    table = resource.Table(TABLE_NAME)
+    client = boto3.client(
+        'dynamodb', region_name='ap-northeast-1',
+        aws_access_key_id='dummy', aws_secret_access_key='dummy')
+    number = 2000
+    # 計測回数分の応答を登録する（resourceは応答を書き換えるため毎回コピーする）
+    for stub_client in (resource.meta.client, client):
+        stubber = Stubber(stub_client)
+        for _ in range(number * 5):
+            stubber.add_response('get_item',
+                                 {'Item': copy.deepcopy(wire_item)})
+        stubber.activate()
+
+    key = {'productId': 1}
+    print_result('resource Table.get_item', measure(
+        lambda: table.get_item(Key=key)['Item'], number=number))
+    print_result('client get_item + AttributeSchema', measure(
+        lambda: PRODUCT_INFO_SCHEMA.decode_item(client.get_item(
+            TableName=TABLE_NAME,
+            Key=PRODUCT_INFO_SCHEMA.encode_key(key))['Item']),
+        number=number))
+
+    # デシリアライズ処理のみの比較
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    print_result('TypeDeserializer only', measure(
+        lambda: {k: deserializer.deserialize(v)
+                 for k, v in wire_item.items()}, number=20000))
+    print_result('AttributeSchema.decode_item only', measure(
+        lambda: PRODUCT_INFO_SCHEMA.decode_item(wire_item), number=20000))
+
+
+if __name__ == '__main__':
+    main()
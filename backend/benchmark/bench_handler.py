@@ -0,0 +1,56 @@
+"""
+app.lambda_handlerのベンチマーク
+※DynamoDBはInMemoryDynamoDB、LINEのAPIはスタブを使用し、
+　新規ユーザーの初期表示・既存ユーザーの初期表示・購入・カート購入の1リクエストあたりの処理時間を計測する
+
+"""
+import itertools
+
+from benchmark.common import (measure, print_result)
+from benchmark.local_app import setup_local_app
+
+CART_ITEMS = [{'productId': 1, 'quantity': 2}, {'productId': 2, 'quantity': 1}]
+
+
+def main():
+    local_app = setup_local_app(seed=0)
+    sequence = itertools.count()
+
+    def init_new_user():
+        response = local_app.call('init', 'new-user-%d' % next(sequence))
+        assert response['statusCode'] == 200, response
+
+    def init_existing_user():
+        response = local_app.call('init', 'existing-user')
+        assert response['statusCode'] == 200, response
+
+    def buy():
+        response = local_app.call('buy', 'existing-user')
+        assert response['statusCode'] == 200, response
+
+    def cart():
+        response = local_app.call('cart', 'existing-user', items=CART_ITEMS)
+        assert response['statusCode'] == 200, response
+
+    def buy_idempotent_retry():
+        response = local_app.call('buy', 'existing-user',
+                                  idempotencyKey='benchmark-retry')
+        assert response['statusCode'] == 200, response
+
+    init_existing_user()
+    print_result('lambda_handler init (new user)',
+                 measure(init_new_user, number=500))
+    print_result('lambda_handler init (existing user)',
+                 measure(init_existing_user, number=1000))
+    print_result('lambda_handler buy', measure(buy, number=500))
+    print_result('lambda_handler cart (2 lines)', measure(cart, number=500))
+    print_result('lambda_handler buy (idempotent retry)',
+                 measure(buy_idempotent_retry, number=1000))
+
+    db = local_app.db
+    print('dynamodb requests: %s' % db.request_counts)
+    print('line requests: %s' % local_app.line_endpoints.counts)
+
+
+if __name__ == '__main__':
+    main()
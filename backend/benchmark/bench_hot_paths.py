@@ -0,0 +1,73 @@
+"""
+会員証アプリの主要処理のマイクロベンチマーク
+※電子レシートの作成、商品データの加工、バーコード採番、パラメータチェック、
+　レスポンスのJSON変換の1回あたりの処理時間を計測する
+
+"""
+import os
+from decimal import Decimal
+
+from benchmark.common import (setup_path, measure, print_result)
+from benchmark.bench_barcode import LocalCounter
+
+os.environ.setdefault('LIFF_ID', 'benchmark-liff-id')
+setup_path()
+
+import send_message  # noqa: E402
+from common import utils  # noqa: E402
+from members_card.members_card_barcode import MembersCardBarcodeAllocator  # noqa: E402,E501
+from validation.members_card_param_check import MembersCardParamCheck  # noqa: E402,E501
+
+PRODUCT = {
+    'productId': Decimal(1),
+    'productName': {'ja': 'キャンバストートバッグ'},
+    'unitPrice': Decimal(21000),
+    'postage': Decimal(0),
+    'fee': Decimal(300),
+    'imgUrl': 'https://example.com/bag.png',
+}
+USER_INFO = {
+    'userId': 'U0123456789abcdef0123456789abcdef',
+    'barcodeNum': Decimal('4204380825109'),
+    'pointExpirationDate': '2027/10/18',
+    'point': Decimal('1050'),
+    'createdTime': '2026/10/18 19:34:51',
+    'updatedTime': '2026/10/18 19:34:51',
+}
+USER_INFO_RESPONSE_FIELDS = (
+    'userId', 'barcodeNum', 'pointExpirationDate', 'point')
+BUY_PARAMS = {'mode': 'buy', 'idToken': 'id-token', 'language': 'ja',
+              'idempotencyKey': '0123456789abcdef'}
+CART_PARAMS = {'mode': 'cart', 'idToken': 'id-token', 'language': 'ja',
+               'items': [{'productId': i, 'quantity': 1}
+                         for i in range(1, 11)]}
+
+
+def main():
+    values = send_message.modify_product_obj(
+        PRODUCT, 'ja', date='2026/10/18 19:34:51')
+    print_result('make_flex_recept', measure(
+        lambda: send_message.make_flex_recept(**values, language='ja'),
+        number=10000))
+    print_result('modify_product_obj', measure(
+        lambda: send_message.modify_product_obj(
+            PRODUCT, 'ja', date='2026/10/18 19:34:51'), number=10000))
+
+    allocator = MembersCardBarcodeAllocator(LocalCounter(), 'benchmark')
+    print_result('create_barcode_num (allocate)',
+                 measure(allocator.allocate, number=10000))
+
+    print_result('MembersCardParamCheck (buy)', measure(
+        lambda: MembersCardParamCheck(BUY_PARAMS).check_api_members_card(),
+        number=10000))
+    print_result('MembersCardParamCheck (cart, 10 lines)', measure(
+        lambda: MembersCardParamCheck(CART_PARAMS).check_api_members_card(),
+        number=10000))
+
+    print_result('create_success_response (user info)', measure(
+        lambda: utils.create_success_response(
+            USER_INFO, fields=USER_INFO_RESPONSE_FIELDS), number=10000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+IDトークン検証のベンチマーク
+※ローカル検証（HS256/ES256）と検証APIによる検証を比較する
+※検証APIはネットワークに接続せず、指定した往復時間の待機で代替する
+
+"""
+import argparse
+import base64
+import json
+import time
+import types
+
+from benchmark.common import (setup_path, measure, print_result)
+
+setup_path()
+
+from cryptography.hazmat.primitives import hashes  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.utils import (  # noqa: E402
+    decode_dss_signature)
+import hashlib  # noqa: E402
+import hmac  # noqa: E402
+
+from common import (line, id_token_verifier)  # noqa: E402
+
+CHANNEL_ID = '1234567890'
+CHANNEL_SECRET = 'benchmark-secret'
+
+
+def _b64encode(value):
+    return base64.urlsafe_b64encode(value).rstrip(b'=').decode('ascii')
+
+
+def make_token(header, sign):
+    """
+    IDトークンを生成する
+
+    Parameters
+    ----------
+    header : dict
+        JWTのヘッダー
+    sign : function
+        署名対象を受け取り署名を返す関数
+
+    Returns
+    -------
+    token : str
+        IDトークン
+    """
+    payload = {
+        'iss': 'https://access.line.me',
+        'sub': 'U0123456789abcdef0123456789abcdef',
+        'aud': CHANNEL_ID,
+        'exp': int(time.time()) + 3600,
+        'iat': int(time.time()),
+        'amr': ['linesso'],
+        'name': 'benchmark',
+    }
+    signing_input = '%s.%s' % (
+        _b64encode(json.dumps(header).encode('utf-8')),
+        _b64encode(json.dumps(payload).encode('utf-8')))
+    signature = sign(signing_input.encode('ascii'))
+    return '%s.%s' % (signing_input, _b64encode(signature))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rtt', type=float, default=0.03,
+                        help='検証APIの往復時間（秒）')
+    args = parser.parse_args()
+
+    # HS256（チャネルシークレットで署名）
+    id_token_verifier.LIFF_CHANNEL_SECRET = CHANNEL_SECRET
+    hs256_token = make_token(
+        {'alg': 'HS256', 'typ': 'JWT'},
+        lambda data: hmac.new(CHANNEL_SECRET.encode('utf-8'), data,
+                              hashlib.sha256).digest())
+
+    # ES256（LINEの公開鍵で検証。公開鍵は取得済みの状態とする）
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    id_token_verifier._cert_store._keys = {'bench': private_key.public_key()}
+    id_token_verifier._cert_store._fetched_at = time.monotonic()
+
+    def sign_es256(data):
+        r, s = decode_dss_signature(
+            private_key.sign(data, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(32, 'big') + s.to_bytes(32, 'big')
+    es256_token = make_token({'alg': 'ES256', 'typ': 'JWT', 'kid': 'bench'},
+                             sign_es256)
+
+    assert 'sub' in id_token_verifier.verify(hs256_token, CHANNEL_ID)
+    assert 'sub' in id_token_verifier.verify(es256_token, CHANNEL_ID)
+
+    print_result('local verify HS256', measure(
+        lambda: id_token_verifier.verify(hs256_token, CHANNEL_ID)))
+    print_result('local verify ES256', measure(
+        lambda: id_token_verifier.verify(es256_token, CHANNEL_ID)))
+
+    payload = id_token_verifier.verify(es256_token, CHANNEL_ID)
+
+    def post(url, headers, data):
+        time.sleep(args.rtt)
+        return types.SimpleNamespace(text=json.dumps(payload))
+    line.http_client.post = post
+    print_result('remote verify (rtt %.0f ms)' % (args.rtt * 1000), measure(
+        lambda: line.verify_id_token_remote(es256_token, CHANNEL_ID),
+        number=10, repeat=3))
+
+
+if __name__ == '__main__':
+    main()
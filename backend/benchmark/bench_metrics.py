@@ -0,0 +1,42 @@
+"""
+処理時間計測（metrics.span）のオーバーヘッドのベンチマーク
+※計測が無効な場合と有効な場合のspan 1回あたりの処理時間を比較します
+
+"""
+from benchmark.common import (setup_path, measure, print_result)
+
+setup_path()
+
+from common import metrics  # noqa: E402
+
+
+def no_span():
+    pass
+
+
+def with_span():
+    with metrics.span('phase'):
+        pass
+
+
+def main():
+    print_result('no span', measure(no_span, number=100000))
+
+    metrics.set_enabled(False)
+    print_result('metrics.span (disabled)',
+                 measure(with_span, number=100000))
+
+    # 有効な場合は呼び出し単位の計測中のみ記録する
+    records = []
+    metrics.set_enabled(True)
+    metrics.set_emitter(records.append)
+    handler = metrics.record_invocation(
+        lambda event, context: measure(with_span, number=100000))
+    print_result('metrics.span (enabled)', handler({}, None))
+    assert records[-1]['SpanCounts']['phase'] == 100000 * 5
+    metrics.set_emitter(None)
+    metrics.set_enabled(False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+購入金額・付与ポイント計算のベンチマーク
+※Decimalによる従来の計算（ポイント付与とレシートで2回）と、整数演算の計算（1回）を比較し、
+　全商品価格帯で計算結果が一致することを確認します
+
+"""
+import math
+import random
+from decimal import Decimal
+
+from benchmark.common import (setup_path, measure, print_result)
+
+setup_path()
+
+from members_card import members_card_pricing  # noqa: E402
+
+PRODUCT = {'unitPrice': Decimal(1280), 'postage': Decimal(500),
+           'fee': Decimal(300)}
+BATCH_SIZE = 10000
+
+
+def decimal_price():
+    # 従来はbuyでポイントを、レシート作成時に小計・税・合計・ポイントを計算していた
+    math.floor(PRODUCT['unitPrice'] * Decimal(0.05))
+    subtotal = PRODUCT['unitPrice'] + PRODUCT['postage'] + PRODUCT['fee']
+    tax = math.floor(subtotal * Decimal(0.10))
+    subtotal + tax
+    math.floor(PRODUCT['unitPrice'] * Decimal(0.05))
+
+
+def integer_price():
+    members_card_pricing.calculate(PRODUCT)
+
+
+def verify():
+    # 整数演算の結果が従来のDecimalでの計算と一致することを確認する
+    for unit_price in range(0, 100001):
+        product = {'unitPrice': Decimal(unit_price), 'postage': Decimal(500),
+                   'fee': Decimal(300)}
+        price = members_card_pricing.calculate(product)
+        subtotal = product['unitPrice'] + product['postage'] + product['fee']
+        assert price.point == math.floor(
+            product['unitPrice'] * Decimal(0.05)), unit_price
+        assert price.tax == math.floor(subtotal * Decimal(0.10)), unit_price
+
+
+def main():
+    verify()
+    print_result('Decimal x2 (buy + receipt)',
+                 measure(decimal_price, number=10000))
+    print_result('members_card_pricing.calculate',
+                 measure(integer_price, number=10000))
+
+    rng = random.Random(0)
+    unit_prices = [rng.randrange(100, 100000) for _ in range(BATCH_SIZE)]
+    postages = [500] * BATCH_SIZE
+    fees = [300] * BATCH_SIZE
+    products = [{'unitPrice': u, 'postage': p, 'fee': f}
+                for u, p, f in zip(unit_prices, postages, fees)]
+    print_result('calculate x%d' % BATCH_SIZE, measure(
+        lambda: [members_card_pricing._calculate.__wrapped__(
+            p['unitPrice'], p['postage'], p['fee'], 0) for p in products],
+        number=10))
+    print_result('calculate_batch x%d' % BATCH_SIZE, measure(
+        lambda: members_card_pricing.calculate_batch(
+            unit_prices, postages, fees), number=10))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+電子レシートのプッシュメッセージ本文生成のベンチマーク
+※make_flex_recept + FlexSendMessage（LineBotApiと同じ変換）と、
+　生成済みテンプレートへの埋め込みを比較する
+
+"""
+import json
+import os
+
+from benchmark.common import (setup_path, measure, print_result)
+
+os.environ.setdefault('LIFF_ID', 'benchmark-liff-id')
+setup_path()
+
+from linebot.models import FlexSendMessage  # noqa: E402
+
+import send_message  # noqa: E402
+
+USER_ID = 'U0123456789abcdef0123456789abcdef'
+PRODUCT = {
+    'productId': 1,
+    'productName': {'ja': 'キャンバストートバッグ "限定"'},
+    'unitPrice': 21000,
+    'postage': 0,
+    'fee': 300,
+    'imgUrl': 'https://example.com/bag.png',
+}
+
+
+def build_by_model(values):
+    """従来の処理（dict生成 → モデルオブジェクト → JSON文字列）"""
+    flex_dict = send_message.make_flex_recept(**values, language='ja')
+    message = FlexSendMessage.new_from_json_dict(flex_dict)
+    return json.dumps({'to': USER_ID, 'messages': [message.as_json_dict()]})
+
+
+def main():
+    values = send_message.modify_product_obj(PRODUCT, 'ja')
+    template = send_message.get_receipt_template('ja')
+
+    # 送信内容が従来の処理と同じであることを確認する
+    expected = json.loads(json.dumps({
+        'to': USER_ID,
+        'messages': [send_message.make_flex_recept(**values, language='ja')],
+    }))
+    assert json.loads(template.render(USER_ID, **values)) == expected
+
+    print_result('make_flex_recept + FlexSendMessage',
+                 measure(lambda: build_by_model(values)))
+    print_result('ReceiptTemplate.render',
+                 measure(lambda: template.render(USER_ID, **values)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+レスポンスのJSON変換のベンチマーク
+※json.dumps + decimal_to_intと、response_encoder（orjson・標準json）を比較する
+
+"""
+import json
+from decimal import Decimal
+
+from benchmark.common import (setup_path, measure, print_result)
+
+setup_path()
+
+from common import (response_encoder, utils)  # noqa: E402
+
+USER_INFO = {
+    'userId': 'U0123456789abcdef0123456789abcdef',
+    'barcodeNum': Decimal('4204380825109'),
+    'pointExpirationDate': '2027/10/18',
+    'point': Decimal('1050'),
+    'createdTime': '2026/10/18 19:34:51',
+    'updatedTime': '2026/10/18 19:34:51',
+}
+FIELDS = ('userId', 'barcodeNum', 'pointExpirationDate', 'point')
+
+
+def main():
+    expected = json.loads(json.dumps(
+        {k: USER_INFO[k] for k in FIELDS}, default=utils.decimal_to_int))
+    assert json.loads(response_encoder.encode(USER_INFO, FIELDS)) == expected
+
+    print_result('json.dumps + decimal_to_int', measure(
+        lambda: json.dumps(USER_INFO, default=utils.decimal_to_int,
+                           ensure_ascii=False), number=10000))
+    print_result('response_encoder (json)', measure(
+        lambda: response_encoder._dumps_json(
+            response_encoder._select_fields(USER_INFO, FIELDS)),
+        number=10000))
+    if response_encoder.orjson is not None:
+        print_result('response_encoder (orjson)', measure(
+            lambda: response_encoder._dumps_orjson(
+                response_encoder._select_fields(USER_INFO, FIELDS)),
+            number=10000))
+
+    # 一覧形式（商品100件）の変換
+    items = [dict(USER_INFO, point=Decimal(i)) for i in range(100)]
+    print_result('list json.dumps + decimal_to_int', measure(
+        lambda: json.dumps(items, default=utils.decimal_to_int,
+                           ensure_ascii=False)))
+    print_result('list response_encoder (%s)' % response_encoder.BACKEND,
+                 measure(lambda: response_encoder.encode(items)))
+
+
+if __name__ == '__main__':
+    main()
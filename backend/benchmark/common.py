@@ -0,0 +1,78 @@
+"""
+ベンチマーク共通処理
+
+"""
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAYER_DIR = os.path.join(BACKEND_DIR, 'Layer', 'layer')
+APP_DIR = os.path.join(BACKEND_DIR, 'APP', 'members_card')
+# 計測結果をJSON Lines形式で追記するファイル（benchmark.runから実行した場合に設定される）
+RESULTS_FILE = os.getenv('BENCHMARK_RESULTS_FILE')
+
+
+def setup_path():
+    """
+    Lambda実行時と同じ形式でimportできるよう、レイヤーとアプリのフォルダをパスに追加する
+    """
+    for path in (APP_DIR, LAYER_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def measure(func, number=1000, repeat=5):
+    """
+    関数の実行時間を計測する
+
+    Parameters
+    ----------
+    func : function
+        計測する関数（引数なし）
+    number : int, optional
+        1回の計測での実行回数
+    repeat : int, optional
+        計測の繰り返し回数
+
+    Returns
+    -------
+    result : dict
+        1回あたりの最小・平均実行時間（マイクロ秒）と秒間実行回数
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    best = min(timings)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min_us': best * 1e6,
+        'mean_us': sum(timings) / len(timings) * 1e6,
+        'ops_per_sec': 1 / best if best else float('inf'),
+    }
+
+
+def print_result(name, result):
+    """
+    計測結果を表示する
+
+    Parameters
+    ----------
+    name : str
+        計測対象の名称
+    result : dict
+        measureの戻り値
+    """
+    print('%-40s %12.2f us %14.0f ops/s' % (
+        name, result['min_us'], result['ops_per_sec']))
+    if RESULTS_FILE:
+        module_name = os.path.splitext(
+            os.path.basename(sys.argv[0]))[0]
+        with open(RESULTS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(dict(result, benchmark=module_name,
+                                    name=name), ensure_ascii=False) + '\n')
@@ -0,0 +1,523 @@
+"""
+app.lambda_handlerのローカル負荷試験
+※init/buy/cartを指定した比率で実行し、スループット、レイテンシのパーセンタイル（p50/p95/p99）、
+　エラー率、DynamoDBの消費キャパシティを集計します
+※DynamoDBはInMemoryDynamoDB、LINEのAPIはスタブを使用し、それぞれ遅延を注入できます
+※スロットリング（--throttle-rate）は1回の試行ごとの確率で、botocoreのstandardリトライと同様に
+　待機して再試行します（エラー率は再試行後のエラー、dynamodb throttledは再試行前の回数）
+
+ユーザーの構成
+    ・新規ユーザー（--new-user-ratio）：初回アクセスのため必ずinitを実行する
+    ・既存ユーザー（--users人）：事前にinit済みのユーザーからmixの比率でmodeを選ぶ
+    ・ホットユーザー（既存ユーザーのうち--hot-user-ratioの割合）：既存ユーザーへのリクエストの
+      --hot-shareの割合が集中する
+
+並列実行
+    ・thread：1プロセス内のスレッドで実行する（1つのウォームコンテナへの同時リクエストに相当）
+    ・process：ワーカーごとのプロセスで実行する（コンテナごとに独立したキャッシュとなる）
+      ※InMemoryDynamoDBもプロセスごとに独立するため、消費キャパシティはプロセスの合計となります
+
+実行例
+    python -m benchmark.load_test --requests 5000 --concurrency 8
+    python -m benchmark.load_test --mix init=0.6,buy=0.3,cart=0.1 \\
+        --concurrency 4 --executor process --dynamodb-latency 5 \\
+        --line-latency 20 --target-rps 50 --output load.json
+
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# template.yamlのテーブルのプロビジョンドキャパシティ
+PROVISIONED_RCU = 1
+PROVISIONED_WCU = 1
+CART_ITEMS = [{'productId': 1, 'quantity': 1}, {'productId': 2, 'quantity': 1}]
+
+
+def parse_mix(value):
+    """
+    modeの比率の指定を解析する
+
+    Parameters
+    ----------
+    value : str
+        init=0.7,buy=0.3形式の比率
+
+    Returns
+    -------
+    mix : dict
+        modeをキーとした比率（合計1）
+    """
+    mix = {}
+    for entry in value.split(','):
+        mode, weight = entry.split('=')
+        if mode not in ('init', 'buy', 'cart'):
+            raise argparse.ArgumentTypeError('unknown mode: %s' % mode)
+        mix[mode] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError('mix must have a positive weight')
+    return {mode: weight / total for mode, weight in mix.items()}
+
+
+def percentile(sorted_values, rate):
+    """
+    パーセンタイル（nearest-rank法）を算出する
+
+    Parameters
+    ----------
+    sorted_values : list
+        昇順に並べた値
+    rate : float
+        パーセンタイル（0～100）
+
+    Returns
+    -------
+    value : float
+        パーセンタイルの値（値が無い場合None）
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(rate / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class UserPopulation:
+    """
+    負荷試験のユーザー構成
+    """
+
+    def __init__(self, users, hot_user_ratio, hot_share, new_user_ratio,
+                 seed):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        users : int
+            既存ユーザー数
+        hot_user_ratio : float
+            既存ユーザーのうちホットユーザーの割合
+        hot_share : float
+            既存ユーザーへのリクエストのうちホットユーザーへのリクエストの割合
+        new_user_ratio : float
+            全リクエストのうち新規ユーザーのリクエストの割合
+        seed : int
+            乱数のシード
+        """
+        self.tokens = ['user-%d' % i for i in range(users)]
+        hot_count = max(1, int(users * hot_user_ratio)) if users else 0
+        self.hot_tokens = self.tokens[:hot_count]
+        self.cold_tokens = self.tokens[hot_count:] or self.hot_tokens
+        self.hot_share = hot_share
+        self.new_user_ratio = new_user_ratio if users else 1
+        self._random = random.Random(seed)
+        self._new_user_sequence = 0
+        self._seed = seed
+
+    def next_user(self):
+        """
+        次のリクエストのユーザーを選ぶ
+
+        Returns
+        -------
+        id_token : str
+            IDトークン
+        is_new : bool
+            新規ユーザーの場合True
+        """
+        if self.chance(self.new_user_ratio):
+            self._new_user_sequence += 1
+            return 'new-%s-%d' % (self._seed, self._new_user_sequence), True
+        if self.chance(self.hot_share):
+            return self._random.choice(self.hot_tokens), False
+        return self._random.choice(self.cold_tokens), False
+
+    def chance(self, rate):
+        """
+        指定した確率でTrueを返す
+
+        Parameters
+        ----------
+        rate : float
+            確率（0～1）
+
+        Returns
+        -------
+        result : bool
+            乱数が確率未満の場合True
+        """
+        return self._random.random() < rate
+
+    def choose_mode(self, mix):
+        """
+        既存ユーザーのリクエストのmodeを選ぶ
+
+        Parameters
+        ----------
+        mix : dict
+            modeをキーとした比率
+
+        Returns
+        -------
+        mode : str
+            mode
+        """
+        point = self._random.random()
+        for mode, weight in mix.items():
+            point -= weight
+            if point < 0:
+                return mode
+        return mode
+
+
+def run_requests(local_app, config, worker_id, count):
+    """
+    1ワーカー分のリクエストを実行する
+
+    Parameters
+    ----------
+    local_app : LocalApp
+        ローカル実行環境
+    config : dict
+        負荷試験の設定
+    worker_id : int
+        ワーカー番号（乱数のシードに使用する）
+    count : int
+        実行するリクエスト数
+
+    Returns
+    -------
+    result : dict
+        samples（(mode, レイテンシ(秒), 成功したか)のリスト）と開始・終了時刻
+    """
+    population = UserPopulation(
+        config['users'], config['hot_user_ratio'], config['hot_share'],
+        config['new_user_ratio'], '%s-%d' % (config['seed'], worker_id))
+    samples = []
+    last_purchase = None
+    started_at = time.time()
+    for index in range(count):
+        id_token, is_new = population.next_user()
+        mode = 'init' if is_new else population.choose_mode(config['mix'])
+        params = {}
+        if mode == 'cart':
+            params['items'] = CART_ITEMS
+        if mode in ('buy', 'cart') and config['retry_ratio']:
+            # 一定の割合で直前の購入と同じ冪等キーで再送する（クライアントの再送）
+            if last_purchase and population.chance(config['retry_ratio']):
+                id_token, mode, params = last_purchase
+                mode_label = mode + ' (retry)'
+            else:
+                params['idempotencyKey'] = '%d-%d' % (worker_id, index)
+                last_purchase = (id_token, mode, params)
+                mode_label = mode
+        else:
+            mode_label = mode
+
+        start = time.perf_counter()
+        try:
+            response = local_app.call(mode, id_token, **params)
+            ok = response['statusCode'] == 200
+        except Exception:
+            ok = False
+        samples.append((mode_label, time.perf_counter() - start, ok))
+    return {'samples': samples, 'started_at': started_at,
+            'finished_at': time.time()}
+
+
+def setup_worker(config):
+    """
+    ローカル実行環境を作成し、既存ユーザーを登録する
+
+    Parameters
+    ----------
+    config : dict
+        負荷試験の設定
+
+    Returns
+    -------
+    local_app : LocalApp
+        ローカル実行環境
+    """
+    from benchmark.local_app import setup_local_app
+
+    local_app = setup_local_app(
+        latency=config['dynamodb_latency'] / 1000,
+        throttle_rate=config['throttle_rate'],
+        line_latency=config['line_latency'] / 1000, seed=config['seed'])
+    # 既存ユーザーの登録は集計対象外とする（遅延・スロットリングも発生させない）
+    latency = local_app.db.latency
+    local_app.db.latency = 0
+    throttle_rate = local_app.db.throttle_rate
+    local_app.db.throttle_rate = 0
+    line_latency = local_app.line_endpoints.latency
+    local_app.line_endpoints.latency = 0
+    for i in range(config['users']):
+        response = local_app.call('init', 'user-%d' % i)
+        if response['statusCode'] != 200:
+            raise RuntimeError('failed to create user-%d: %s' % (
+                i, response['body']))
+    local_app.db.latency = latency
+    local_app.db.throttle_rate = throttle_rate
+    local_app.line_endpoints.latency = line_latency
+    local_app.db.reset_stats()
+    local_app.line_endpoints.reset_stats()
+    return local_app
+
+
+def collect_stats(local_app):
+    """
+    ストレージ・スタブの集計結果を取得する
+
+    Returns
+    -------
+    stats : dict
+        DynamoDBのリクエスト数・消費キャパシティとLINEのAPIの呼び出し回数
+    """
+    db = local_app.db
+    return {
+        'dynamodb_requests': dict(db.request_counts),
+        'dynamodb_throttled': dict(db.throttled_counts),
+        'consumed_read_units': dict(db.consumed_read_units),
+        'consumed_write_units': dict(db.consumed_write_units),
+        'line_requests': dict(local_app.line_endpoints.counts),
+    }
+
+
+def process_worker(args):
+    """
+    processで実行する場合のワーカー（ワーカーごとにローカル実行環境を作成する）
+    """
+    config, worker_id, count = args
+    local_app = setup_worker(config)
+    result = run_requests(local_app, config, worker_id, count)
+    result['stats'] = collect_stats(local_app)
+    return result
+
+
+def run_load(config):
+    """
+    負荷試験を実行する
+
+    Parameters
+    ----------
+    config : dict
+        負荷試験の設定
+
+    Returns
+    -------
+    results : list
+        ワーカーごとの実行結果
+    stats : list
+        ストレージ・スタブの集計結果（processの場合はワーカーごと）
+    """
+    concurrency = config['concurrency']
+    counts = [config['requests'] // concurrency +
+              (1 if i < config['requests'] % concurrency else 0)
+              for i in range(concurrency)]
+
+    if config['executor'] == 'process':
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(concurrency) as pool:
+            results = pool.map(process_worker, [
+                (config, worker_id, count)
+                for worker_id, count in enumerate(counts)])
+        return results, [result.pop('stats') for result in results]
+
+    local_app = setup_worker(config)
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(
+            lambda args: run_requests(local_app, config, *args),
+            enumerate(counts)))
+    return results, [collect_stats(local_app)]
+
+
+def summarize(config, results, stats):
+    """
+    実行結果を集計する
+
+    Parameters
+    ----------
+    config : dict
+        負荷試験の設定
+    results : list
+        ワーカーごとの実行結果
+    stats : list
+        ストレージ・スタブの集計結果
+
+    Returns
+    -------
+    summary : dict
+        スループット、modeごとのレイテンシ・エラー率、消費キャパシティ、容量の見積もり
+    """
+    samples = [sample for result in results for sample in result['samples']]
+    elapsed = max(r['finished_at'] for r in results) - \
+        min(r['started_at'] for r in results)
+    throughput = len(samples) / elapsed if elapsed else 0
+
+    def latency_summary(values, errors):
+        values = sorted(values)
+        return {
+            'requests': len(values),
+            'errors': errors,
+            'error_rate': errors / len(values) if values else 0,
+            'mean_ms': sum(values) / len(values) * 1000 if values else None,
+            'p50_ms': _ms(percentile(values, 50)),
+            'p95_ms': _ms(percentile(values, 95)),
+            'p99_ms': _ms(percentile(values, 99)),
+            'max_ms': _ms(values[-1] if values else None),
+        }
+
+    modes = {}
+    for mode in sorted({sample[0] for sample in samples}):
+        mode_samples = [s for s in samples if s[0] == mode]
+        modes[mode] = latency_summary(
+            [s[1] for s in mode_samples],
+            sum(1 for s in mode_samples if not s[2]))
+    overall = latency_summary([s[1] for s in samples],
+                              sum(1 for s in samples if not s[2]))
+
+    def merge(key):
+        merged = {}
+        for stat in stats:
+            for name, value in stat[key].items():
+                merged[name] = merged.get(name, 0) + value
+        return merged
+
+    read_units = merge('consumed_read_units')
+    write_units = merge('consumed_write_units')
+    tables = {}
+    target_rps = config['target_rps'] or throughput
+    for table_name in sorted(set(read_units) | set(write_units)):
+        rcu_per_request = read_units.get(table_name, 0) / len(samples)
+        wcu_per_request = write_units.get(table_name, 0) / len(samples)
+        tables[table_name] = {
+            'read_units': read_units.get(table_name, 0),
+            'write_units': write_units.get(table_name, 0),
+            'rcu_per_second': read_units.get(table_name, 0) / elapsed,
+            'wcu_per_second': write_units.get(table_name, 0) / elapsed,
+            # 目標スループット時に必要なキャパシティ
+            'required_rcu': math.ceil(rcu_per_request * target_rps),
+            'required_wcu': math.ceil(wcu_per_request * target_rps),
+        }
+
+    return {
+        'config': dict(config),
+        'elapsed_seconds': elapsed,
+        'throughput_rps': throughput,
+        'overall': overall,
+        'modes': modes,
+        'dynamodb_requests': merge('dynamodb_requests'),
+        'dynamodb_throttled': merge('dynamodb_throttled'),
+        'line_requests': merge('line_requests'),
+        'tables': tables,
+        'target_rps': target_rps,
+        # リトルの法則（同時実行数 = 到着率 × 平均処理時間）による同時実行数の見積もり
+        'required_concurrency': math.ceil(
+            target_rps * (overall['mean_ms'] or 0) / 1000),
+    }
+
+
+def _ms(value):
+    return value * 1000 if value is not None else None
+
+
+def print_summary(summary):
+    """
+    集計結果を表示する
+    """
+    print('requests: %d, elapsed: %.2f s, throughput: %.1f req/s' % (
+        summary['overall']['requests'], summary['elapsed_seconds'],
+        summary['throughput_rps']))
+    print('%-14s %8s %7s %9s %9s %9s %9s' % (
+        'mode', 'requests', 'errors', 'p50 ms', 'p95 ms', 'p99 ms',
+        'max ms'))
+    for mode, result in list(summary['modes'].items()) + [
+            ('overall', summary['overall'])]:
+        print('%-14s %8d %6.2f%% %9.2f %9.2f %9.2f %9.2f' % (
+            mode, result['requests'], result['error_rate'] * 100,
+            result['p50_ms'], result['p95_ms'], result['p99_ms'],
+            result['max_ms']))
+
+    print('dynamodb requests: %s' % summary['dynamodb_requests'])
+    print('dynamodb throttled (before retry): %s' %
+          summary['dynamodb_throttled'])
+    print('line requests: %s' % summary['line_requests'])
+    print('capacity at %.1f req/s (provisioned %d RCU / %d WCU):' % (
+        summary['target_rps'], PROVISIONED_RCU, PROVISIONED_WCU))
+    for table_name, table in summary['tables'].items():
+        flags = []
+        if table['required_rcu'] > PROVISIONED_RCU:
+            flags.append('RCU')
+        if table['required_wcu'] > PROVISIONED_WCU:
+            flags.append('WCU')
+        print('  %-26s %6d RCU %6d WCU %s' % (
+            table_name, table['required_rcu'], table['required_wcu'],
+            '  NG: exceeds provisioned ' + '/'.join(flags) if flags else ''))
+    print('estimated concurrency at %.1f req/s: %d' % (
+        summary['target_rps'], summary['required_concurrency']))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='総リクエスト数')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='並列数')
+    parser.add_argument('--executor', choices=('thread', 'process'),
+                        default='thread', help='並列実行の方法')
+    parser.add_argument('--mix', type=parse_mix, default='init=0.7,buy=0.3',
+                        help='既存ユーザーのmodeの比率')
+    parser.add_argument('--users', type=int, default=1000,
+                        help='既存ユーザー数')
+    parser.add_argument('--new-user-ratio', type=float, default=0.05,
+                        help='新規ユーザーのリクエストの割合')
+    parser.add_argument('--hot-user-ratio', type=float, default=0.01,
+                        help='既存ユーザーのうちホットユーザーの割合')
+    parser.add_argument('--hot-share', type=float, default=0.3,
+                        help='既存ユーザーへのリクエストのうちホットユーザーへの割合')
+    parser.add_argument('--retry-ratio', type=float, default=0,
+                        help='購入リクエストを同じ冪等キーで再送する割合')
+    parser.add_argument('--dynamodb-latency', type=float, default=0,
+                        help='DynamoDBの1リクエストあたりの遅延（ミリ秒）')
+    parser.add_argument('--line-latency', type=float, default=0,
+                        help='LINEのAPIの1リクエストあたりの遅延（ミリ秒）')
+    parser.add_argument('--throttle-rate', type=float, default=0,
+                        help='DynamoDBの1回の試行でスロットリングする確率（再試行前）')
+    parser.add_argument('--target-rps', type=float, default=None,
+                        help='容量を見積もる目標スループット（未指定の場合は計測値）')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード')
+    parser.add_argument('--output', help='集計結果のJSONファイルの出力先')
+    args = parser.parse_args()
+
+    config = {
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'executor': args.executor,
+        'mix': args.mix,
+        'users': args.users,
+        'new_user_ratio': args.new_user_ratio,
+        'hot_user_ratio': args.hot_user_ratio,
+        'hot_share': args.hot_share,
+        'retry_ratio': args.retry_ratio,
+        'dynamodb_latency': args.dynamodb_latency,
+        'line_latency': args.line_latency,
+        'throttle_rate': args.throttle_rate,
+        'target_rps': args.target_rps,
+        'seed': args.seed,
+    }
+    results, stats = run_load(config)
+    summary = summarize(config, results, stats)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+ベンチマーク・負荷試験用のローカル実行環境
+※DynamoDBをInMemoryDynamoDBに、LINEのAPI（IDトークン検証・プッシュメッセージ）を
+　プロセス内のスタブに差し替え、app.lambda_handlerをネットワーク無しで実行できるようにします
+
+使用例
+    local_app = setup_local_app()
+    local_app.call('init', 'id-token-1')
+    local_app.call('buy', 'id-token-1')
+
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from benchmark.common import (APP_DIR, setup_path)
+
+# appのimport前に設定が必要な環境変数
+os.environ.setdefault('OA_CHANNEL_ID', 'benchmark-oa-channel')
+os.environ.setdefault('LIFF_CHANNEL_ID', 'benchmark-liff-channel')
+os.environ.setdefault('LIFF_ID', 'benchmark-liff-id')
+os.environ.setdefault('TTL_DAY', '1')
+setup_path()
+
+# テーブル名とキー・インデックスの定義（template.yamlと同じ構成）
+TABLES = {
+    'MembersCardUserInfo': (
+        ('userId',), {'barcodeNum-index': (('barcodeNum',), ())}),
+    'MembersCardProductInfo': (('productId',), None),
+    'MembersCardCounter': (('counterName',), None),
+    'MembersCardIdempotency': (('idempotencyKey',), None),
+    'LINEChannelAccessToken': (('channelId',), None),
+}
+PRODUCT_DATA_FILES = ('product_master_id_1.json', 'product_master_id_2.json')
+
+_local_app = None
+
+
+class StubResponse:
+    """requests.Responseの代替クラス"""
+    __slots__ = ['status_code', 'text', 'headers']
+
+    def __init__(self, status_code, body, headers=None):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+        self.headers = headers or {}
+
+
+class StubLineEndpoints:
+    """
+    LINEのAPIのスタブ
+    ※http_client.postの代わりに使用し、IDトークン検証とプッシュメッセージの呼び出し回数を集計します
+    """
+
+    def __init__(self, latency=0):
+        """
+        初期化メソッド
+
+        Parameters
+        ----------
+        latency : float, optional
+            1リクエストあたりの遅延秒数, by default 0
+        """
+        self.latency = latency
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, data=None, **kwargs):
+        from common import common_const
+
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.counts[url] = self.counts.get(url, 0) + 1
+        if url == common_const.const.API_USER_ID_URL:
+            # IDトークンごとに固定のユーザーIDを返す
+            user_id = 'U' + hashlib.md5(
+                data['id_token'].encode('utf-8')).hexdigest()
+            return StubResponse(200, {
+                'sub': user_id,
+                'aud': data['client_id'],
+                'exp': int(time.time()) + 3600,
+            })
+        if url == common_const.const.API_PUSH_MESSAGE_URL:
+            return StubResponse(200, {}, {'X-Line-Request-Id': 'stub'})
+        return StubResponse(404, {'message': 'Not found'})
+
+    def reset_stats(self):
+        """呼び出し回数の集計をリセットする"""
+        with self._lock:
+            self.counts = {}
+
+
+class LocalApp:
+    """
+    ローカル実行環境のapp・ストレージ・スタブをまとめたクラス
+    """
+
+    def __init__(self, app, db, line_endpoints):
+        self.app = app
+        self.db = db
+        self.line_endpoints = line_endpoints
+
+    def call(self, mode, id_token, **params):
+        """
+        lambda_handlerを実行する
+
+        Parameters
+        ----------
+        mode : str
+            init, buy, cart
+        id_token : str
+            IDトークン（スタブではトークンごとに固定のユーザーIDとなる）
+        **params
+            リクエストパラメータ（languageの指定が無い場合はja）
+
+        Returns
+        -------
+        response : dict
+            lambda_handlerの戻り値
+        """
+        body = {'mode': mode, 'idToken': id_token}
+        if mode != 'init':
+            body['language'] = 'ja'
+        body.update(params)
+        return self.app.lambda_handler({'body': json.dumps(body)}, None)
+
+
+def setup_local_app(latency=0, throttle_rate=0, line_latency=0, seed=None):
+    """
+    ローカル実行環境を作成する
+    ※appのテーブル操作クラスはモジュール読み込み時に生成されるため、1プロセスにつき1回のみ作成できます
+
+    Parameters
+    ----------
+    latency : float or function, optional
+        DynamoDBの1リクエストあたりの遅延秒数, by default 0
+    throttle_rate : float, optional
+        DynamoDBのスロットリングを発生させる確率, by default 0
+    line_latency : float, optional
+        LINEのAPIの1リクエストあたりの遅延秒数, by default 0
+    seed : int, optional
+        乱数のシード, by default None
+
+    Returns
+    -------
+    local_app : LocalApp
+        ローカル実行環境
+    """
+    global _local_app
+    if _local_app is not None:
+        raise RuntimeError('local app is already set up in this process')
+
+    from aws.dynamodb import base
+    from aws.dynamodb.memory import InMemoryDynamoDB
+    from common import http_client
+
+    db = InMemoryDynamoDB(latency=latency, throttle_rate=throttle_rate,
+                          seed=seed)
+    for table_name, (key_names, indexes) in TABLES.items():
+        db.create_table(table_name, key_names, indexes)
+    products = db.Table('MembersCardProductInfo')
+    for file_name in PRODUCT_DATA_FILES:
+        path = os.path.join(os.path.dirname(APP_DIR), 'dynamodb_data',
+                            file_name)
+        with open(path, encoding='utf-8') as f:
+            products.put_item(Item=json.load(f))
+    db.Table('LINEChannelAccessToken').put_item(Item={
+        'channelId': os.environ['OA_CHANNEL_ID'],
+        'channelAccessToken': 'benchmark-channel-access-token',
+        'limitDate': '2099-12-31 23:59:59+0900',
+    })
+    base.set_backend(db)
+
+    line_endpoints = StubLineEndpoints(line_latency)
+    http_client.post = line_endpoints.post
+
+    import app
+    _local_app = LocalApp(app, db, line_endpoints)
+    return _local_app
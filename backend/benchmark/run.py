@@ -0,0 +1,165 @@
+"""
+ベンチマークの一括実行
+※各ベンチマークを新しいプロセスで実行し、計測結果をJSONファイルに出力します
+※--baselineを指定した場合、前回の計測結果と比較し、閾値を超えて遅くなった項目がある場合は
+　終了コード1で終了します
+
+実行例
+    python -m benchmark.run --output results.json
+    python -m benchmark.run --output new.json --baseline results.json
+    python -m benchmark.run --only bench_handler bench_hot_paths
+
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+from benchmark.common import BACKEND_DIR
+
+# 一括実行するベンチマーク（import時間の予算チェックはbench_cold_startで別途実行する）
+SUITE = (
+    'bench_handler',
+    'bench_hot_paths',
+    'bench_barcode',
+    'bench_clock',
+    'bench_get_item',
+    'bench_id_token',
+    'bench_metrics',
+    'bench_pricing',
+    'bench_receipt',
+    'bench_response',
+)
+
+
+def run_benchmark(module_name, results_file):
+    """
+    ベンチマークを新しいプロセスで実行する
+
+    Parameters
+    ----------
+    module_name : str
+        benchmarkパッケージのモジュール名
+    results_file : str
+        計測結果を追記するファイル
+
+    Returns
+    -------
+    ok : bool
+        正常終了した場合True
+    """
+    env = dict(os.environ, BENCHMARK_RESULTS_FILE=results_file)
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmark.%s' % module_name],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print('  NG: %s exited with %d' % (module_name, result.returncode))
+        print(result.stderr)
+        return False
+    return True
+
+
+def get_git_commit():
+    """
+    計測対象のコミットを取得する
+
+    Returns
+    -------
+    commit : str
+        コミットのハッシュ（取得できない場合はNone）
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results, baseline, threshold):
+    """
+    前回の計測結果と比較する
+
+    Parameters
+    ----------
+    results : list
+        今回の計測結果
+    baseline : list
+        前回の計測結果
+    threshold : float
+        遅くなったと判定する割合（0.2の場合、20%以上遅くなった項目）
+
+    Returns
+    -------
+    regressions : list
+        (ベンチマーク名, 計測対象の名称, 前回(us), 今回(us))のリスト
+    """
+    previous = {(r['benchmark'], r['name']): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['benchmark'], result['name']))
+        if before is None or not before['min_us']:
+            continue
+        ratio = result['min_us'] / before['min_us']
+        print('%-18s %-40s %12.2f us -> %12.2f us (%+.1f%%)' % (
+            result['benchmark'], result['name'], before['min_us'],
+            result['min_us'], (ratio - 1) * 100))
+        if ratio > 1 + threshold:
+            regressions.append((result['benchmark'], result['name'],
+                                before['min_us'], result['min_us']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', default='benchmark-results.json',
+                        help='計測結果の出力先')
+    parser.add_argument('--baseline', help='比較する前回の計測結果')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='遅くなったと判定する割合')
+    parser.add_argument('--only', nargs='*', help='実行するベンチマーク')
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as work_dir:
+        results_file = os.path.join(work_dir, 'results.jsonl')
+        open(results_file, 'w').close()
+        for module_name in args.only or SUITE:
+            print('running %s' % module_name)
+            if not run_benchmark(module_name, results_file):
+                failed = True
+        with open(results_file, encoding='utf-8') as f:
+            results = [json.loads(line) for line in f if line.strip()]
+
+    report = {
+        'createdAt': datetime.datetime.now(
+            datetime.timezone.utc).isoformat(),
+        'commit': get_git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print('%d results written to %s' % (len(results), args.output))
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for benchmark, name, before, after in regressions:
+            print('  NG: %s %s is slower (%.2f us -> %.2f us)' % (
+                benchmark, name, before, after))
+        if regressions:
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()